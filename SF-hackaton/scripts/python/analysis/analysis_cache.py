@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Incremental analysis cache
+Persists per-commit stats and per-path aggregates keyed by the analyzed HEAD,
+so reruns only have to walk commits added since the last analysis
+"""
+
+import json
+import os
+
+CACHE_VERSION = 4
+CACHE_FILENAME = "repo_analysis_cache.json"
+
+
+class AnalysisCache:
+    """On-disk cache of the columnar commit store and the path history index"""
+
+    def __init__(self, cache_path):
+        self.cache_path = cache_path
+
+    def load(self):
+        """Load the cache, returning None if it is missing or unusable"""
+        if not os.path.exists(self.cache_path):
+            return None
+
+        try:
+            with open(self.cache_path, 'r') as f:
+                cached = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable analysis cache {self.cache_path}: {e}")
+            return None
+
+        if cached.get("version") != CACHE_VERSION or not cached.get("head"):
+            return None
+        return cached
+
+    def save(self, head, commits, path_index, settings=None):
+        """Write the cache atomically for the given HEAD and analyzer settings"""
+        cached = {
+            "version": CACHE_VERSION,
+            "head": head,
+            "settings": settings,
+            "commits": commits.to_dict(),
+            "path_index": path_index.to_dict()
+        }
+
+        # Write next to the target and swap so a crash never leaves half a cache
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(cached, f, default=str)
+        os.replace(tmp_path, self.cache_path)
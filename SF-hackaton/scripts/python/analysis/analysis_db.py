@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+SQLite analysis store
+Persists the analyzer's commits, per-commit file changes, files and authors
+into an indexed SQLite database (WAL mode, bulk inserts), with a small query
+layer for the aggregations reports need, so consumers stop re-parsing the
+whole JSON export and filtering it in Python
+"""
+
+import json
+import os
+import sqlite3
+from datetime import date
+
+from directory_index import DirectoryIndex
+from history_index import split_rename_path
+
+SCHEMA_VERSION = 1
+DB_FILENAME = "repo_analysis.db"
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE authors (id INTEGER PRIMARY KEY, name TEXT NOT NULL);
+CREATE TABLE paths (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    directory TEXT NOT NULL,
+    extension TEXT NOT NULL
+);
+CREATE TABLE commits (
+    id INTEGER PRIMARY KEY,
+    hash TEXT,
+    author_id INTEGER NOT NULL REFERENCES authors(id),
+    email TEXT,
+    timestamp INTEGER NOT NULL,
+    day TEXT NOT NULL,
+    message TEXT,
+    files_changed INTEGER NOT NULL,
+    insertions INTEGER NOT NULL,
+    deletions INTEGER NOT NULL
+);
+CREATE TABLE file_changes (
+    commit_id INTEGER NOT NULL REFERENCES commits(id),
+    path_id INTEGER NOT NULL REFERENCES paths(id),
+    insertions INTEGER NOT NULL,
+    deletions INTEGER NOT NULL
+);
+CREATE TABLE files (
+    path TEXT PRIMARY KEY,
+    directory TEXT NOT NULL,
+    extension TEXT NOT NULL,
+    lines INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    commit_count INTEGER NOT NULL,
+    first_commit TEXT,
+    last_commit TEXT
+);
+CREATE TABLE directories (
+    directory TEXT PRIMARY KEY,
+    depth INTEGER NOT NULL,
+    files INTEGER NOT NULL,
+    lines INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    commits INTEGER NOT NULL,
+    insertions INTEGER NOT NULL,
+    deletions INTEGER NOT NULL,
+    authors INTEGER NOT NULL
+);
+CREATE TABLE extensions (
+    extension TEXT PRIMARY KEY,
+    files INTEGER NOT NULL,
+    lines INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    commits INTEGER NOT NULL,
+    insertions INTEGER NOT NULL,
+    deletions INTEGER NOT NULL,
+    authors INTEGER NOT NULL
+);
+"""
+
+# Built after the bulk load, which is faster than maintaining them per row
+INDEXES = """
+CREATE INDEX commits_author ON commits(author_id, timestamp, day, insertions, deletions);
+CREATE INDEX commits_timestamp ON commits(timestamp);
+CREATE INDEX commits_day ON commits(day, author_id, insertions, deletions);
+CREATE UNIQUE INDEX commits_hash ON commits(hash) WHERE hash IS NOT NULL;
+CREATE INDEX file_changes_commit ON file_changes(commit_id);
+CREATE INDEX file_changes_path ON file_changes(path_id, commit_id, insertions, deletions);
+CREATE INDEX paths_path ON paths(path);
+CREATE INDEX paths_directory ON paths(directory);
+CREATE INDEX paths_extension ON paths(extension);
+CREATE INDEX files_directory ON files(directory);
+CREATE INDEX files_extension ON files(extension);
+CREATE INDEX directories_depth ON directories(depth, lines);
+"""
+
+# Columns of every by_extension / by_directory row after the group key
+TOTAL_FIELDS = ("files", "lines", "size", "commits", "insertions", "deletions", "authors")
+
+# Summary sections of the analyzer output kept as JSON in the meta table
+SECTIONS = ("statistics", "time_analysis", "effort_estimation", "profiles", "directories")
+
+
+def split_path(path):
+    """(directory, extension) of a path; the root directory is ""."""
+    return path.rpartition("/")[0], os.path.splitext(path)[1]
+
+
+def directory_prefix(directory, depth):
+    """The ancestor of a directory at depth ("" is depth 0), or None if it is shallower"""
+    if depth == 0:
+        return ""
+    parts = directory.split("/") if directory else []
+    if len(parts) < depth:
+        return None
+    return "/".join(parts[:depth])
+
+
+def statements(script):
+    """The individual statements of a ;-separated DDL script"""
+    return [statement.strip() for statement in script.split(";") if statement.strip()]
+
+
+def connect(path):
+    """Open a database with WAL journaling and the query helpers registered"""
+    connection = sqlite3.connect(path)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.create_function("directory_prefix", 2, directory_prefix, deterministic=True)
+    return connection
+
+
+def window_clause(since, until, column="c.timestamp"):
+    """SQL condition and parameters for since <= column <= until"""
+    conditions = []
+    params = []
+    if since is not None:
+        conditions.append(f"{column} >= ?")
+        params.append(since)
+    if until is not None:
+        conditions.append(f"{column} <= ?")
+        params.append(until)
+    return (" AND ".join(conditions) or "1"), params
+
+
+class AnalysisDatabase:
+    """Indexed SQLite copy of one analysis, with aggregation queries
+
+    Time bounds are Unix timestamps, inclusive on both ends, like the
+    analyzer's since/until. Days are local calendar dates, matching the
+    commit dates of the JSON export.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = connect(path)
+
+    @classmethod
+    def create(cls, path, data):
+        """Write a fresh database for an analyzer data dict and return it
+
+        data["commits"] is the analyzer's CommitStore. Its string tables
+        become the authors and paths tables as they are, so rows are bulk
+        inserted without re-interning. A pipeline-mode store has no hashes,
+        messages or file lists, so only commit scalars are written for it.
+
+        Schema, rows and indexes go in as one explicit transaction, so a
+        failed export leaves no tables behind. executescript() is avoided:
+        it commits any open transaction before running.
+        """
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+        database = cls(path)
+        connection = database.connection
+        # Manage the transaction by hand instead of sqlite3's implicit BEGIN
+        connection.isolation_level = None
+        connection.execute("BEGIN")
+        try:
+            for statement in statements(SCHEMA):
+                connection.execute(statement)
+            database.insert_store(data["commits"])
+            database.insert_files(data.get("files", {}))
+            database.insert_rollups(data["commits"], data.get("files", {}))
+            database.insert_sections(data)
+            for statement in statements(INDEXES):
+                connection.execute(statement)
+        except BaseException:
+            connection.execute("ROLLBACK")
+            database.close()
+            raise
+        connection.execute("COMMIT")
+        connection.execute("ANALYZE")
+        return database
+
+    def insert_store(self, commits):
+        """Bulk insert authors, paths, commits and file changes from a CommitStore"""
+        execute = self.connection.executemany
+        execute("INSERT INTO authors VALUES (?, ?)", enumerate(commits.authors.values))
+
+        def path_rows():
+            for path_id, name in enumerate(commits.paths.values):
+                # Renames are stored under the new path
+                path = split_rename_path(name)[1]
+                yield (path_id, path, *split_path(path))
+
+        execute("INSERT INTO paths VALUES (?, ?, ?, ?)", path_rows())
+
+        keep_details = commits.keep_details
+
+        def commit_rows():
+            for index in range(len(commits)):
+                timestamp = commits.timestamps[index]
+                yield (
+                    index,
+                    commits.hash_at(index) if keep_details else None,
+                    commits.author_ids[index],
+                    commits.emails[commits.email_ids[index]] if keep_details else None,
+                    timestamp,
+                    date.fromtimestamp(timestamp).isoformat(),
+                    commits.messages[index] if keep_details else None,
+                    commits.files_changed[index],
+                    commits.insertions[index],
+                    commits.deletions[index]
+                )
+
+        execute("INSERT INTO commits VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", commit_rows())
+        if not keep_details:
+            return
+
+        def change_rows():
+            offsets = commits.file_offsets
+            for index in range(len(commits)):
+                for pos in range(offsets[index], offsets[index + 1]):
+                    yield (index, commits.file_path_ids[pos],
+                           commits.file_insertions[pos], commits.file_deletions[pos])
+
+        execute("INSERT INTO file_changes VALUES (?, ?, ?, ?)", change_rows())
+
+    def insert_files(self, files):
+        """Bulk insert the per-file infos of the analyzed tree"""
+        self.connection.executemany(
+            "INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            ((path, *split_path(path), info["lines"], info["size"], info["commit_count"],
+              info["first_commit"], info["last_commit"])
+             for path, info in files.items())
+        )
+
+    def insert_rollups(self, commits, files):
+        """Precompute whole-history totals per directory subtree and per extension
+
+        Unwindowed queries read these tables instead of aggregating every
+        file change; distinct commit and author counts cannot be summed from
+        per-path rows, so they are tallied here once.
+        """
+        directories = DirectoryIndex()
+        extensions = {}
+
+        def extension_totals(extension):
+            totals = extensions.get(extension)
+            if totals is None:
+                totals = extensions[extension] = {field: 0 for field in TOTAL_FIELDS}
+                totals["author_names"] = set()
+                totals["last_commit"] = -1
+            return totals
+
+        for path, info in files.items():
+            directories.add_file(path, info["lines"], info["size"])
+            totals = extension_totals(split_path(path)[1])
+            totals["files"] += 1
+            totals["lines"] += info["lines"]
+            totals["size"] += info["size"]
+
+        if commits.keep_details:
+            for index in range(len(commits)):
+                author = commits.authors[commits.author_ids[index]]
+                changes = list(commits.iter_files(index))
+                directories.add_commit(author, changes)
+                for name, insertions, deletions in changes:
+                    totals = extension_totals(os.path.splitext(split_rename_path(name)[1])[1])
+                    totals["insertions"] += insertions
+                    totals["deletions"] += deletions
+                    if totals["last_commit"] != index:
+                        totals["last_commit"] = index
+                        totals["commits"] += 1
+                        totals["author_names"].add(author)
+
+        self.connection.executemany(
+            "INSERT INTO directories VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            ((node.path, node.depth, node.files, node.lines, node.size, node.commits,
+              node.insertions, node.deletions, len(node.author_ids))
+             for node in directories.nodes.values())
+        )
+        self.connection.executemany(
+            "INSERT INTO extensions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            ((extension, totals["files"], totals["lines"], totals["size"], totals["commits"],
+              totals["insertions"], totals["deletions"], len(totals["author_names"]))
+             for extension, totals in extensions.items())
+        )
+
+    def insert_sections(self, data):
+        """Store the summary sections as JSON, plus the schema version"""
+        rows = [("schema_version", json.dumps(SCHEMA_VERSION))]
+        rows += [(key, json.dumps(data[key], default=str)) for key in SECTIONS if key in data]
+        self.connection.executemany("INSERT INTO meta VALUES (?, ?)", rows)
+
+    def query(self, sql, params=()):
+        """Run any SQL and return the rows as dicts"""
+        return [dict(row) for row in self.connection.execute(sql, params)]
+
+    def summary(self):
+        """The summary sections (statistics, time_analysis, ...) as stored"""
+        return {row["key"]: json.loads(row["value"])
+                for row in self.connection.execute("SELECT key, value FROM meta WHERE key != 'schema_version'")}
+
+    def by_author(self, since=None, until=None):
+        """Commits, insertions, deletions and active days per author, busiest first"""
+        where, params = window_clause(since, until)
+        return self.query(f"""
+            SELECT a.name AS author, COUNT(*) AS commits,
+                   SUM(c.insertions) AS insertions, SUM(c.deletions) AS deletions,
+                   COUNT(DISTINCT c.day) AS active_days,
+                   MIN(c.timestamp) AS first_timestamp, MAX(c.timestamp) AS last_timestamp
+            FROM commits c JOIN authors a ON a.id = c.author_id
+            WHERE {where}
+            GROUP BY c.author_id
+            ORDER BY commits DESC, author
+        """, params)
+
+    def by_day(self, since=None, until=None):
+        """Commits, insertions, deletions and authors per local day, in date order"""
+        where, params = window_clause(since, until)
+        return self.query(f"""
+            SELECT c.day AS day, COUNT(*) AS commits,
+                   SUM(c.insertions) AS insertions, SUM(c.deletions) AS deletions,
+                   COUNT(DISTINCT c.author_id) AS authors
+            FROM commits c
+            WHERE {where}
+            GROUP BY c.day
+            ORDER BY c.day
+        """, params)
+
+    def windowed_churn(self, group_sql, since, until, group_params=()):
+        """{key: commits, insertions, deletions, authors} of the file changes in a window"""
+        where, params = window_clause(since, until)
+        rows = self.connection.execute(f"""
+            SELECT key, COUNT(DISTINCT commit_id) AS commits, SUM(insertions) AS insertions,
+                   SUM(deletions) AS deletions, COUNT(DISTINCT author_id) AS authors
+            FROM (
+                SELECT {group_sql} AS key, fc.commit_id AS commit_id, c.author_id AS author_id,
+                       fc.insertions AS insertions, fc.deletions AS deletions
+                FROM commits c
+                JOIN file_changes fc ON fc.commit_id = c.id
+                JOIN paths p ON p.id = fc.path_id
+                WHERE {where}
+            )
+            WHERE key IS NOT NULL
+            GROUP BY key
+        """, (*group_params, *params))
+        return {row["key"]: dict(row) for row in rows}
+
+    def grouped_totals(self, name, rows, since=None, until=None, churn=None):
+        """Rows of precomputed totals; with a window, churn columns come from the window"""
+        rows = [dict(row) for row in rows]
+        if since is not None or until is not None:
+            churn = churn()
+            for row in rows:
+                windowed = churn.pop(row[name], None) or {}
+                for field in ("commits", "insertions", "deletions", "authors"):
+                    row[field] = windowed.get(field, 0)
+            # Groups changed in the window but absent from the tree
+            for key, windowed in churn.items():
+                rows.append({name: key, "files": 0, "lines": 0, "size": 0,
+                             **{field: windowed[field] for field in ("commits", "insertions", "deletions", "authors")}})
+        rows.sort(key=lambda row: (-row["lines"], -(row["insertions"] + row["deletions"]), row[name]))
+        return rows
+
+    def by_extension(self, since=None, until=None):
+        """Tree totals and churn per file extension; a window applies to churn"""
+        rows = self.connection.execute("SELECT * FROM extensions")
+        return self.grouped_totals("extension", rows, since, until,
+                                   lambda: self.windowed_churn("p.extension", since, until))
+
+    def by_directory(self, depth=1, since=None, until=None):
+        """Subtree totals and churn of every directory at depth (0 is the whole repository)
+
+        Files directly in shallower directories belong to no depth-level
+        subtree; a window applies to churn only.
+        """
+        rows = self.connection.execute(
+            "SELECT directory, files, lines, size, commits, insertions, deletions, authors "
+            "FROM directories WHERE depth = ?", (depth,))
+        return self.grouped_totals("directory", rows, since, until,
+                                   lambda: self.windowed_churn("directory_prefix(p.directory, ?)",
+                                                               since, until, (depth,)))
+
+    def subtree(self, directory, since=None, until=None):
+        """Totals of one directory subtree ("" for the whole repository), or None"""
+        directory = directory.strip("/")
+        depth = directory.count("/") + 1 if directory else 0
+        for row in self.by_directory(depth, since, until):
+            if row["directory"] == directory:
+                return row
+        return None
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
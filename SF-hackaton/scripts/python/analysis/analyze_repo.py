@@ -10,28 +10,176 @@ import os
 from datetime import datetime, timedelta
 from collections import defaultdict
 import re
+import argparse
+import asyncio
+import contextlib
+import shlex
+
+from analysis_cache import AnalysisCache, CACHE_FILENAME
+from analysis_db import AnalysisDatabase, DB_FILENAME
+from async_git import AsyncCommandRunner
+from commit_graph import CommitGraphAccelerator
+from churn_index import ChurnIndex, DEFAULT_HOTSPOT_DAYS, DEFAULT_HOTSPOTS
+from cochange import CoChangeMatrix, DEFAULT_MAX_FILES, DEFAULT_TOP_K
+from commit_store import CommitStore
+from directory_index import DirectoryIndex
+from git_batch import get_object_reader
+from line_counter import LineCountCache, LINE_COUNTS_FILENAME
+from quantile_sketch import CommitDistributions
+from phase_profiler import PhaseProfiler, count_git_bytes, count_subprocess
+from streaming_export import NdjsonWriter, dump_streamed
+from time_distribution import TimeDistribution, threshold_label, timezone_label
+from history_index import PathHistoryIndex, split_rename_path
+from hyperloglog import DEFAULT_ERROR, HyperLogLog, precision_for_error
+from loc_history import LocHistory
+from path_rules import ProfileSet
+
+# Separators used in the streaming `git log` format: a record separator marks
+# each commit header, unit separators split the header fields
+COMMIT_MARKER = "\x1e"
+FIELD_SEPARATOR = "\x1f"
+STREAM_FORMAT = "%x1e%H%x1f%an%x1f%ae%x1f%at%x1f%s"
+
+# Sessions are runs of commits at most this far apart
+SESSION_THRESHOLD = 2 * 3600  # 2 hours in seconds
+
+# Commits whose git show calls the async path runs before ingesting them
+ASYNC_COMMIT_BATCH = 256
+
+def parse_timestamp(value, end_of_day=False):
+    """Convert a since/until bound to a Unix timestamp
+    
+    Accepts Unix timestamps, datetimes and ISO strings; naive values are local
+    time like the commit dates. A bare date used as an upper bound
+    (end_of_day=True) covers that whole day.
+    """
+    if value is None or isinstance(value, (int, float)):
+        return None if value is None else int(value)
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    
+    value = str(value).strip()
+    if value.lstrip("-").isdigit():
+        return int(value)
+    dt = datetime.fromisoformat(value)
+    if end_of_day and len(value) == 10:
+        dt += timedelta(days=1, seconds=-1)
+    return int(dt.timestamp())
 
 class GitRepoAnalyzer:
-    def __init__(self, repo_path="."):
+    def __init__(self, repo_path=".", streaming=True, use_cache=True, cache_path=None,
+                 pipeline=False, commits_ndjson=None, profile=None, cprofile_dir=None,
+                 since=None, until=None, revision_range=None, timezone=None,
+                 session_thresholds=None, author_sessions=False, profiles=None, commit_graph="auto",
+                 follow_renames=True, rename_similarity=None, rename_limit=None, find_copies=False,
+                 follow_path_logs=False, file_histories=None,
+                 loc_history=False, directories=False, cochange=False,
+                 cochange_max_files=DEFAULT_MAX_FILES, cochange_top=DEFAULT_TOP_K, churn=False,
+                 hotspot_days=DEFAULT_HOTSPOT_DAYS, hotspots=DEFAULT_HOTSPOTS, distributions=False,
+                 author_error=None):
         self.repo_path = repo_path
+        self.streaming = streaming
+        # Statistics and time distribution cover commits in [since, until];
+        # revision_range ("A..B", or any single rev) limits the walk itself
+        self.since = parse_timestamp(since)
+        self.until = parse_timestamp(until, end_of_day=True)
+        self.revision_range = revision_range
+        # Hour/day histograms use this timezone (None: local time); extra
+        # session thresholds (seconds) and per-author sessions are opt-in
+        self.timezone = timezone
+        self.session_thresholds = session_thresholds
+        self.author_sessions = author_sessions
+        # Optional ProfileSet: paths no profile accepts are skipped at ingest
+        # (tree entries and commit file entries alike, so they never reach the
+        # statistics), and every profile gets its own totals in one pass
+        self.profiles = profiles
+        self.profile_totals = None
+        # Commit-graph with Bloom filters for path-limited walks: "off", "auto"
+        # (use a fresh one if found) or "write" (build one in the cache dir).
+        # Only path_log uses it, so it is detected or written on its first call
+        self.commit_graph_mode = commit_graph
+        self.commit_graph = None
+        # Paths whose full commit lists are exported; the path index only keeps
+        # per-file totals, so each one is a path-limited git log
+        self.file_histories = file_histories
+        # Rename/copy-aware file identity: per-file history follows the logical
+        # file across moves; similarity (percent) and rename limit go to git
+        self.follow_renames = follow_renames
+        self.rename_similarity = rename_similarity
+        self.rename_limit = rename_limit
+        self.find_copies = find_copies
+        # Per-path git logs (file histories, and get_file_info without a path
+        # index) stay plain path-limited walks that Bloom filters can answer;
+        # --follow, which git never answers from them, is opt-in here
+        self.follow_path_logs = follow_path_logs
+        # Cumulative numstat sums along first-parent history for point-in-time
+        # line counts and growth curves; built after the commit walk when enabled
+        self.track_loc_history = loc_history
+        self.loc_history = None
+        # Per-directory totals rolled up the path trie; exported when enabled,
+        # built on first use by get_directory_index otherwise
+        self.track_directories = directories
+        self.directory_index = None
+        # Commit part of the rollup, filled during lean (pipeline) walks
+        self.commit_directories = None
+        # Sparse co-change pair counts; commits over cochange_max_files files
+        # are skipped, and each file's cochange_top partners are exported
+        self.track_cochange = cochange
+        self.cochange_max_files = cochange_max_files
+        self.cochange_top = cochange_top
+        self.cochange = None
+        # Weekly churn per file and directory; hotspots over the last
+        # hotspot_days (ending at the newest commit) are exported
+        self.track_churn = churn
+        self.hotspot_days = hotspot_days
+        self.hotspot_count = hotspots
+        self.churn_index = None
+        # Mergeable percentile sketches of commit size and files per commit,
+        # exported with their serialized form so fleets can combine them
+        self.track_distributions = distributions
+        self.commit_distributions = None
+        # Approximate distinct authors: with a relative error (e.g. 0.02),
+        # per-file and per-directory author sets become HyperLogLog sketches
+        # and file infos carry an author_count instead of the names
+        self.author_error = author_error
+        self.author_precision = precision_for_error(author_error) if author_error else None
+        # Pipeline mode keeps only per-commit scalars in memory; full commit
+        # records go to commits_ndjson (if given) as they are parsed
+        self.pipeline = pipeline
+        self.commits_ndjson = commits_ndjson
+        # Incremental cache of commits and path history, stored in the git dir by default
+        self.use_cache = use_cache
+        self.cache_path = cache_path
+        # Shared cat-file reader for trees, blob sizes and contents
+        self.object_reader = get_object_reader(repo_path)
+        # Blob SHA -> line count memo, filled by analyze_files
+        self.line_counts = None
+        # Built during analyze_commits; get_file_info falls back to git log without it
+        self.path_index = None
+        # Per-phase instrumentation, off unless requested here or via ANALYZER_PROFILE
+        self.profiler = PhaseProfiler.from_settings(profile, cprofile_dir)
         self.data = {
-            "commits": [],
+            # Columnar store; iterating it yields the classic commit dicts
+            "commits": CommitStore(keep_details=not pipeline),
             "files": {},
             "statistics": {},
             "time_analysis": {},
             "effort_estimation": {}
         }
         
-    def run_git_command(self, cmd):
-        """Execute git command and return output"""
+    def run_git_command(self, cmd, env=None):
+        """Execute git command and return output; env adds environment variables"""
         try:
+            count_subprocess()
             result = subprocess.run(
                 cmd, 
                 shell=True, 
                 capture_output=True, 
                 text=True, 
-                cwd=self.repo_path
+                cwd=self.repo_path,
+                env={**os.environ, **env} if env else None
             )
+            count_git_bytes(len(result.stdout))
             return result.stdout.strip()
         except Exception as e:
             print(f"Error running command: {cmd}")
@@ -42,38 +190,540 @@ class GitRepoAnalyzer:
         """Analyze all commits in the repository"""
         print("Analyzing commits...")
         
+        head, cache, cached = self.load_cached_history()
+        if cached:
+            self.extend_cached_history(cached, head)
+        else:
+            # Index path history from the same walk for get_file_info
+            self.path_index = PathHistoryIndex(self.follow_renames, self.author_precision)
+            if self.streaming:
+                # One git log process for headers and per-file stats
+                with self.open_commit_writer() as writer:
+                    for commit_data in self.iter_commits(self.revision_args()):
+                        self.ingest_commit(commit_data, writer)
+            else:
+                self.analyze_commits_per_commit()
+        self.finish_commit_walk(head, cache, cached)
+    
+    def load_cached_history(self):
+        """Return (HEAD, cache, cached history); the history is None unless HEAD extends it"""
+        head = self.run_git_command("git rev-parse --verify -q HEAD")
+        # The cache needs every commit record, which pipeline mode never holds,
+        # and is keyed by HEAD, so a revision range walks without it
+        use_cache = head and not self.pipeline and not self.revision_range
+        cache = self.get_cache() if use_cache else None
+        cached = cache.load() if cache else None
+        if cached and cached.get("settings") != self.history_settings():
+            # Rename settings change the path index, so it cannot be reused
+            cached = None
+        if cached and not self.is_ancestor(cached["head"], head):
+            cached = None
+        return head, cache, cached
+    
+    def extend_cached_history(self, cached, head):
+        """Load cached commits and path history, walking only the commits added since"""
+        # Only walk commits reachable from HEAD but not from the cached HEAD
+        new_commits = []
+        if cached["head"] != head:
+            new_commits = list(self.iter_commits([f"{cached['head']}..{head}"]))
+        
+        cached_commits = CommitStore.from_dict(cached["commits"])
+        self.data["commits"] = CommitStore.from_records(new_commits)
+        self.data["commits"].extend_store(cached_commits)
+        self.path_index = PathHistoryIndex.from_dict(cached["path_index"], self.follow_renames,
+                                                    self.author_precision)
+        
+        newer_index = PathHistoryIndex(self.follow_renames, self.author_precision)
+        for commit_data in new_commits:
+            newer_index.add_commit(commit_data)
+        self.path_index.merge_newer(newer_index)
+        self.write_commits_ndjson()
+        print(f"Reused {len(cached_commits)} cached commits, {len(new_commits)} new")
+    
+    def finish_commit_walk(self, head, cache, cached):
+        """Steps every commit walk ends with: cache save, profile tallies, line history"""
+        if cache and not (cached and cached["head"] == head):
+            cache.save(head, self.data["commits"], self.path_index, self.history_settings())
+        
+        if self.data["commits"].keep_details:
+            self.tally_store_profiles()
+        if self.track_loc_history:
+            self.analyze_loc_history()
+        print(f"Found {len(self.data['commits'])} commits")
+    
+    def ingest_commit(self, commit_data, writer=None):
+        """Add one walked commit (newest first) to the store, the path index and the NDJSON export"""
+        self.data["commits"].append(commit_data)
+        logical_paths = self.path_index.add_commit(commit_data)
+        if writer:
+            writer.write(commit_data)
+        if not self.data["commits"].keep_details:
+            # Lean stores drop file lists, so tally them now
+            self.tally_commit_files(self.commit_file_stats(commit_data))
+            self.tally_commit_directories(commit_data)
+            self.tally_commit_cochange(commit_data, logical_paths)
+            self.tally_commit_churn(commit_data, logical_paths)
+    
+    def analyze_loc_history(self):
+        """Index line totals along the first-parent history of the analyzed tip
+        
+        The sums always start at the root commit, so a revision range only
+        picks the tip; the export keeps the repository and top-level curves.
+        
+        This is a second git log pass on purpose. The commit walk stops at a
+        revision range or a cached HEAD, drops paths no profile accepts, pairs
+        renames (the sums need them split into delete + add) and carries no
+        blob ids for binary transitions, so its records cannot be summed.
+        """
+        print("Indexing line history...")
+        self.loc_history = LocHistory.build(self.repo_path, self.tree_revision())
+        self.data["loc_history"] = {
+            "first_parent_commits": len(self.loc_history),
+            "lines": self.loc_history.lines(),
+            "growth_curves": self.loc_history.growth_curves(["", *self.loc_history.directories(max_depth=1)])
+        }
+    
+    def lines_at(self, path="", commit=None, date=None):
+        """Lines of a file or directory ("dir/", "" for all) at a commit or date"""
+        if self.loc_history is None:
+            self.loc_history = LocHistory.build(self.repo_path, self.tree_revision())
+        return self.loc_history.lines(path, commit, parse_timestamp(date, end_of_day=True))
+    
+    def export_growth_curves(self, filename, paths=None):
+        """Write growth curves (default: the repository and every directory) to JSON"""
+        if self.loc_history is None:
+            self.loc_history = LocHistory.build(self.repo_path, self.tree_revision())
+        output_path = os.path.join(self.repo_path, filename)
+        with open(output_path, 'w') as f:
+            json.dump(self.loc_history.growth_curves(paths), f, indent=2)
+        print(f"Growth curves exported to {filename}")
+        return output_path
+    
+    def history_settings(self):
+        """Settings the cached path index was built with"""
+        return {
+            "follow_renames": self.follow_renames,
+            "rename_similarity": self.rename_similarity,
+            "rename_limit": self.rename_limit,
+            "find_copies": self.find_copies,
+            "author_precision": self.author_precision,
+            # Cached commits have excluded paths already dropped
+            "profiles": self.profiles.to_dict() if self.profiles is not None else None
+        }
+    
+    def rename_args(self):
+        """git diff options for rename/copy detection
+        
+        git pairs exact renames by blob id first and caps the inexact
+        (quadratic) matching at the rename limit, so directory moves stay cheap.
+        """
+        if not self.follow_renames:
+            return []
+        similarity = f"{self.rename_similarity}%" if self.rename_similarity else ""
+        args = [f"-M{similarity}"]
+        if self.find_copies:
+            # --raw tells copies (C) apart from renames (R); numstat shows both as "a => b"
+            args += [f"-C{similarity}", "--raw"]
+        if self.rename_limit is not None:
+            args.append(f"-l{self.rename_limit}")
+        return args
+    
+    def get_profile_totals(self):
+        """Per-profile totals, created on first use"""
+        if self.profile_totals is None:
+            self.profile_totals = {
+                name: {"files": 0, "lines": 0, "size_bytes": 0, "commits": 0, "insertions": 0, "deletions": 0}
+                for name in self.profiles.names
+            }
+        return self.profile_totals
+    
+    def commit_file_stats(self, commit_data):
+        """(path, insertions, deletions) for each file entry of a commit record"""
+        return [(entry["name"], entry["insertions"], entry["deletions"])
+                for entry in commit_data["stats"]["files"]]
+    
+    def drop_excluded_files(self, stats):
+        """Remove file entries no path profile accepts from commit stats, adjusting the totals
+        
+        The commit itself is kept, so commit counts and time analysis still
+        see commits that only touched excluded paths.
+        """
+        if self.profiles is None:
+            return stats
+        kept = []
+        for file_entry in stats["files"]:
+            # Renames belong to the profiles of the new path
+            if self.profiles.classify(split_rename_path(file_entry["name"])[1]):
+                kept.append(file_entry)
+            else:
+                stats["files_changed"] -= 1
+                stats["insertions"] -= file_entry["insertions"]
+                stats["deletions"] -= file_entry["deletions"]
+        stats["files"] = kept
+        return stats
+    
+    def tally_commit_files(self, files):
+        """Add one commit's file changes to the totals of every profile they belong to"""
+        if self.profiles is None:
+            return
+        totals = self.get_profile_totals()
+        touched = set()
+        for name, insertions, deletions in files:
+            # Renames count towards the profiles of the new path
+            for profile in self.profiles.classify(split_rename_path(name)[1]):
+                totals[profile]["insertions"] += insertions
+                totals[profile]["deletions"] += deletions
+                touched.add(profile)
+        for profile in touched:
+            totals[profile]["commits"] += 1
+    
+    def tally_store_profiles(self):
+        """Tally every commit in the store; paths are classified once each"""
+        if self.profiles is None:
+            return
+        commits = self.data["commits"]
+        for index in range(len(commits)):
+            self.tally_commit_files(commits.iter_files(index))
+    
+    def in_window(self, timestamp):
+        """Whether a commit time lies inside the since/until window"""
+        return (self.since is None or timestamp >= self.since) and (self.until is None or timestamp <= self.until)
+    
+    def tally_commit_directories(self, commit_data):
+        """Add a commit inside the statistics window to the walk-time directory rollup"""
+        if not self.track_directories or not self.in_window(commit_data["timestamp"]):
+            return
+        if self.commit_directories is None:
+            self.commit_directories = DirectoryIndex(self.author_precision)
+        self.commit_directories.add_commit(commit_data["author"], self.commit_file_stats(commit_data))
+    
+    def tally_commit_cochange(self, commit_data, logical_paths):
+        """Add a commit inside the statistics window to the walk-time co-change counts
+        
+        logical_paths come from the path index, so renamed files keep their couplings.
+        """
+        if not self.track_cochange or not self.in_window(commit_data["timestamp"]):
+            return
+        if self.cochange is None:
+            self.cochange = CoChangeMatrix(self.cochange_max_files)
+        self.cochange.add_commit(logical_paths)
+    
+    def iter_logical_paths(self):
+        """(commit index, logical paths) for every stored commit, in walk order
+        
+        Replays the stored file lists through a fresh rename index. The store
+        keeps no copy records, so copies are taken from the analysis's own
+        path index, which saw them during the walk.
+        """
+        commits = self.data["commits"]
+        copies = {(entry["copied_from"], path) for path, entry in self.path_index.paths.items()
+                  if "copied_from" in entry} if self.path_index is not None else set()
+        index = PathHistoryIndex(self.follow_renames)
+        for commit_index in range(len(commits)):
+            names = [name for name, _, _ in commits.iter_files(commit_index)]
+            record = {"hash": commit_index, "author": None,
+                      "stats": {"files": [{"name": name} for name in names]}}
+            if copies:
+                record["copied_paths"] = [pair for pair in map(split_rename_path, names) if pair in copies]
+            yield commit_index, index.add_commit(record)
+    
+    def get_cochange_matrix(self):
+        """Co-change counts of the windowed commits, built on first use"""
+        if self.cochange is None:
+            self.cochange = CoChangeMatrix(self.cochange_max_files)
+            commits = self.data["commits"]
+            if commits.keep_details:
+                window = set(commits.window_indices(self.since, self.until))
+                for commit_index, logical_paths in self.iter_logical_paths():
+                    if commit_index in window:
+                        self.cochange.add_commit(logical_paths)
+        return self.cochange
+    
+    def tally_commit_churn(self, commit_data, logical_paths):
+        """Add a commit inside the statistics window to the walk-time churn index
+        
+        Files are keyed by the logical paths from the path index, as co-change
+        counts are, so hotspots keep the churn of a file's older names.
+        """
+        if not self.track_churn or not self.in_window(commit_data["timestamp"]):
+            return
+        if self.churn_index is None:
+            self.churn_index = ChurnIndex()
+        self.churn_index.add_commit(commit_data["timestamp"], self.commit_file_stats(commit_data), logical_paths)
+    
+    def get_churn_index(self):
+        """Weekly churn of the windowed commits, built on first use"""
+        if self.churn_index is None:
+            self.churn_index = ChurnIndex()
+            commits = self.data["commits"]
+            if commits.keep_details:
+                window = set(commits.window_indices(self.since, self.until))
+                for commit_index, logical_paths in self.iter_logical_paths():
+                    if commit_index in window:
+                        self.churn_index.add_commit(commits.timestamps[commit_index],
+                                                    commits.iter_files(commit_index), logical_paths)
+        return self.churn_index
+    
+    def hotspots(self, days=DEFAULT_HOTSPOT_DAYS, n=DEFAULT_HOTSPOTS, kind="files"):
+        """Files still in the analyzed tree (or directories) with the most recent churn"""
+        keys = self.data["files"] if kind == "files" else None
+        return self.get_churn_index().hotspots(days, n, kind, keys=keys)
+    
+    def export_churn_series(self, filename):
+        """Write every file's and directory's weekly churn series to JSON"""
+        output_path = os.path.join(self.repo_path, filename)
+        with open(output_path, 'w') as f:
+            json.dump(self.get_churn_index().to_dict(), f)
+        print(f"Churn series exported to {filename}")
+        return output_path
+    
+    def get_commit_distributions(self):
+        """Quantile sketches of the windowed commits, overall and per author
+        
+        Built from the store's scalar columns, which pipeline mode keeps too.
+        """
+        if self.commit_distributions is None:
+            commits = self.data["commits"]
+            distributions = CommitDistributions()
+            for commit_index in commits.window_indices(self.since, self.until):
+                distributions.add_commit(commits.authors[commits.author_ids[commit_index]],
+                                         commits.insertions[commit_index], commits.deletions[commit_index],
+                                         commits.files_changed[commit_index])
+            self.commit_distributions = distributions
+        return self.commit_distributions
+    
+    def get_directory_index(self):
+        """Directory rollup of the analyzed files and the windowed commits, built on first use"""
+        if self.directory_index is None:
+            commits = self.data["commits"]
+            if commits.keep_details:
+                index = DirectoryIndex(self.author_precision)
+                for commit_index in commits.window_indices(self.since, self.until):
+                    index.add_commit(commits.authors[commits.author_ids[commit_index]],
+                                     commits.iter_files(commit_index))
+            else:
+                index = self.commit_directories or DirectoryIndex(self.author_precision)
+            for filename, file_info in self.data["files"].items():
+                index.add_file(filename, file_info["lines"], file_info["size"])
+            self.directory_index = index
+        return self.directory_index
+    
+    def revision_args(self):
+        """Extra git log arguments selecting the analyzed revisions"""
+        return [self.revision_range] if self.revision_range else []
+    
+    def tree_revision(self):
+        """The commit whose tree is analyzed: the tip of the revision range"""
+        if not self.revision_range:
+            return "HEAD"
+        tip = self.revision_range.split("..")[-1].lstrip(".")
+        return tip or "HEAD"
+    
+    def open_commit_writer(self):
+        """Open the NDJSON commit writer, or a no-op context when not exporting"""
+        if not self.commits_ndjson:
+            return contextlib.nullcontext()
+        return NdjsonWriter(self.commits_ndjson)
+    
+    def write_commits_ndjson(self):
+        """Write already collected commits to the NDJSON export, if enabled"""
+        with self.open_commit_writer() as writer:
+            if writer:
+                for commit_data in self.data["commits"]:
+                    writer.write(commit_data)
+    
+    def get_cache(self):
+        """Return the incremental analysis cache, or None when caching is off"""
+        if not self.use_cache:
+            return None
+        
+        cache_path = self.cache_path
+        if cache_path is None:
+            cache_dir = self.get_cache_dir()
+            if not cache_dir:
+                return None
+            cache_path = os.path.join(cache_dir, CACHE_FILENAME)
+        return AnalysisCache(cache_path)
+    
+    def get_cache_dir(self):
+        """Return the directory for cache files: next to cache_path, else the git dir"""
+        if self.cache_path is not None:
+            return os.path.dirname(os.path.abspath(self.cache_path))
+        return self.run_git_command("git rev-parse --absolute-git-dir")
+    
+    def get_commit_graph(self):
+        """Return the commit-graph accelerator, detecting (or writing) the graph once"""
+        if self.commit_graph is None:
+            cache_dir = self.get_cache_dir() if self.use_cache else None
+            self.commit_graph = CommitGraphAccelerator(self.repo_path, cache_dir, self.commit_graph_mode)
+            self.commit_graph.prepare()
+            if self.commit_graph.status["source"]:
+                print(f"Using commit-graph with Bloom filters from the {self.commit_graph.status['source']}")
+        return self.commit_graph
+    
+    def path_log(self, filename, log_format, follow=False, limit=None):
+        """git log limited to one path, answered from Bloom filters when available
+        
+        follow adds --follow, which walks renames but makes git skip the
+        changed-path Bloom filters entirely.
+        """
+        env = self.get_commit_graph().env
+        options = " ".join(["--follow"] + [arg for arg in self.rename_args() if arg != "--raw"]) if follow else ""
+        if limit is not None:
+            options += f" -n {int(limit)}"
+        return self.run_git_command(f'git log --format="{log_format}" {options} -- "{filename}"', env=env)
+    
+    def is_ancestor(self, ancestor, commit):
+        """Check whether ancestor is reachable from commit"""
+        count_subprocess()
+        result = subprocess.run(
+            ["git", "merge-base", "--is-ancestor", ancestor, commit],
+            capture_output=True,
+            cwd=self.repo_path
+        )
+        return result.returncode == 0
+    
+    def analyze_commits_per_commit(self):
+        """Analyze commits by running git show for every commit (slow path)
+        
+        Each commit is ingested as soon as its stats are in, like the streamed
+        walk, so a pipeline (lean) store works here too.
+        """
         # Get all commits with details
         commit_format = "%H|%an|%ae|%at|%s"
-        commits_raw = self.run_git_command(f'git log --format="{commit_format}"')
-        
-        for line in commits_raw.split('\n'):
-            if not line:
-                continue
-                
-            parts = line.split('|')
-            if len(parts) >= 5:
-                commit_hash = parts[0]
-                author = parts[1]
-                email = parts[2]
-                timestamp = int(parts[3])
-                message = '|'.join(parts[4:])
-                
-                # Get commit stats
-                stats = self.get_commit_stats(commit_hash)
-                
-                commit_data = {
-                    "hash": commit_hash,
-                    "author": author,
-                    "email": email,
-                    "timestamp": timestamp,
-                    "date": datetime.fromtimestamp(timestamp).isoformat(),
-                    "message": message,
-                    "stats": stats
-                }
-                
-                self.data["commits"].append(commit_data)
+        range_arg = " ".join(shlex.quote(arg) for arg in self.revision_args())
+        commits_raw = self.run_git_command(f'git log --topo-order --format="{commit_format}" {range_arg}')
         
-        print(f"Found {len(self.data['commits'])} commits")
+        with self.open_commit_writer() as writer:
+            for line in commits_raw.split('\n'):
+                if not line:
+                    continue
+                    
+                parts = line.split('|')
+                if len(parts) >= 5:
+                    commit_hash = parts[0]
+                    author = parts[1]
+                    email = parts[2]
+                    timestamp = int(parts[3])
+                    message = '|'.join(parts[4:])
+                    
+                    # Get commit stats
+                    stats = self.get_commit_stats(commit_hash)
+                    
+                    commit_data = self.make_commit(commit_hash, author, email, timestamp, message)
+                    commit_data["stats"] = stats
+                    
+                    self.ingest_commit(commit_data, writer)
+    
+    def make_commit(self, commit_hash, author, email, timestamp, message):
+        """Build an empty commit record"""
+        return {
+            "hash": commit_hash,
+            "author": author,
+            "email": email,
+            "timestamp": timestamp,
+            "date": datetime.fromtimestamp(timestamp).isoformat(),
+            "message": message,
+            "stats": {
+                "files_changed": 0,
+                "insertions": 0,
+                "deletions": 0,
+                "files": []
+            }
+        }
+    
+    def iter_commits(self, extra_args=None):
+        """Stream commits with per-file stats from a single git log process
+        
+        Yields commit records in the same shape as analyze_commits stores them,
+        newest first, parsing the output incrementally as git produces it.
+        """
+        # Unquoted UTF-8 paths match the names read from tree objects; merges
+        # count their first-parent diff, as `git show` does on the other paths.
+        # The path index needs every child before its parents, which commit
+        # date order does not promise under tied or skewed timestamps
+        cmd = ["git", "-c", "core.quotePath=false", "log", "--topo-order", "--numstat",
+               "--diff-merges=first-parent", f"--format={STREAM_FORMAT}"]
+        cmd.extend(self.rename_args())
+        if extra_args:
+            cmd.extend(extra_args)
+        
+        count_subprocess()
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            cwd=self.repo_path
+        )
+        
+        commit = None
+        try:
+            for line in process.stdout:
+                count_git_bytes(len(line))
+                line = line.rstrip("\n")
+                if line.startswith(COMMIT_MARKER):
+                    if commit is not None:
+                        self.drop_excluded_files(commit["stats"])
+                        yield commit
+                    commit = self.parse_commit_header(line[len(COMMIT_MARKER):])
+                elif commit is not None and line.startswith(":"):
+                    self.add_raw_line(commit, line)
+                elif commit is not None and '\t' in line:
+                    self.add_numstat_line(commit["stats"], line)
+            
+            # Don't forget the last commit
+            if commit is not None:
+                self.drop_excluded_files(commit["stats"])
+                yield commit
+        finally:
+            # Stop git if the consumer closed the generator early
+            if process.poll() is None:
+                process.kill()
+            process.stdout.close()
+            process.wait()
+    
+    def parse_commit_header(self, header):
+        """Parse a streaming header line into an empty commit record"""
+        parts = header.split(FIELD_SEPARATOR)
+        if len(parts) < 5:
+            return None
+        
+        message = FIELD_SEPARATOR.join(parts[4:])
+        return self.make_commit(parts[0], parts[1], parts[2], int(parts[3]), message)
+    
+    def add_raw_line(self, commit, line):
+        """Record a copy from a `git --raw` line; other raw lines carry nothing numstat lacks"""
+        parts = line.split('\t')
+        status = parts[0].split()[-1] if parts[0] else ""
+        if status.startswith("C") and len(parts) >= 3:
+            commit.setdefault("copied_paths", []).append([parts[1], parts[2]])
+    
+    def add_numstat_line(self, stats, line):
+        """Add one `git --numstat` line to commit stats, return the file entry"""
+        parts = line.split('\t')
+        if len(parts) < 3:
+            return None
+        
+        # Binary files report "-" for both counts
+        try:
+            insertions = int(parts[0]) if parts[0] != '-' else 0
+            deletions = int(parts[1]) if parts[1] != '-' else 0
+        except ValueError:
+            return None
+        
+        file_entry = {
+            "name": parts[2],
+            "insertions": insertions,
+            "deletions": deletions
+        }
+        stats["files"].append(file_entry)
+        stats["files_changed"] += 1
+        stats["insertions"] += insertions
+        stats["deletions"] += deletions
+        return file_entry
     
     def get_commit_stats(self, commit_hash):
         """Get detailed statistics for a commit"""
@@ -95,7 +745,9 @@ class GitRepoAnalyzer:
             stats["deletions"] = int(stats_match.group(3)) if stats_match.group(3) else 0
         
         # Get list of changed files with their stats
-        numstat = self.run_git_command(f"git show --numstat {commit_hash}")
+        rename_options = " ".join(arg for arg in self.rename_args() if arg != "--raw")
+        # Unquoted UTF-8 paths, matching the tree listing and the streamed walk
+        numstat = self.run_git_command(f"git -c core.quotePath=false show --numstat {rename_options} {commit_hash}")
         for line in numstat.split('\n'):
             if '\t' in line:
                 parts = line.split('\t')
@@ -112,26 +764,67 @@ class GitRepoAnalyzer:
                     except:
                         pass
         
-        return stats
+        return self.drop_excluded_files(stats)
     
     def analyze_files(self):
         """Analyze all files in the repository"""
         print("Analyzing files...")
         
-        # Get all files in current state
-        files = self.run_git_command("git ls-tree -r HEAD --name-only")
-        
-        for filename in files.split('\n'):
-            if not filename:
-                continue
-            
-            file_info = self.get_file_info(filename)
+        tree_entries = self.load_tree()
+        self.build_file_infos(tree_entries)
+    
+    def load_tree(self):
+        """List the analyzed tree with blob sizes and line counts, independent of the commit walk"""
+        # Get all files in current state, with blob sizes, over one cat-file pipe;
+        # with path profiles, excluded subtrees are never fetched or sized
+        if self.profiles is None:
+            tree_entries = self.object_reader.list_tree(self.tree_revision())
+        else:
+            tree_entries = self.object_reader.list_tree(
+                self.tree_revision(),
+                prune_dir=self.profiles.prunes,
+                keep_path=lambda path: bool(self.profiles.classify(path))
+            )
+        self.count_blob_lines(tree_entries)
+        return tree_entries
+    
+    def build_file_infos(self, tree_entries):
+        """Build per-file info for listed tree entries"""
+        for tree_entry in tree_entries:
+            filename = tree_entry["path"]
+            file_info = self.get_file_info(filename, tree_entry)
             self.data["files"][filename] = file_info
+            if self.profiles is not None:
+                totals = self.get_profile_totals()
+                for profile in self.profiles.classify(filename):
+                    totals[profile]["files"] += 1
+                    totals[profile]["lines"] += file_info["lines"]
+                    totals[profile]["size_bytes"] += file_info["size"]
         
         print(f"Analyzed {len(self.data['files'])} files")
     
-    def get_file_info(self, filename):
-        """Get detailed information about a file"""
+    def count_blob_lines(self, tree_entries):
+        """Count lines for blobs not already memoized, in one pipelined pass"""
+        cache_dir = self.get_cache_dir() if self.use_cache else None
+        cache_path = os.path.join(cache_dir, LINE_COUNTS_FILENAME) if cache_dir else None
+        self.line_counts = LineCountCache(cache_path)
+        
+        missing = self.line_counts.missing(
+            entry["sha"] for entry in tree_entries if entry["type"] == "blob"
+        )
+        for sha, obj in self.object_reader.iter_objects(missing):
+            if obj is not None:
+                self.line_counts.add(sha, obj[2])
+        
+        print(f"Counted lines in {len(missing)} new blobs")
+        self.line_counts.save()
+    
+    def get_file_info(self, filename, tree_entry=None):
+        """Get detailed information about a file
+        
+        With a tree_entry from GitObjectReader.list_tree, size and line count
+        come from the HEAD blob; otherwise they are read from the working tree.
+        """
         info = {
             "name": filename,
             "size": 0,
@@ -140,48 +833,87 @@ class GitRepoAnalyzer:
             "first_commit": None,
             "last_commit": None,
             "commit_count": 0,
-            "authors": []
+            "authors": [],
+            "previous_paths": []
         }
         
-        # Get file size
-        try:
-            file_path = os.path.join(self.repo_path, filename)
-            if os.path.exists(file_path):
-                info["size"] = os.path.getsize(file_path)
-                
-                # Count lines for text files
-                try:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        info["lines"] = sum(1 for _ in f)
-                except:
-                    pass
-        except:
-            pass
+        if tree_entry is not None:
+            # Size and memoized line count of the HEAD blob
+            info["size"] = tree_entry["size"] or 0
+            if self.line_counts is not None:
+                info["lines"] = self.line_counts.get(tree_entry["sha"])
+        else:
+            # Get file size
+            try:
+                file_path = os.path.join(self.repo_path, filename)
+                if os.path.exists(file_path):
+                    info["size"] = os.path.getsize(file_path)
+                    
+                    # Count lines for text files
+                    try:
+                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                            info["lines"] = sum(1 for _ in f)
+                    except:
+                        pass
+            except:
+                pass
         
-        # Get file history
-        log = self.run_git_command(f'git log --format="%H|%at|%an" -- "{filename}"')
-        commits = []
-        authors = set()
+        # Answer history from the path index when the commit walk built one
+        if self.path_index is not None:
+            entry = self.path_index.lookup(filename)
+            if entry is not None:
+                info["first_commit"] = entry["first_commit"]
+                info["last_commit"] = entry["last_commit"]
+                info["commit_count"] = entry["commit_count"]
+                self.set_authors(info, entry["authors"])
+                info["previous_paths"] = list(entry["previous_paths"])
+            return info
         
-        for line in log.split('\n'):
-            if '|' in line:
-                parts = line.split('|')
-                if len(parts) >= 3:
-                    commits.append({
-                        "hash": parts[0],
-                        "timestamp": int(parts[1]),
-                        "author": parts[2]
-                    })
-                    authors.add(parts[2])
+        # Get file history at this path; rename history comes from the path index
+        commits = self.file_history(filename)
+        authors = set() if self.author_precision is None else HyperLogLog(self.author_precision)
+        for commit in commits:
+            authors.add(commit["author"])
         
         if commits:
             info["first_commit"] = commits[-1]["hash"]
             info["last_commit"] = commits[0]["hash"]
             info["commit_count"] = len(commits)
-            info["authors"] = list(authors)
+            self.set_authors(info, authors)
         
         return info
     
+    def file_history(self, filename, limit=None):
+        """Commits that touched a path, newest first, as {hash, timestamp, author}
+        
+        Runs a path-limited git log, which the commit-graph's Bloom filters
+        answer without diffing most commits' trees.
+        """
+        log = self.path_log(filename, "%H|%at|%an", follow=self.follow_path_logs, limit=limit)
+        commits = []
+        for line in log.split('\n'):
+            parts = line.split('|', 2)
+            if len(parts) == 3:
+                commits.append({
+                    "hash": parts[0],
+                    "timestamp": int(parts[1]),
+                    "author": parts[2]
+                })
+        return commits
+    
+    def analyze_file_histories(self):
+        """Export the commit list of every requested path"""
+        print("Reading file histories...")
+        self.data["file_histories"] = {filename: self.file_history(filename) for filename in self.file_histories}
+    
+    def set_authors(self, info, authors):
+        """Authors of a file info: the names, or only an estimated count in approximate mode"""
+        if self.author_precision is None:
+            info["authors"] = list(authors)
+        else:
+            del info["authors"]
+            info["author_count"] = len(authors)
+    
     def calculate_statistics(self):
         """Calculate overall repository statistics"""
         print("Calculating statistics...")
@@ -198,37 +930,117 @@ class GitRepoAnalyzer:
             language_stats[ext]["lines"] += file_info["lines"]
             language_stats[ext]["size"] += file_info["size"]
         
-        # Commit statistics
-        if self.data["commits"]:
-            total_insertions = sum(c["stats"]["insertions"] for c in self.data["commits"])
-            total_deletions = sum(c["stats"]["deletions"] for c in self.data["commits"])
-            
-            # Time span
-            timestamps = [c["timestamp"] for c in self.data["commits"]]
-            first_commit_time = min(timestamps)
-            last_commit_time = max(timestamps)
-            time_span_seconds = last_commit_time - first_commit_time
-            time_span_hours = time_span_seconds / 3600
-            time_span_days = time_span_seconds / 86400
-        else:
-            total_insertions = 0
-            total_deletions = 0
-            time_span_hours = 0
-            time_span_days = 0
+        # Commit statistics for the requested window
+        window = self.window_statistics(self.since, self.until)
         
         self.data["statistics"] = {
-            "total_commits": len(self.data["commits"]),
+            "total_commits": window["commits"],
             "total_files": total_files,
             "total_lines": total_lines,
             "total_size_bytes": total_size,
             "total_size_mb": round(total_size / 1024 / 1024, 2),
-            "total_insertions": total_insertions,
-            "total_deletions": total_deletions,
-            "net_lines": total_insertions - total_deletions,
+            "total_insertions": window["insertions"],
+            "total_deletions": window["deletions"],
+            "net_lines": window["insertions"] - window["deletions"],
             "languages": dict(language_stats),
-            "time_span_hours": round(time_span_hours, 2),
-            "time_span_days": round(time_span_days, 2)
+            "time_span_hours": window["time_span_hours"],
+            "time_span_days": window["time_span_days"]
         }
+        if self.profiles is not None:
+            self.data["profiles"] = {
+                name: {**totals, "rules": self.profiles.to_dict()[name]}
+                for name, totals in self.get_profile_totals().items()
+            }
+        if self.track_directories:
+            directory_index = self.get_directory_index()
+            self.data["directories"] = {
+                "hottest": directory_index.top("churn"),
+                "tree": directory_index.to_dict()
+            }
+            if directory_index.approximate:
+                # Serialized repository-wide sketch, mergeable with other repositories'
+                self.data["directories"]["author_error"] = round(directory_index.root.author_ids.error, 4)
+                self.data["directories"]["author_sketch"] = directory_index.author_sketch()
+        if self.track_cochange:
+            self.data["cochange"] = self.get_cochange_matrix().to_dict(self.cochange_top)
+        if self.track_churn:
+            weeks = self.get_churn_index().series()
+            self.data["churn"] = {
+                "hotspot_days": self.hotspot_days,
+                "first_week": weeks[0][0] if weeks else None,
+                "last_week": weeks[-1][0] if weeks else None,
+                "hotspots": {
+                    kind: self.hotspots(self.hotspot_days, self.hotspot_count, kind)
+                    for kind in ("files", "directories")
+                }
+            }
+        if self.track_distributions:
+            distributions = self.get_commit_distributions()
+            self.data["distributions"] = {**distributions.summary(), "sketches": distributions.to_dict()}
+        if self.since is not None or self.until is not None or self.revision_range:
+            self.data["statistics"]["window"] = {
+                "since": datetime.fromtimestamp(self.since).isoformat() if self.since is not None else None,
+                "until": datetime.fromtimestamp(self.until).isoformat() if self.until is not None else None,
+                "revision_range": self.revision_range
+            }
+    
+    def window_statistics(self, since=None, until=None):
+        """Commit totals and time span for since <= timestamp <= until
+        
+        Answered from the store's sorted timestamp index, so repeated windows
+        (dashboards, rolling periods) cost two binary searches plus the sums.
+        """
+        commits = self.data["commits"]
+        start, end = commits.window(since, until)
+        if end == start:
+            return {"commits": 0, "insertions": 0, "deletions": 0,
+                    "time_span_hours": 0, "time_span_days": 0}
+        
+        if start == 0 and end == len(commits):
+            # Sums straight off the typed columns
+            total_insertions = sum(commits.insertions)
+            total_deletions = sum(commits.deletions)
+        else:
+            indices = commits.window_indices(since, until)
+            total_insertions = sum(commits.insertions[i] for i in indices)
+            total_deletions = sum(commits.deletions[i] for i in indices)
+        
+        # Time span
+        _, sorted_timestamps = commits.time_index()
+        time_span_seconds = sorted_timestamps[end - 1] - sorted_timestamps[start]
+        return {
+            "commits": end - start,
+            "insertions": total_insertions,
+            "deletions": total_deletions,
+            "time_span_hours": round(time_span_seconds / 3600, 2),
+            "time_span_days": round(time_span_seconds / 86400, 2)
+        }
+    
+    def rolling_statistics(self, window_seconds, step_seconds=None, since=None, until=None):
+        """Window statistics for consecutive windows, e.g. sprints or weeks
+        
+        Windows of window_seconds start every step_seconds (default: back to
+        back) from since (default: first commit) up to until (default: last).
+        """
+        commits = self.data["commits"]
+        if not len(commits):
+            return []
+        
+        _, sorted_timestamps = commits.time_index()
+        since = sorted_timestamps[0] if since is None else since
+        until = sorted_timestamps[-1] if until is None else until
+        step_seconds = step_seconds or window_seconds
+        
+        windows = []
+        window_start = since
+        while window_start <= until:
+            window_end = min(window_start + window_seconds - 1, until)
+            stats = self.window_statistics(window_start, window_end)
+            stats["start"] = datetime.fromtimestamp(window_start).isoformat()
+            stats["end"] = datetime.fromtimestamp(window_end).isoformat()
+            windows.append(stats)
+            window_start += step_seconds
+        return windows
     
     def estimate_human_effort(self):
         """Estimate human effort required for the work"""
@@ -319,80 +1131,251 @@ class GitRepoAnalyzer:
         """Analyze how work was distributed over time"""
         print("Analyzing time distribution...")
         
-        if not self.data["commits"]:
-            return
+        time_analysis = self.window_time_distribution(self.since, self.until)
+        if time_analysis is not None:
+            self.data["time_analysis"] = time_analysis
+    
+    def window_time_distribution(self, since=None, until=None, session_threshold=SESSION_THRESHOLD):
+        """Hour/day histograms and work sessions for since <= timestamp <= until
         
-        # Group commits by hour and day
-        commits_by_hour = defaultdict(int)
-        commits_by_day = defaultdict(int)
-        work_sessions = []
+        Computed over the window's timestamp array in one shot (see
+        TimeDistribution); returns None when the window holds no commits.
+        """
+        commits = self.data["commits"]
+        start, end = commits.window(since, until)
+        if end == start:
+            return None
         
-        # Sort commits by timestamp
-        sorted_commits = sorted(self.data["commits"], key=lambda x: x["timestamp"])
+        # Commit timestamps in the window, already sorted by the store's index
+        time_order, sorted_timestamps = commits.time_index()
+        author_ids = None
+        if self.author_sessions:
+            author_ids = [commits.author_ids[i] for i in time_order[start:end]]
+        distribution = TimeDistribution(sorted_timestamps[start:end], author_ids, self.timezone)
         
-        # Identify work sessions (commits within 2 hours of each other)
-        session_threshold = 2 * 3600  # 2 hours in seconds
-        current_session = {"start": None, "end": None, "commits": 0}
+        commits_by_hour, commits_by_day = distribution.histograms()
+        thresholds = [session_threshold] + [t for t in self.session_thresholds or [] if t != session_threshold]
+        sessions = distribution.sessions(thresholds)
         
-        for commit in sorted_commits:
-            timestamp = commit["timestamp"]
-            dt = datetime.fromtimestamp(timestamp)
-            
-            # Count by hour and day
-            commits_by_hour[dt.hour] += 1
-            commits_by_day[dt.strftime("%Y-%m-%d")] += 1
-            
-            # Track work sessions
-            if current_session["start"] is None:
-                current_session["start"] = timestamp
-                current_session["end"] = timestamp
-                current_session["commits"] = 1
-            elif timestamp - current_session["end"] <= session_threshold:
-                current_session["end"] = timestamp
-                current_session["commits"] += 1
-            else:
-                # Save current session and start new one
-                work_sessions.append(current_session.copy())
-                current_session = {"start": timestamp, "end": timestamp, "commits": 1}
-        
-        # Don't forget the last session
-        if current_session["start"] is not None:
-            work_sessions.append(current_session)
-        
-        # Calculate session statistics
-        session_durations = [(s["end"] - s["start"]) / 3600 for s in work_sessions]
-        
-        self.data["time_analysis"] = {
-            "commits_by_hour": dict(commits_by_hour),
-            "commits_by_day": dict(commits_by_day),
-            "work_sessions": len(work_sessions),
-            "average_session_hours": round(sum(session_durations) / len(session_durations), 2) if session_durations else 0,
-            "total_active_hours": round(sum(session_durations), 2)
+        time_analysis = {
+            "commits_by_hour": commits_by_hour,
+            "commits_by_day": commits_by_day,
+            **sessions[session_threshold]
         }
+        if self.timezone is not None:
+            time_analysis["timezone"] = timezone_label(distribution.tz)
+        if self.session_thresholds:
+            time_analysis["sessions_by_threshold"] = {
+                threshold_label(threshold): sessions[threshold] for threshold in sorted(thresholds)
+            }
+        if self.author_sessions:
+            time_analysis["author_sessions"] = {
+                author: {threshold_label(threshold): stats for threshold, stats in by_threshold.items()}
+                for author, by_threshold in distribution.author_sessions(thresholds, commits.authors).items()
+            }
+        return time_analysis
     
     def export_to_json(self, filename="repo_analysis.json"):
-        """Export all data to JSON file"""
+        """Export all data to JSON file
+        
+        Commits are written one at a time from the store. In pipeline mode the
+        file is a summary document that points at the NDJSON commit export.
+        """
         output_path = os.path.join(self.repo_path, filename)
+        data = self.data
+        if not self.data["commits"].keep_details:
+            data = {key: value for key, value in self.data.items() if key != "commits"}
+            data["commits_ndjson"] = self.commits_ndjson
+        
         with open(output_path, 'w') as f:
-            json.dump(self.data, f, indent=2, default=str)
+            dump_streamed(data, f, default=str, stream_keys=("commits",))
+        print(f"Data exported to {filename}")
+        return output_path
+    
+    def export_to_sqlite(self, filename=DB_FILENAME):
+        """Write commits, file changes, files and authors to an indexed SQLite database"""
+        output_path = os.path.join(self.repo_path, filename)
+        with AnalysisDatabase.create(output_path, self.data):
+            pass
         print(f"Data exported to {filename}")
         return output_path
     
     def analyze(self):
         """Run complete analysis"""
         print("Starting repository analysis...")
-        self.analyze_commits()
-        self.analyze_files()
-        self.calculate_statistics()
-        self.analyze_time_distribution()
-        self.estimate_human_effort()
+        for phase in [self.analyze_commits, self.analyze_files, self.calculate_statistics,
+                      self.analyze_time_distribution, self.estimate_human_effort, *self.extra_phases()]:
+            with self.profiler.phase(phase.__name__):
+                phase()
+        self.add_profile()
+        print("Analysis complete!")
+        return self.data
+    
+    def extra_phases(self):
+        """Opt-in phases run after the standard ones"""
+        return [self.analyze_file_histories] if self.file_histories else []
+    
+    def add_profile(self):
+        """Attach per-phase measurements to the export when profiling is on"""
+        if self.profiler.enabled:
+            self.data["profile"] = self.profiler.report()
+    
+    async def analyze_async(self, max_concurrency=None, timeout=None):
+        """Run complete analysis, overlapping the commit walk with the tree scan
+        
+        The streaming commit walk and the tree listing plus line counting are
+        independent, so they run side by side; the per-commit slow path fans its
+        git show calls out over a bounded AsyncCommandRunner instead.
+        """
+        print("Starting repository analysis (async)...")
+        runner = AsyncCommandRunner(self.repo_path, max_concurrency, timeout or 300)
+        
+        if self.streaming:
+            commits_task = asyncio.to_thread(self.analyze_commits)
+        else:
+            commits_task = self.analyze_commits_async(runner)
+        
+        print("Analyzing files...")
+        # The overlapped commit walk and tree scan are measured as one phase
+        with self.profiler.phase("analyze_commits_and_files"):
+            _, tree_entries = await asyncio.gather(commits_task, asyncio.to_thread(self.load_tree))
+            self.build_file_infos(tree_entries)
+        
+        for phase in [self.calculate_statistics, self.analyze_time_distribution, self.estimate_human_effort,
+                      *self.extra_phases()]:
+            with self.profiler.phase(phase.__name__):
+                phase()
+        self.add_profile()
         print("Analysis complete!")
         return self.data
+    
+    async def analyze_commits_async(self, runner):
+        """Per-commit analysis with git show calls run concurrently
+        
+        Stats are fetched a batch at a time and each batch is ingested in walk
+        order before the next starts, so a pipeline (lean) store never holds
+        more than one batch of file lists. A usable cache is extended with
+        one streamed walk of the new commits instead, as analyze_commits does.
+        """
+        print("Analyzing commits...")
+        
+        head, cache, cached = await asyncio.to_thread(self.load_cached_history)
+        if cached:
+            await asyncio.to_thread(self.extend_cached_history, cached, head)
+        else:
+            await self.walk_commits_async(runner)
+        await asyncio.to_thread(self.finish_commit_walk, head, cache, cached)
+    
+    async def walk_commits_async(self, runner):
+        """Fetch and ingest every commit's stats over the runner, a batch at a time"""
+        commit_format = f"%H{FIELD_SEPARATOR}%an{FIELD_SEPARATOR}%ae{FIELD_SEPARATOR}%at{FIELD_SEPARATOR}%s"
+        commits_raw = await runner.git("-c", "core.quotePath=false", "log", "--topo-order", f"--format={commit_format}",
+                                       *self.revision_args())
+        commits = [self.parse_commit_header(line) for line in commits_raw.split('\n') if line]
+        commits = [commit for commit in commits if commit is not None]
+        
+        async def fill_stats(commit):
+            numstat = await runner.git("-c", "core.quotePath=false", "show", "--numstat", "--format=",
+                                       *self.rename_args(), commit["hash"])
+            for line in numstat.split('\n'):
+                if line.startswith(":"):
+                    self.add_raw_line(commit, line)
+                elif '\t' in line:
+                    self.add_numstat_line(commit["stats"], line)
+            self.drop_excluded_files(commit["stats"])
+        
+        self.path_index = PathHistoryIndex(self.follow_renames, self.author_precision)
+        with self.open_commit_writer() as writer:
+            for start in range(0, len(commits), ASYNC_COMMIT_BATCH):
+                batch = commits[start:start + ASYNC_COMMIT_BATCH]
+                await asyncio.gather(*(fill_stats(commit) for commit in batch))
+                for commit_data in batch:
+                    self.ingest_commit(commit_data, writer)
+                # Drop the ingested records along with their file lists
+                commits[start:start + ASYNC_COMMIT_BATCH] = [None] * len(batch)
 
 if __name__ == "__main__":
-    analyzer = GitRepoAnalyzer("/Users/alexanderfedin/Projects/hackathons/SF-hackaton")
+    parser = argparse.ArgumentParser(description="Analyze a git repository")
+    parser.add_argument("repo_path", nargs="?", default="/Users/alexanderfedin/Projects/hackathons/SF-hackaton")
+    parser.add_argument("--pipeline", action="store_true", help="Bounded-memory mode: keep only per-commit scalars")
+    parser.add_argument("--commits-ndjson", help="Stream commit records to this NDJSON file as they are parsed")
+    parser.add_argument("--profile", action="store_true", default=None, help="Record per-phase timings in a profile section")
+    parser.add_argument("--cprofile-dir", help="Also dump a cProfile .prof file per phase into this directory")
+    parser.add_argument("--since", help="Only count commits at or after this date (ISO date/time or Unix time)")
+    parser.add_argument("--until", help="Only count commits at or before this date (a bare date includes the whole day)")
+    parser.add_argument("--range", dest="revision_range", help="Revision range to walk, e.g. v1.0..HEAD")
+    parser.add_argument("--timezone", help="Timezone for hour/day histograms: local (default), UTC, +02:00 or an IANA name")
+    parser.add_argument("--session-thresholds", help="Comma-separated session gaps in hours to evaluate together, e.g. 0.5,1,2,4")
+    parser.add_argument("--author-sessions", action="store_true", help="Also report work sessions per author")
+    parser.add_argument("--profiles", help="Comma-separated path profiles to compute, e.g. all,no-vendor,core-only")
+    parser.add_argument("--profiles-file", help="JSON file of {name: {include: [...], exclude: [...]}} path profiles")
+    parser.add_argument("--file-history", dest="file_histories", action="append", metavar="PATH",
+                        help="Export every commit that touched PATH (repeatable); runs a path-limited git log")
+    parser.add_argument("--commit-graph", choices=["off", "auto", "write"], default="auto",
+                        help="Use (auto) or also build (write) a commit-graph with Bloom filters for path-limited walks; "
+                             "--file-history uses it, and it is written on the first one")
+    parser.add_argument("--no-follow-renames", dest="follow_renames", action="store_false",
+                        help="Track history per path instead of per logical file")
+    parser.add_argument("--rename-similarity", type=int, help="Minimum similarity percent for rename/copy detection")
+    parser.add_argument("--rename-limit", type=int, help="Cap on files considered for inexact rename detection")
+    parser.add_argument("--find-copies", action="store_true", help="Detect copies as new files derived from their source")
+    parser.add_argument("--loc-history", action="store_true",
+                        help="Index cumulative line counts along first-parent history and export growth curves")
+    parser.add_argument("--growth-curves", help="Also write growth curves for every directory to this JSON file")
+    parser.add_argument("--sqlite", nargs="?", const=DB_FILENAME,
+                        help=f"Also write an indexed SQLite database (default name {DB_FILENAME})")
+    parser.add_argument("--cochange", action="store_true", help="Export files that change together (top partners per file)")
+    parser.add_argument("--cochange-max-files", type=int, default=DEFAULT_MAX_FILES,
+                        help="Skip commits touching more files than this in the co-change counts")
+    parser.add_argument("--cochange-top", type=int, default=DEFAULT_TOP_K, help="Partners exported per file")
+    parser.add_argument("--churn", action="store_true", help="Export the files and directories with the most recent churn")
+    parser.add_argument("--hotspot-days", type=int, default=DEFAULT_HOTSPOT_DAYS,
+                        help="Days before the newest commit that hotspots cover")
+    parser.add_argument("--hotspots", type=int, default=DEFAULT_HOTSPOTS, help="Hotspots exported per kind")
+    parser.add_argument("--churn-series", help="Also write weekly churn series for every file and directory to this JSON file")
+    parser.add_argument("--distributions", action="store_true",
+                        help="Export p50/p90/p99 commit size and files per commit (overall and per author) with mergeable sketches")
+    parser.add_argument("--directories", action="store_true",
+                        help="Export per-directory totals (files, lines, size, churn, authors) and the hottest subtrees")
+    parser.add_argument("--approximate-authors", type=float, nargs="?", const=DEFAULT_ERROR, metavar="ERROR",
+                        help=f"Count distinct authors per file and directory with HyperLogLog sketches "
+                             f"at this relative error (default {DEFAULT_ERROR})")
+    args = parser.parse_args()
+    
+    profiles = None
+    if args.profiles or args.profiles_file:
+        names = args.profiles.split(",") if args.profiles else None
+        if args.profiles_file:
+            profiles = ProfileSet.from_file(args.profiles_file, names)
+        else:
+            profiles = ProfileSet.from_config(names=names)
+    
+    session_thresholds = None
+    if args.session_thresholds:
+        session_thresholds = [int(float(hours) * 3600) for hours in args.session_thresholds.split(",") if hours]
+    
+    analyzer = GitRepoAnalyzer(args.repo_path, pipeline=args.pipeline, commits_ndjson=args.commits_ndjson,
+                               profile=args.profile, cprofile_dir=args.cprofile_dir,
+                               since=args.since, until=args.until, revision_range=args.revision_range,
+                               timezone=args.timezone, session_thresholds=session_thresholds,
+                               author_sessions=args.author_sessions, profiles=profiles,
+                               file_histories=args.file_histories,
+                               commit_graph=args.commit_graph, follow_renames=args.follow_renames,
+                               rename_similarity=args.rename_similarity, rename_limit=args.rename_limit,
+                               find_copies=args.find_copies, loc_history=args.loc_history,
+                               directories=args.directories, cochange=args.cochange,
+                               cochange_max_files=args.cochange_max_files, cochange_top=args.cochange_top,
+                               churn=args.churn or bool(args.churn_series), hotspot_days=args.hotspot_days,
+                               hotspots=args.hotspots, distributions=args.distributions,
+                               author_error=args.approximate_authors)
     data = analyzer.analyze()
-    analyzer.export_to_json()
+    analyzer.export_to_json("repo_summary.json" if args.pipeline else "repo_analysis.json")
+    if args.growth_curves:
+        analyzer.export_growth_curves(args.growth_curves)
+    if args.sqlite:
+        analyzer.export_to_sqlite(args.sqlite)
+    if args.churn_series:
+        analyzer.export_churn_series(args.churn_series)
     
     # Print summary
     print("\n" + "="*60)
@@ -406,4 +1389,29 @@ if __name__ == "__main__":
     print(f"Work Sessions: {data['time_analysis']['work_sessions']}")
     print(f"\nEstimated Human Effort: {data['effort_estimation']['human_effort']['by_lines']['average_days']} days")
     print(f"Actual AI-Assisted Time: {data['effort_estimation']['ai_assisted_effort']['actual_days']:.2f} days")
-    print(f"Efficiency Multiplier: {data['effort_estimation']['ai_assisted_effort']['efficiency_multiplier']}x")
\ No newline at end of file
+    print(f"Efficiency Multiplier: {data['effort_estimation']['ai_assisted_effort']['efficiency_multiplier']}x")
+    if args.distributions:
+        for metric, label in (("commit_size", "Commit Size (lines)"), ("files_per_commit", "Files per Commit")):
+            stats = data["distributions"][metric]
+            print(f"{label}: p50 {stats['p50']}, p90 {stats['p90']}, p99 {stats['p99']}")
+    
+    if args.file_histories:
+        print("\nFile Histories:")
+        for path, commits in data["file_histories"].items():
+            print(f"  {path}: {len(commits)} commits")
+    
+    if args.cochange:
+        print("\nMost Coupled Files:")
+        for pair in data["cochange"]["strongest_pairs"][:10]:
+            print(f"  {pair['files'][0]} <-> {pair['files'][1]}: {pair['commits']} commits")
+    
+    if args.churn or args.churn_series:
+        print(f"\nHotspots (last {args.hotspot_days} days):")
+        for hotspot in data["churn"]["hotspots"]["files"][:10]:
+            print(f"  {hotspot['path']}: {hotspot['churn']} lines changed")
+    
+    if args.directories:
+        print("\nHottest Subtrees (insertions + deletions):")
+        for subtree in data["directories"]["hottest"][:10]:
+            print(f"  {subtree['path']}/: {subtree['churn']} lines changed in {subtree['commits']} commits "
+                  f"by {subtree['authors']} authors")
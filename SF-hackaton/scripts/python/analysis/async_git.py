@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Asyncio command runner
+Runs git (and other) commands with create_subprocess_exec, bounding how many
+run at once and applying a timeout to each, so independent queries overlap
+"""
+
+import asyncio
+import os
+
+from phase_profiler import count_git_bytes, count_subprocess
+
+DEFAULT_TIMEOUT = 300
+
+
+class AsyncCommandRunner:
+    """Bounded-concurrency subprocess runner for the analysis scripts"""
+
+    def __init__(self, cwd=".", max_concurrency=None, timeout=DEFAULT_TIMEOUT):
+        self.cwd = cwd
+        self.max_concurrency = max_concurrency or os.cpu_count() or 4
+        self.timeout = timeout
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.commands_run = 0
+
+    async def run(self, *argv, timeout=None):
+        """Run argv without a shell and return its stripped stdout
+
+        Failures and timeouts are reported and return "" like the synchronous
+        run_command helpers; cancellation kills the child and propagates.
+        """
+        timeout = timeout or self.timeout
+        async with self.semaphore:
+            self.commands_run += 1
+            count_subprocess()
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *argv,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL,
+                    cwd=self.cwd
+                )
+            except OSError as e:
+                print(f"Error running command: {' '.join(argv)}")
+                print(e)
+                return ""
+
+            try:
+                stdout, _ = await asyncio.wait_for(process.communicate(), timeout)
+            except asyncio.TimeoutError:
+                await self.kill(process)
+                print(f"Command timed out after {timeout}s: {' '.join(argv)}")
+                return ""
+            except asyncio.CancelledError:
+                await self.kill(process)
+                raise
+
+        count_git_bytes(len(stdout))
+        return stdout.decode("utf-8", errors="replace").strip()
+
+    async def git(self, *args, timeout=None):
+        """Run a git subcommand"""
+        return await self.run("git", *args, timeout=timeout)
+
+    async def in_thread(self, func, *args):
+        """Run blocking filesystem or pipe work in a worker thread
+
+        Thread work counts against the same concurrency bound as subprocesses.
+        """
+        async with self.semaphore:
+            return await asyncio.to_thread(func, *args)
+
+    async def run_all(self, queries):
+        """Run a dict of name -> query concurrently, returning name -> result
+
+        A query is either an argv list, run as a subprocess, or a callable,
+        run in a worker thread (filesystem walks, cat-file reads).
+        """
+        def start(query):
+            if callable(query):
+                return self.in_thread(query)
+            return self.run(*query)
+
+        names = list(queries)
+        results = await asyncio.gather(*(start(queries[name]) for name in names))
+        return dict(zip(names, results))
+
+    @staticmethod
+    async def kill(process):
+        """Kill a child process and reap it"""
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            await process.wait()
+
+
+def run_queries(queries, cwd=".", max_concurrency=None, timeout=DEFAULT_TIMEOUT):
+    """Synchronous entry point: run name -> query concurrently, see run_all"""
+    async def run():
+        runner = AsyncCommandRunner(cwd, max_concurrency, timeout)
+        return await runner.run_all(queries)
+
+    return asyncio.run(run())
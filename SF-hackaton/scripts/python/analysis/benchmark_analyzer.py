@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Analyzer benchmark suite
+Generates synthetic repositories at several sizes, times every phase of
+GitRepoAnalyzer.analyze() on them and compares the results with a baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from analyze_repo import GitRepoAnalyzer
+from synthetic_repo import SyntheticRepoGenerator
+
+PHASES = [
+    "analyze_commits",
+    "analyze_files",
+    "calculate_statistics",
+    "analyze_time_distribution",
+    "estimate_human_effort"
+]
+
+# Phases faster than this are noise, not regressions
+MIN_SECONDS = 0.05
+
+
+def repo_dir_for(generator, work_dir):
+    """Synthetic repositories are reused across runs, keyed by their settings"""
+    params = generator.params()
+    name = "synthetic-" + "-".join(f"{key}{params[key]}" for key in sorted(params))
+    return os.path.join(work_dir, name)
+
+
+def time_phases(repo_path, use_cache=False):
+    """Run each analyze() phase in order and return seconds per phase"""
+    analyzer = GitRepoAnalyzer(repo_path, use_cache=use_cache)
+    timings = {}
+    # The analyzer reports progress on stdout; keep benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        for phase in PHASES:
+            start = time.perf_counter()
+            getattr(analyzer, phase)()
+            timings[phase] = time.perf_counter() - start
+    timings["total"] = sum(timings.values())
+    return timings
+
+
+def run_benchmarks(sizes, work_dir, repeat=3, files=None, authors=10, churn=20,
+                   files_per_commit=3, binary_ratio=0.05, seed=42, use_cache=False):
+    """Benchmark every size, keeping the best of `repeat` runs per phase"""
+    results = {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "use_cache": use_cache,
+        "runs": {}
+    }
+
+    for commits in sizes:
+        generator = SyntheticRepoGenerator(
+            commits=commits,
+            files=files or max(10, commits // 4),
+            authors=authors,
+            churn=churn,
+            files_per_commit=files_per_commit,
+            binary_ratio=binary_ratio,
+            seed=seed
+        )
+        repo_path = repo_dir_for(generator, work_dir)
+        if not os.path.exists(repo_path):
+            print(f"Generating {commits}-commit repository...")
+            generator.generate(repo_path)
+
+        best = {}
+        for _ in range(repeat):
+            for phase, seconds in time_phases(repo_path, use_cache).items():
+                best[phase] = min(seconds, best.get(phase, seconds))
+
+        results["runs"][str(commits)] = {"params": generator.params(), "phases": best}
+        print(f"{commits:>8} commits: " + ", ".join(f"{p} {best[p]:.3f}s" for p in PHASES + ["total"]))
+
+    return results
+
+
+def compare_to_baseline(results, baseline, threshold=1.25):
+    """Return regressions where a phase got slower than threshold x baseline"""
+    regressions = []
+    for size, run in results["runs"].items():
+        baseline_run = baseline.get("runs", {}).get(size)
+        if baseline_run is None:
+            continue
+        for phase, seconds in run["phases"].items():
+            before = baseline_run["phases"].get(phase)
+            if before is None or max(seconds, before) < MIN_SECONDS:
+                continue
+            ratio = seconds / before if before > 0 else float("inf")
+            if ratio > threshold:
+                regressions.append({
+                    "size": size,
+                    "phase": phase,
+                    "baseline_seconds": round(before, 4),
+                    "seconds": round(seconds, 4),
+                    "ratio": round(ratio, 2)
+                })
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark GitRepoAnalyzer on synthetic repositories")
+    parser.add_argument("--sizes", default="250,1000,4000", help="Comma-separated commit counts")
+    parser.add_argument("--files", type=int, default=None, help="Files per repository (default: commits / 4)")
+    parser.add_argument("--authors", type=int, default=10)
+    parser.add_argument("--churn", type=int, default=20)
+    parser.add_argument("--files-per-commit", type=int, default=3)
+    parser.add_argument("--binary-ratio", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--use-cache", action="store_true", help="Benchmark warm incremental-cache runs")
+    parser.add_argument("--work-dir", default=os.path.join(tempfile.gettempdir(), "analyzer-benchmarks"))
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio that counts as a regression")
+    args = parser.parse_args()
+
+    os.makedirs(args.work_dir, exist_ok=True)
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    results = run_benchmarks(
+        sizes, args.work_dir, args.repeat, args.files, args.authors, args.churn,
+        args.files_per_commit, args.binary_ratio, args.seed, args.use_cache
+    )
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        results["regressions"] = compare_to_baseline(results, baseline, args.threshold)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results exported to {args.output}")
+
+    if results.get("regressions"):
+        print(f"\n{len(results['regressions'])} regression(s) against {args.baseline}:")
+        for regression in results["regressions"]:
+            print(f"  {regression['size']} commits, {regression['phase']}: "
+                  f"{regression['baseline_seconds']}s -> {regression['seconds']}s ({regression['ratio']}x)")
+        sys.exit(1)
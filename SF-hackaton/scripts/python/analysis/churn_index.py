@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Weekly churn index
+Buckets every file change (insertions + deletions) into local calendar
+weeks per file, per directory and for the whole repository while commits
+are walked, then answers "top N hotspots in the last D days" from compact
+per-key prefix sums instead of another `git log` loop
+"""
+
+import heapq
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+from history_index import split_rename_path
+from loc_history import ROOT, ancestors
+
+DEFAULT_HOTSPOT_DAYS = 90
+DEFAULT_HOTSPOTS = 50
+KINDS = ("files", "directories")
+
+
+def week_of(timestamp):
+    """Week number of a Unix time: weeks start on a local Monday"""
+    return (date.fromtimestamp(timestamp).toordinal() - 1) // 7
+
+
+def week_start(week):
+    """The Monday a week number starts on"""
+    return date.fromordinal(week * 7 + 1)
+
+
+class ChurnIndex:
+    """Per-key weekly churn, frozen into sorted weeks plus prefix sums
+
+    Keys follow loc_history: file paths, directories ending in "/" and ""
+    for the repository. Commits may be added in any order; the first query
+    after additions freezes each key into two arrays, so a range total is
+    two binary searches.
+    """
+
+    def __init__(self):
+        # key -> {week: churn} while building
+        self.weekly = {}
+        self.chains = {}
+        self.first_timestamp = None
+        self.last_timestamp = None
+        # key -> (weeks, cumulative churn), rebuilt after additions
+        self.frozen = None
+
+    def add_commit(self, timestamp, files, paths=None):
+        """Add one commit's (path, insertions, deletions) changes
+
+        paths, when given, names the logical file behind each change (as
+        PathHistoryIndex.add_commit returns them), so a renamed file's older
+        churn counts under its current name.
+        """
+        week = week_of(timestamp)
+        if self.first_timestamp is None or timestamp < self.first_timestamp:
+            self.first_timestamp = timestamp
+        if self.last_timestamp is None or timestamp > self.last_timestamp:
+            self.last_timestamp = timestamp
+        self.frozen = None
+
+        weekly = self.weekly
+        for position, (name, insertions, deletions) in enumerate(files):
+            churn = insertions + deletions
+            if not churn:
+                continue
+            if paths is not None:
+                name = paths[position]
+            chain = self.chains.get(name)
+            if chain is None:
+                # Renames count towards the new path
+                path = split_rename_path(name)[1]
+                chain = self.chains[name] = [path] + ancestors(path)
+            for key in chain:
+                weeks = weekly.get(key)
+                if weeks is None:
+                    weekly[key] = {week: churn}
+                else:
+                    weeks[week] = weeks.get(week, 0) + churn
+
+    def freeze(self):
+        """Sorted week and prefix-sum arrays per key"""
+        if self.frozen is None:
+            self.frozen = {}
+            for key, weeks in self.weekly.items():
+                ordered = sorted(weeks)
+                totals = array('Q')
+                running = 0
+                for week in ordered:
+                    running += weeks[week]
+                    totals.append(running)
+                self.frozen[key] = (array('l', ordered), totals)
+        return self.frozen
+
+    def churn(self, key=ROOT, since=None, until=None):
+        """Churn of key in the weeks containing since..until (Unix times, inclusive)"""
+        weeks, totals = self.freeze().get(key, (None, None))
+        if weeks is None:
+            return 0
+        start = 0 if since is None else bisect_left(weeks, week_of(since))
+        end = len(weeks) if until is None else bisect_right(weeks, week_of(until))
+        if end <= start:
+            return 0
+        return totals[end - 1] - (totals[start - 1] if start else 0)
+
+    def series(self, key=ROOT):
+        """[(week start date, churn)] for the weeks key changed in"""
+        weeks, totals = self.freeze().get(key, ((), ()))
+        previous = 0
+        result = []
+        for week, running in zip(weeks, totals):
+            result.append((week_start(week).isoformat(), running - previous))
+            previous = running
+        return result
+
+    def hotspots(self, days=DEFAULT_HOTSPOT_DAYS, n=DEFAULT_HOTSPOTS, kind="files", until=None, keys=None):
+        """The n files (or directories) with the most churn in the last days
+
+        The period ends at until (default: the newest indexed commit) and is
+        widened to whole weeks. keys limits the candidates, e.g. to files
+        still present in the analyzed tree.
+        """
+        if kind not in KINDS:
+            raise ValueError(f"kind must be one of {', '.join(KINDS)}")
+        if self.last_timestamp is None:
+            return []
+        until = self.last_timestamp if until is None else until
+        since = until - days * 86400
+        directories = kind == "directories"
+        frozen = self.freeze()
+        candidates = frozen if keys is None else (key for key in keys if key in frozen)
+
+        scored = []
+        for key in candidates:
+            if key == ROOT or key.endswith("/") != directories:
+                continue
+            churn = self.churn(key, since, until)
+            if churn:
+                scored.append((churn, key))
+        # Most churn first, ties in path order
+        top = heapq.nsmallest(n, scored, key=lambda item: (-item[0], item[1]))
+        return [{"path": key, "churn": churn} for churn, key in top]
+
+    def to_dict(self, keys=None):
+        """Compact export: week numbers relative to base_week, with churn per week"""
+        frozen = self.freeze()
+        if not frozen:
+            return {"base_week": None, "series": {}}
+        base = min(weeks[0] for weeks, _ in frozen.values())
+        series = {}
+        for key in sorted(frozen if keys is None else (key for key in keys if key in frozen)):
+            weeks, totals = frozen[key]
+            previous = 0
+            points = []
+            for week, running in zip(weeks, totals):
+                points.append([week - base, running - previous])
+                previous = running
+            series[key] = points
+        return {"base_week": week_start(base).isoformat(), "series": series}
+
+    def __len__(self):
+        return len(self.weekly)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Co-change coupling
+Counts how often pairs of files change in the same commit, as a sparse map
+of interned path-id pairs filled while commits stream past, and reports the
+files each file is most strongly coupled to
+"""
+
+import heapq
+
+# Commits touching more files than this (mass renames, reformatting,
+# vendored drops) say little about coupling and cost O(n^2) pairs
+DEFAULT_MAX_FILES = 50
+DEFAULT_TOP_K = 10
+DEFAULT_MIN_COMMITS = 2
+PAIR_SHIFT = 32
+
+
+class CoChangeMatrix:
+    """Sparse symmetric co-change counts
+
+    Each unordered pair of path ids (a < b) is one int key, a << 32 | b, in
+    a plain dict, so memory grows with the pairs that actually co-occur and
+    never with files squared. Per-file commit counts give the confidence of
+    a coupling: the share of a file's commits that also changed the other.
+    """
+
+    def __init__(self, max_files=DEFAULT_MAX_FILES):
+        self.max_files = max_files
+        self.path_ids = {}
+        self.paths = []
+        self.file_commits = []
+        self.pairs = {}
+        self.commits = 0
+        self.skipped_commits = 0
+
+    def path_id(self, path):
+        path_id = self.path_ids.get(path)
+        if path_id is None:
+            path_id = len(self.paths)
+            self.path_ids[path] = path_id
+            self.paths.append(path)
+            self.file_commits.append(0)
+        return path_id
+
+    def add_commit(self, paths):
+        """Count one commit's changed files
+
+        paths are logical file names, e.g. from PathHistoryIndex.add_commit,
+        so a renamed file keeps its couplings. Commits without file changes
+        are not counted, since they would only dilute every confidence.
+        """
+        paths = set(paths)
+        if not paths:
+            return
+        if len(paths) > self.max_files:
+            self.skipped_commits += 1
+            return
+        path_ids = sorted(self.path_id(path) for path in paths)
+        self.commits += 1
+        for path_id in path_ids:
+            self.file_commits[path_id] += 1
+
+        pairs = self.pairs
+        for position, first in enumerate(path_ids):
+            base = first << PAIR_SHIFT
+            for second in path_ids[position + 1:]:
+                key = base | second
+                pairs[key] = pairs.get(key, 0) + 1
+
+    def pair_count(self, first_path, second_path):
+        """Commits that changed both paths"""
+        first = self.path_ids.get(first_path)
+        second = self.path_ids.get(second_path)
+        if first is None or second is None or first == second:
+            return 0
+        if first > second:
+            first, second = second, first
+        return self.pairs.get(first << PAIR_SHIFT | second, 0)
+
+    def name_ranks(self):
+        """Position of every path id in path order, for ties independent of walk order"""
+        ranks = [0] * len(self.paths)
+        for rank, path_id in enumerate(sorted(range(len(self.paths)), key=self.paths.__getitem__)):
+            ranks[path_id] = rank
+        return ranks
+
+    def coupling(self, path_id, other_id, count):
+        return {
+            "file": self.paths[other_id],
+            "commits": count,
+            "confidence": round(count / self.file_commits[path_id], 3)
+        }
+
+    def top_pairs(self, k=DEFAULT_TOP_K, min_commits=DEFAULT_MIN_COMMITS, paths=None):
+        """{path: [{file, commits, confidence}]} with each file's k strongest partners
+
+        One pass over the pairs keeps a bounded min-heap per file; pairs seen
+        in fewer than min_commits commits are ignored. paths limits the
+        result to those files.
+        """
+        wanted = None
+        if paths is not None:
+            wanted = {self.path_ids[path] for path in paths if path in self.path_ids}
+
+        ranks = self.name_ranks()
+        heaps = {}
+        mask = (1 << PAIR_SHIFT) - 1
+        for key, count in self.pairs.items():
+            if count < min_commits:
+                continue
+            first, second = key >> PAIR_SHIFT, key & mask
+            for path_id, other_id in ((first, second), (second, first)):
+                if wanted is not None and path_id not in wanted:
+                    continue
+                heap = heaps.setdefault(path_id, [])
+                # Equal counts favour the partner that changes less often on its
+                # own, then the first path in path order
+                entry = (count, -self.file_commits[other_id], -ranks[other_id], other_id)
+                if len(heap) < k:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+
+        return {
+            self.paths[path_id]: [self.coupling(path_id, other_id, count)
+                                  for count, _, _, other_id in sorted(heap, reverse=True)]
+            for path_id, heap in sorted(heaps.items(), key=lambda item: self.paths[item[0]])
+        }
+
+    def strongest_pairs(self, n=20, min_commits=DEFAULT_MIN_COMMITS):
+        """The n most frequent co-changing pairs overall"""
+        ranks = self.name_ranks()
+        mask = (1 << PAIR_SHIFT) - 1
+        top = heapq.nlargest(n, (
+            (count, -min(ranks[key >> PAIR_SHIFT], ranks[key & mask]),
+             -max(ranks[key >> PAIR_SHIFT], ranks[key & mask]), key)
+            for key, count in self.pairs.items() if count >= min_commits
+        ))
+        return [
+            {"files": sorted([self.paths[key >> PAIR_SHIFT], self.paths[key & mask]]), "commits": count}
+            for count, _, _, key in top
+        ]
+
+    def to_dict(self, k=DEFAULT_TOP_K, min_commits=DEFAULT_MIN_COMMITS):
+        """Export summary counts, the strongest pairs and every file's top-k partners"""
+        return {
+            "max_files": self.max_files,
+            "commits": self.commits,
+            "skipped_commits": self.skipped_commits,
+            "files": len(self.paths),
+            "pairs": len(self.pairs),
+            "min_commits": min_commits,
+            "strongest_pairs": self.strongest_pairs(min_commits=min_commits),
+            "top_pairs": self.top_pairs(k, min_commits)
+        }
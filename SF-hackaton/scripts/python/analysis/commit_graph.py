@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Commit-graph acceleration for path-limited history
+Detects whether a repository has an up-to-date commit-graph with changed-path
+Bloom filters, can write one into a directory the analyzer controls, and
+returns the environment that makes `git log -- <path>` use it
+"""
+
+import mmap
+import os
+import struct
+import subprocess
+
+from phase_profiler import count_subprocess
+
+GRAPH_SIGNATURE = b"CGPH"
+HASH_SIZES = {1: 20, 2: 32}
+BLOOM_CHUNKS = (b"BIDX", b"BDAT")
+# Object directory (holding only info/commit-graph) under the analyzer cache dir
+CACHE_OBJECT_DIR = "analyzer-commit-graph"
+MODES = ("off", "auto", "write")
+
+
+def graph_files(objects_dir):
+    """Commit-graph files of an object directory: one file or a split chain"""
+    info_dir = os.path.join(objects_dir, "info")
+    chain = os.path.join(info_dir, "commit-graphs", "commit-graph-chain")
+    if os.path.exists(chain):
+        with open(chain, 'r') as f:
+            return [os.path.join(info_dir, "commit-graphs", f"graph-{line.strip()}.graph")
+                    for line in f if line.strip()]
+    single = os.path.join(info_dir, "commit-graph")
+    return [single] if os.path.exists(single) else []
+
+
+class CommitGraphFile:
+    """Header, chunk table and OID lookup of one commit-graph file"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        signature, version, hash_version, chunk_count = struct.unpack_from(">4sBBB", self.data, 0)
+        if signature != GRAPH_SIGNATURE or version != 1 or hash_version not in HASH_SIZES:
+            raise ValueError(f"unsupported commit-graph file {path}")
+        self.hash_size = HASH_SIZES[hash_version]
+
+        # The chunk table has chunk_count entries plus a terminating one
+        self.chunks = {}
+        for index in range(chunk_count):
+            chunk_id, offset = struct.unpack_from(">4sQ", self.data, 8 + index * 12)
+            self.chunks[chunk_id] = offset
+
+        self.fanout = struct.unpack_from(">256I", self.data, self.chunks[b"OIDF"])
+        self.commit_count = self.fanout[255]
+
+    @property
+    def has_bloom_filters(self):
+        return all(chunk in self.chunks for chunk in BLOOM_CHUNKS)
+
+    def contains(self, oid):
+        """Binary search the sorted OID lookup chunk for a hex object id"""
+        raw = bytes.fromhex(oid)
+        if len(raw) != self.hash_size:
+            return False
+        low = self.fanout[raw[0] - 1] if raw[0] else 0
+        high = self.fanout[raw[0]]
+        base = self.chunks[b"OIDL"]
+        while low < high:
+            middle = (low + high) // 2
+            start = base + middle * self.hash_size
+            candidate = self.data[start:start + self.hash_size]
+            if candidate == raw:
+                return True
+            if candidate < raw:
+                low = middle + 1
+            else:
+                high = middle
+        return False
+
+    def close(self):
+        self.data.close()
+
+
+def graph_status(objects_dir, head):
+    """Describe the commit-graph of objects_dir relative to commit head"""
+    status = {"present": False, "bloom_filters": False, "fresh": False, "commits": 0}
+    paths = graph_files(objects_dir)
+    if not paths:
+        return status
+
+    try:
+        graphs = [CommitGraphFile(path) for path in paths]
+    except (OSError, ValueError, KeyError, struct.error) as e:
+        print(f"Ignoring unreadable commit-graph in {objects_dir}: {e}")
+        return status
+
+    status["present"] = True
+    # Git only consults Bloom filters when every layer has them
+    status["bloom_filters"] = all(graph.has_bloom_filters for graph in graphs)
+    status["fresh"] = any(graph.contains(head) for graph in graphs)
+    status["commits"] = sum(graph.commit_count for graph in graphs)
+    for graph in graphs:
+        graph.close()
+    return status
+
+
+class CommitGraphAccelerator:
+    """Pick (or build) a usable commit-graph and expose it to git subprocesses
+
+    mode "off" never looks, "auto" uses a fresh graph with Bloom filters from
+    the repository or the cache directory, and "write" additionally writes
+    one into the cache directory when neither is usable. The repository's
+    own object directory is never modified.
+    """
+
+    def __init__(self, repo_path, cache_dir, mode="auto"):
+        if mode not in MODES:
+            raise ValueError(f"commit-graph mode must be one of {', '.join(MODES)}")
+        self.repo_path = repo_path
+        self.cache_dir = cache_dir
+        self.mode = mode
+        self.env = None
+        self.status = None
+
+    def git(self, *args, env=None):
+        count_subprocess()
+        return subprocess.run(["git", *args], capture_output=True, text=True,
+                              cwd=self.repo_path, env=env)
+
+    def prepare(self):
+        """Decide which graph path-limited walks use; return extra env vars or None"""
+        if self.status is not None:
+            return self.env
+        self.status = {"mode": self.mode, "source": None}
+        if self.mode == "off":
+            return None
+
+        head = self.git("rev-parse", "--verify", "-q", "HEAD").stdout.strip()
+        objects = self.git("rev-parse", "--git-path", "objects").stdout.strip()
+        if not head or not objects:
+            return None
+        repo_objects = os.path.abspath(os.path.join(self.repo_path, objects))
+
+        repo_status = graph_status(repo_objects, head)
+        self.status["repository"] = repo_status
+        if repo_status["fresh"] and repo_status["bloom_filters"]:
+            # git picks the repository's own graph up without any help
+            self.status["source"] = "repository"
+            return None
+
+        if not self.cache_dir:
+            return None
+        cache_objects = os.path.join(self.cache_dir, CACHE_OBJECT_DIR)
+        # Reads go to the repository's objects through the alternate, while
+        # git looks for the commit-graph in the cache object directory first
+        env = {
+            "GIT_OBJECT_DIRECTORY": cache_objects,
+            "GIT_ALTERNATE_OBJECT_DIRECTORIES": repo_objects
+        }
+
+        cache_status = graph_status(cache_objects, head)
+        if not (cache_status["fresh"] and cache_status["bloom_filters"]) and self.mode == "write":
+            print("Writing commit-graph with changed-path Bloom filters...")
+            os.makedirs(os.path.join(cache_objects, "info"), exist_ok=True)
+            result = self.git("commit-graph", "write", "--reachable", "--changed-paths",
+                              env={**os.environ, **env})
+            if result.returncode != 0:
+                print(f"Error writing commit-graph: {result.stderr.strip()}")
+            cache_status = graph_status(cache_objects, head)
+
+        self.status["cache"] = cache_status
+        if cache_status["fresh"] and cache_status["bloom_filters"]:
+            self.status["source"] = "cache"
+            self.env = env
+        elif repo_status["present"] or cache_status["present"]:
+            print("Commit-graph is stale or lacks Bloom filters; path-limited walks will be slow")
+        return self.env
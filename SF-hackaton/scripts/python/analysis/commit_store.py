@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Columnar commit store
+Holds commit history in typed arrays with interned author and path tables,
+and per-commit file lists as CSR-style offsets into flat file-change arrays
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+
+class StringTable:
+    """Interned strings addressed by a dense integer id"""
+
+    def __init__(self, values=None):
+        self.values = []
+        self.ids = {}
+        for value in values or []:
+            self.intern(value)
+
+    def intern(self, value):
+        """Return the id for value, adding it on first sight"""
+        value_id = self.ids.get(value)
+        if value_id is None:
+            value_id = len(self.values)
+            self.values.append(value)
+            self.ids[value] = value_id
+        return value_id
+
+    def __getitem__(self, value_id):
+        return self.values[value_id]
+
+    def __len__(self):
+        return len(self.values)
+
+
+class CommitStore:
+    """Compact commit history; iterating yields the classic commit dicts
+
+    Commit i owns file changes file_offsets[i]:file_offsets[i + 1] of the
+    flat file_path_ids / file_insertions / file_deletions arrays. With
+    keep_details=False only the scalar columns are kept (hashes, emails,
+    messages and file lists are dropped), so memory stays bounded by a few
+    bytes per commit; such a store can be aggregated but not iterated.
+    """
+
+    def __init__(self, keep_details=True):
+        self.keep_details = keep_details
+        self.hashes = bytearray()
+        self.hash_size = None
+        self.author_ids = array('I')
+        self.email_ids = array('I')
+        self.timestamps = array('q')
+        self.messages = []
+        self.files_changed = array('I')
+        self.insertions = array('Q')
+        self.deletions = array('Q')
+
+        self.file_offsets = array('Q', [0])
+        self.file_path_ids = array('I')
+        self.file_insertions = array('I')
+        self.file_deletions = array('I')
+
+        self.authors = StringTable()
+        self.emails = StringTable()
+        self.paths = StringTable()
+
+        # Commit indices ordered by timestamp, plus the timestamps in that
+        # order; rebuilt lazily whenever commits were added since
+        self.time_order = None
+        self.sorted_timestamps = None
+
+    @classmethod
+    def from_records(cls, records):
+        """Build a store from commit dicts"""
+        store = cls()
+        store.extend(records)
+        return store
+
+    def append(self, commit):
+        """Append one commit dict in the analyze_commits shape"""
+        stats = commit["stats"]
+        self.author_ids.append(self.authors.intern(commit["author"]))
+        self.timestamps.append(commit["timestamp"])
+        self.files_changed.append(stats["files_changed"])
+        self.insertions.append(stats["insertions"])
+        self.deletions.append(stats["deletions"])
+        if not self.keep_details:
+            return
+
+        raw_hash = bytes.fromhex(commit["hash"])
+        if self.hash_size is None:
+            self.hash_size = len(raw_hash)
+        self.hashes += raw_hash
+        self.email_ids.append(self.emails.intern(commit["email"]))
+        self.messages.append(commit["message"])
+
+        for file_entry in stats["files"]:
+            self.file_path_ids.append(self.paths.intern(file_entry["name"]))
+            self.file_insertions.append(file_entry["insertions"])
+            self.file_deletions.append(file_entry["deletions"])
+        self.file_offsets.append(len(self.file_path_ids))
+
+    def extend(self, records):
+        """Append commit dicts in order"""
+        for commit in records:
+            self.append(commit)
+
+    def extend_store(self, other):
+        """Append every commit of another store, remapping its string ids"""
+        if len(other) == 0:
+            return
+        if self.keep_details and not other.keep_details:
+            raise ValueError("cannot extend a detailed store with a summary-only store")
+
+        author_map = [self.authors.intern(value) for value in other.authors.values]
+        self.author_ids.extend(author_map[i] for i in other.author_ids)
+        self.timestamps.extend(other.timestamps)
+        self.files_changed.extend(other.files_changed)
+        self.insertions.extend(other.insertions)
+        self.deletions.extend(other.deletions)
+        if not self.keep_details:
+            return
+
+        if self.hash_size is None:
+            self.hash_size = other.hash_size
+        self.hashes += other.hashes
+
+        email_map = [self.emails.intern(value) for value in other.emails.values]
+        path_map = [self.paths.intern(value) for value in other.paths.values]
+        self.email_ids.extend(email_map[i] for i in other.email_ids)
+        self.messages.extend(other.messages)
+
+        base = self.file_offsets[-1]
+        self.file_offsets.extend(base + offset for offset in other.file_offsets[1:])
+        self.file_path_ids.extend(path_map[i] for i in other.file_path_ids)
+        self.file_insertions.extend(other.file_insertions)
+        self.file_deletions.extend(other.file_deletions)
+
+    def time_index(self):
+        """Return (time_order, sorted_timestamps), building them if stale
+
+        git log emits commits newest first, so the sort is close to linear.
+        """
+        if self.sorted_timestamps is None or len(self.sorted_timestamps) != len(self.timestamps):
+            timestamps = self.timestamps
+            self.time_order = array('I', sorted(range(len(timestamps)), key=timestamps.__getitem__))
+            self.sorted_timestamps = array('q', (timestamps[i] for i in self.time_order))
+        return self.time_order, self.sorted_timestamps
+
+    def window(self, since=None, until=None):
+        """Return (start, end) positions in the time index for since <= t <= until
+
+        Either bound may be None for an open end. Two binary searches, no walk.
+        """
+        _, sorted_timestamps = self.time_index()
+        start = 0 if since is None else bisect_left(sorted_timestamps, since)
+        end = len(sorted_timestamps) if until is None else bisect_right(sorted_timestamps, until)
+        return start, max(start, end)
+
+    def window_indices(self, since=None, until=None):
+        """Return the commit indices inside the window, oldest first"""
+        time_order, _ = self.time_index()
+        start, end = self.window(since, until)
+        return time_order[start:end]
+
+    def hash_at(self, index):
+        """Return the hex hash of commit index"""
+        start = index * self.hash_size
+        return self.hashes[start:start + self.hash_size].hex()
+
+    def iter_files(self, index):
+        """Yield (path, insertions, deletions) for commit index"""
+        for pos in range(self.file_offsets[index], self.file_offsets[index + 1]):
+            yield (self.paths[self.file_path_ids[pos]],
+                   self.file_insertions[pos],
+                   self.file_deletions[pos])
+
+    def commit(self, index):
+        """Rebuild the commit dict for index"""
+        if not self.keep_details:
+            raise ValueError("commit details were not kept (pipeline mode)")
+        timestamp = self.timestamps[index]
+        return {
+            "hash": self.hash_at(index),
+            "author": self.authors[self.author_ids[index]],
+            "email": self.emails[self.email_ids[index]],
+            "timestamp": timestamp,
+            "date": datetime.fromtimestamp(timestamp).isoformat(),
+            "message": self.messages[index],
+            "stats": {
+                "files_changed": self.files_changed[index],
+                "insertions": self.insertions[index],
+                "deletions": self.deletions[index],
+                "files": [
+                    {"name": name, "insertions": insertions, "deletions": deletions}
+                    for name, insertions, deletions in self.iter_files(index)
+                ]
+            }
+        }
+
+    def to_dict(self):
+        """Serialize to plain JSON types, keeping the columnar layout"""
+        return {
+            "hashes": self.hashes.hex(),
+            "hash_size": self.hash_size,
+            "authors": self.authors.values,
+            "emails": self.emails.values,
+            "paths": self.paths.values,
+            "author_ids": self.author_ids.tolist(),
+            "email_ids": self.email_ids.tolist(),
+            "timestamps": self.timestamps.tolist(),
+            "messages": self.messages,
+            "files_changed": self.files_changed.tolist(),
+            "insertions": self.insertions.tolist(),
+            "deletions": self.deletions.tolist(),
+            "file_offsets": self.file_offsets.tolist(),
+            "file_path_ids": self.file_path_ids.tolist(),
+            "file_insertions": self.file_insertions.tolist(),
+            "file_deletions": self.file_deletions.tolist(),
+            # Saved so a cache load can answer window queries without sorting
+            "time_order": self.time_index()[0].tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a store serialized with to_dict"""
+        store = cls()
+        store.hashes = bytearray.fromhex(data["hashes"])
+        store.hash_size = data["hash_size"]
+        store.authors = StringTable(data["authors"])
+        store.emails = StringTable(data["emails"])
+        store.paths = StringTable(data["paths"])
+        store.messages = list(data["messages"])
+        for name in ("author_ids", "email_ids", "timestamps", "files_changed",
+                     "insertions", "deletions", "file_offsets", "file_path_ids",
+                     "file_insertions", "file_deletions"):
+            column = getattr(store, name)
+            setattr(store, name, array(column.typecode, data[name]))
+        if len(data.get("time_order", ())) == len(store.timestamps):
+            store.time_order = array('I', data["time_order"])
+            store.sorted_timestamps = array('q', (store.timestamps[i] for i in store.time_order))
+        return store
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("commit index out of range")
+        return self.commit(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.commit(index)
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Directory rollup index
+A path trie over the analyzed tree: every file and every commit's file
+changes are added once and their totals bubbled up to each ancestor
+directory, so subtree statistics and "hottest subtrees" queries never
+rescan the file list
+"""
+
+import heapq
+
+from history_index import split_rename_path
+from hyperloglog import HyperLogLog
+
+ROOT = ""
+METRICS = ("files", "lines", "size", "insertions", "deletions", "churn", "commits", "authors")
+
+
+def normalize_directory(path):
+    """Directory path without leading/trailing slashes; "" is the root"""
+    return path.strip("/")
+
+
+class DirectoryNode:
+    """Totals for one directory and everything below it
+
+    author_ids is a set of interned author ids, or in approximate mode a
+    HyperLogLog of author names; len() counts either.
+    """
+
+    __slots__ = ("path", "depth", "children", "files", "lines", "size",
+                 "insertions", "deletions", "commits", "author_ids", "last_commit")
+
+    def __init__(self, path, depth, author_precision=None):
+        self.path = path
+        self.depth = depth
+        self.children = {}
+        self.files = 0
+        self.lines = 0
+        self.size = 0
+        self.insertions = 0
+        self.deletions = 0
+        self.commits = 0
+        self.author_ids = set() if author_precision is None else HyperLogLog(author_precision)
+        # Sequence number of the last commit counted, so a commit touching
+        # several files below this node counts once
+        self.last_commit = -1
+
+    @property
+    def churn(self):
+        return self.insertions + self.deletions
+
+    def metric(self, name):
+        if name == "authors":
+            return len(self.author_ids)
+        return getattr(self, name)
+
+    def to_dict(self):
+        return {
+            "path": self.path,
+            "depth": self.depth,
+            "files": self.files,
+            "lines": self.lines,
+            "size_bytes": self.size,
+            "insertions": self.insertions,
+            "deletions": self.deletions,
+            "churn": self.churn,
+            "commits": self.commits,
+            "authors": len(self.author_ids),
+            "subdirectories": len(self.children)
+        }
+
+
+class DirectoryIndex:
+    """Path trie with file and commit totals rolled up to every ancestor
+
+    Nodes are also kept in a flat path -> node dict, and the ancestor chain
+    of each directory is memoized, so adding a file change costs one dict
+    lookup plus one update per directory level.
+
+    With author_precision, distinct authors are counted approximately with
+    a HyperLogLog per directory instead of a set, so a large subtree costs
+    at most 2**author_precision bytes however many people touched it.
+    """
+
+    def __init__(self, author_precision=None):
+        self.author_precision = author_precision
+        self.root = DirectoryNode(ROOT, 0, author_precision)
+        self.nodes = {ROOT: self.root}
+        self.chains = {ROOT: (self.root,)}
+        self.authors = {}
+        self.commit_count = 0
+
+    def chain(self, directory):
+        """Nodes from the root down to directory, creating missing ones"""
+        chain = self.chains.get(directory)
+        if chain is None:
+            parent, _, name = directory.rpartition("/")
+            parent_chain = self.chain(parent)
+            node = DirectoryNode(directory, parent_chain[-1].depth + 1, self.author_precision)
+            parent_chain[-1].children[name] = node
+            self.nodes[directory] = node
+            chain = parent_chain + (node,)
+            self.chains[directory] = chain
+        return chain
+
+    def add_file(self, path, lines=0, size=0):
+        """Count one file of the analyzed tree in every directory above it"""
+        for node in self.chain(path.rpartition("/")[0]):
+            node.files += 1
+            node.lines += lines
+            node.size += size
+
+    def add_commit(self, author, files):
+        """Add one commit's (path, insertions, deletions) changes
+
+        Renamed paths count towards the directories of the new path.
+        """
+        # Sketches hash the name itself so they merge across repositories
+        author_id = author if self.approximate else self.authors.setdefault(author, len(self.authors))
+        sequence = self.commit_count
+        self.commit_count += 1
+        for name, insertions, deletions in files:
+            for node in self.chain(split_rename_path(name)[1].rpartition("/")[0]):
+                node.insertions += insertions
+                node.deletions += deletions
+                if node.last_commit != sequence:
+                    node.last_commit = sequence
+                    node.commits += 1
+                    node.author_ids.add(author_id)
+
+    @property
+    def approximate(self):
+        return self.author_precision is not None
+
+    def node(self, path):
+        """The node of a directory, or None if nothing was added below it"""
+        return self.nodes.get(normalize_directory(path))
+
+    def subtree(self, path):
+        """Totals of a directory as a dict, or None"""
+        node = self.node(path)
+        return node.to_dict() if node is not None else None
+
+    def children(self, path=ROOT):
+        """Totals of the immediate subdirectories of path"""
+        node = self.node(path)
+        if node is None:
+            return []
+        return [child.to_dict() for _, child in sorted(node.children.items())]
+
+    def author_names(self, path):
+        """Names of the authors who changed something below path"""
+        if self.approximate:
+            raise ValueError("author names are not kept when authors are counted approximately")
+        node = self.node(path)
+        if node is None:
+            return []
+        names = {author_id: name for name, author_id in self.authors.items()}
+        return sorted(names[author_id] for author_id in node.author_ids)
+
+    def distinct_authors(self, paths):
+        """Distinct authors across several directories, each counted once"""
+        nodes = [node for node in map(self.node, paths) if node is not None]
+        if self.approximate:
+            merged = HyperLogLog(self.author_precision)
+            for node in nodes:
+                merged.merge(node.author_ids)
+            return len(merged)
+        return len(set().union(*(node.author_ids for node in nodes)))
+
+    def author_sketch(self, path=ROOT):
+        """Serialized author HyperLogLog of a directory, for merging elsewhere"""
+        if not self.approximate:
+            raise ValueError("author sketches are only kept when authors are counted approximately")
+        node = self.node(path)
+        return (node.author_ids if node is not None else HyperLogLog(self.author_precision)).to_dict()
+
+    def top(self, metric="churn", n=20, max_depth=None, existing_only=True):
+        """The n directories (never the root) with the highest metric
+
+        existing_only skips directories with no files in the analyzed tree,
+        i.e. ones whose history was deleted or moved away.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"metric must be one of {', '.join(METRICS)}")
+        candidates = (
+            node for node in self.nodes.values()
+            if node.depth > 0
+            and (max_depth is None or node.depth <= max_depth)
+            and (not existing_only or node.files > 0)
+        )
+        return [node.to_dict() for node in heapq.nlargest(n, candidates, key=lambda node: node.metric(metric))]
+
+    def to_dict(self, max_depth=None):
+        """Flat {path: totals} for every directory, optionally limited in depth"""
+        return {
+            path: self.nodes[path].to_dict()
+            for path in sorted(self.nodes)
+            if max_depth is None or self.nodes[path].depth <= max_depth
+        }
+
+    def __len__(self):
+        return len(self.nodes)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Fleet repository analysis
+Runs GitRepoAnalyzer over every repository in a manifest on a process pool,
+largest repositories first, writing each result as soon as it completes and
+merging small per-repo summaries into one fleet summary
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from analyze_repo import GitRepoAnalyzer
+from hyperloglog import DEFAULT_ERROR, HyperLogLog, precision_for_error
+from quantile_sketch import CommitDistributions
+
+SUMMARY_TOTALS = [
+    "total_commits",
+    "total_files",
+    "total_lines",
+    "total_size_bytes",
+    "total_insertions",
+    "total_deletions",
+    "total_active_hours"
+]
+
+
+def load_manifest(manifest_path):
+    """Read repository paths from a JSON list or a one-path-per-line text file"""
+    with open(manifest_path, 'r') as f:
+        content = f.read()
+
+    if content.lstrip().startswith("["):
+        paths = json.loads(content)
+    else:
+        paths = [line.strip() for line in content.split('\n')]
+        paths = [p for p in paths if p and not p.startswith("#")]
+
+    # Relative entries are relative to the manifest itself
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    return [os.path.normpath(os.path.join(base_dir, p)) for p in paths]
+
+
+def repo_size_hint(repo_path):
+    """Estimate repository size in KiB from git count-objects"""
+    try:
+        result = subprocess.run(
+            ["git", "count-objects", "-v"],
+            capture_output=True,
+            text=True,
+            cwd=repo_path
+        )
+    except OSError:
+        # Missing repositories sort last and fail in their worker
+        return 0
+    size = 0
+    for line in result.stdout.split('\n'):
+        key, _, value = line.partition(": ")
+        if key in ("size", "size-pack") and value.isdigit():
+            size += int(value)
+    return size
+
+
+def empty_summary():
+    """Return the identity element for merge_summaries"""
+    summary = {key: 0 for key in SUMMARY_TOTALS}
+    summary.update({
+        "repositories": 0,
+        "failed": 0,
+        "languages": {},
+        "commits_by_hour": {},
+        "first_commit_time": None,
+        "last_commit_time": None,
+        # Serialized CommitDistributions sketches, merged instead of summed
+        "distributions": None,
+        # Serialized HyperLogLog of author names, so people who commit to
+        # several repositories count once fleet-wide
+        "author_sketch": None
+    })
+    return summary
+
+
+def summarize_analysis(data, author_error=DEFAULT_ERROR):
+    """Reduce one analysis result to a small summary that merges by addition"""
+    statistics = data["statistics"]
+    time_analysis = data["time_analysis"]
+    timestamps = data["commits"].timestamps
+
+    summary = empty_summary()
+    summary["repositories"] = 1
+    for key in SUMMARY_TOTALS:
+        summary[key] = statistics.get(key, time_analysis.get(key, 0))
+    summary["languages"] = {ext: dict(stats) for ext, stats in statistics["languages"].items()}
+    summary["commits_by_hour"] = {str(hour): n for hour, n in time_analysis.get("commits_by_hour", {}).items()}
+    summary["first_commit_time"] = min(timestamps) if timestamps else None
+    summary["last_commit_time"] = max(timestamps) if timestamps else None
+    if "distributions" in data:
+        summary["distributions"] = data["distributions"]["sketches"]
+    authors = HyperLogLog(precision_for_error(author_error))
+    for author in data["commits"].authors.values:
+        authors.add(author)
+    summary["author_sketch"] = authors.to_dict()
+    return summary
+
+
+def merge_summaries(merged, summary):
+    """Merge summary into merged in place and return it"""
+    for key in SUMMARY_TOTALS + ["repositories", "failed"]:
+        merged[key] += summary[key]
+
+    for ext, stats in summary["languages"].items():
+        target = merged["languages"].setdefault(ext, {"files": 0, "lines": 0, "size": 0})
+        for key in ("files", "lines", "size"):
+            target[key] += stats[key]
+
+    for hour, count in summary["commits_by_hour"].items():
+        merged["commits_by_hour"][hour] = merged["commits_by_hour"].get(hour, 0) + count
+
+    for key, pick in (("first_commit_time", min), ("last_commit_time", max)):
+        values = [v for v in (merged[key], summary[key]) if v is not None]
+        merged[key] = pick(values) if values else None
+
+    if summary["distributions"] is not None:
+        distributions = CommitDistributions.from_dict(summary["distributions"])
+        if merged["distributions"] is not None:
+            distributions = CommitDistributions.from_dict(merged["distributions"]).merge(distributions)
+        merged["distributions"] = distributions.to_dict()
+
+    if summary["author_sketch"] is not None:
+        authors = HyperLogLog.from_dict(summary["author_sketch"])
+        if merged["author_sketch"] is not None:
+            authors = HyperLogLog.from_dict(merged["author_sketch"]).merge(authors)
+        merged["author_sketch"] = authors.to_dict()
+    return merged
+
+
+def result_filename(repo_path):
+    """Name the per-repo result file after the repository directory"""
+    name = os.path.basename(os.path.normpath(repo_path)) or "repo"
+    # Disambiguate repositories that share a directory name
+    digest = hashlib.sha1(os.path.abspath(repo_path).encode("utf-8")).hexdigest()[:8]
+    return f"{name}-{digest}.json"
+
+
+def analyze_one(repo_path, output_dir, approximate_authors=None):
+    """Pool worker: analyze one repository, write its result, return its summary
+
+    With approximate_authors (a relative error), per-file author lists in
+    the result become HyperLogLog estimates at that error.
+    """
+    output_path = os.path.abspath(os.path.join(output_dir, result_filename(repo_path)))
+    try:
+        analyzer = GitRepoAnalyzer(repo_path, distributions=True, author_error=approximate_authors)
+        data = analyzer.analyze()
+        analyzer.export_to_json(output_path)
+        summary = summarize_analysis(data, approximate_authors or DEFAULT_ERROR)
+    except Exception as e:
+        summary = empty_summary()
+        summary["failed"] = 1
+        return {"repo": repo_path, "output": None, "error": str(e), "summary": summary}
+    return {"repo": repo_path, "output": output_path, "error": None, "summary": summary}
+
+
+def run_fleet(manifest_path, output_dir="fleet_results", workers=None, approximate_authors=None):
+    """Analyze every repository in the manifest and write the fleet summary"""
+    os.makedirs(output_dir, exist_ok=True)
+    repos = load_manifest(manifest_path)
+
+    # Largest repositories first so the longest jobs never start last
+    repos.sort(key=repo_size_hint, reverse=True)
+    print(f"Analyzing {len(repos)} repositories with {workers or os.cpu_count()} workers...")
+
+    merged = empty_summary()
+    failures = []
+    index_path = os.path.join(output_dir, "fleet_index.ndjson")
+
+    with open(index_path, 'w') as index_file, ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(analyze_one, repo, output_dir, approximate_authors) for repo in repos]
+        for completed, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            merge_summaries(merged, result["summary"])
+            if result["error"]:
+                failures.append({"repo": result["repo"], "error": result["error"]})
+                print(f"FAILED {result['repo']}: {result['error']}")
+            else:
+                print(f"Done {result['repo']} ({completed}/{len(repos)})")
+
+            # One line per finished repository, written as it completes
+            index_file.write(json.dumps(result) + "\n")
+            index_file.flush()
+
+    fleet_summary = {
+        "analysis_timestamp": datetime.now().isoformat(),
+        "manifest": os.path.abspath(manifest_path),
+        "summary": merged,
+        "failures": failures
+    }
+    if merged["distributions"] is not None:
+        # Fleet-wide percentiles from the merged sketches
+        fleet_summary["distributions"] = CommitDistributions.from_dict(merged["distributions"]).summary()
+    if merged["author_sketch"] is not None:
+        authors = HyperLogLog.from_dict(merged["author_sketch"])
+        fleet_summary["distinct_authors"] = {"estimate": len(authors), "error": round(authors.error, 4)}
+    summary_path = os.path.join(output_dir, "fleet_summary.json")
+    with open(summary_path, 'w') as f:
+        json.dump(fleet_summary, f, indent=2)
+
+    print(f"Fleet summary exported to {summary_path}")
+    return fleet_summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analyze a fleet of git repositories")
+    parser.add_argument("manifest", help="JSON list or text file with one repository path per line")
+    parser.add_argument("--output-dir", default="fleet_results", help="Directory for per-repo results and the summary")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--approximate-authors", type=float, nargs="?", const=DEFAULT_ERROR, metavar="ERROR",
+                        help=f"Count per-file and per-directory authors with HyperLogLog sketches "
+                             f"at this relative error (default {DEFAULT_ERROR})")
+    args = parser.parse_args()
+
+    result = run_fleet(args.manifest, args.output_dir, args.workers, args.approximate_authors)
+    summary = result["summary"]
+
+    print("\n" + "="*60)
+    print("FLEET ANALYSIS SUMMARY")
+    print("="*60)
+    print(f"Repositories: {summary['repositories']} ({summary['failed']} failed)")
+    print(f"Total Commits: {summary['total_commits']}")
+    print(f"Total Files: {summary['total_files']}")
+    print(f"Total Lines of Code: {summary['total_lines']}")
+    if "distinct_authors" in result:
+        print(f"Distinct Authors: ~{result['distinct_authors']['estimate']}")
+    if "distributions" in result:
+        commit_size = result["distributions"]["commit_size"]
+        print(f"Commit Size (lines): p50 {commit_size['p50']}, p90 {commit_size['p90']}, p99 {commit_size['p99']}")
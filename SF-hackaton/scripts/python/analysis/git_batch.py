@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Persistent git object reader
+Keeps one `git cat-file --batch` and one `--batch-check` process per repository
+and pipelines object requests over them instead of forking git per question
+"""
+
+import atexit
+import contextlib
+import os
+import subprocess
+import threading
+
+from phase_profiler import count_git_bytes, count_subprocess
+
+TREE_MODE = "40000"
+SUBMODULE_MODE = "160000"
+
+
+def parse_tree(data, hash_size):
+    """Parse a raw tree object into (mode, name, sha) entries"""
+    entries = []
+    pos = 0
+    while pos < len(data):
+        space = data.index(b" ", pos)
+        nul = data.index(b"\0", space)
+        mode = data[pos:space].decode()
+        name = data[space + 1:nul].decode("utf-8", errors="replace")
+        sha = data[nul + 1:nul + 1 + hash_size].hex()
+        entries.append((mode, name, sha))
+        pos = nul + 1 + hash_size
+    return entries
+
+
+def parse_commit(data):
+    """Parse the headers of a raw commit object"""
+    info = {"tree": None, "parents": [], "author": None, "author_time": None,
+            "committer": None, "committer_time": None}
+
+    for line in data.decode("utf-8", errors="replace").split("\n"):
+        if not line:
+            # Headers end at the first blank line, the message follows
+            break
+        key, _, value = line.partition(" ")
+        if key == "tree":
+            info["tree"] = value
+        elif key == "parent":
+            info["parents"].append(value)
+        elif key in ("author", "committer"):
+            # "Name <email> 1700000000 +0100"
+            identity, _, rest = value.rpartition("> ")
+            timestamp = rest.split(" ")[0]
+            info[key] = identity.split(" <")[0]
+            info[f"{key}_time"] = int(timestamp) if timestamp.isdigit() else None
+    return info
+
+
+class GitObjectReader:
+    """Long-lived cat-file reader shared by the analysis scripts"""
+
+    def __init__(self, repo_path="."):
+        self.repo_path = repo_path
+        self.processes = {}
+        self.locks = {"--batch": threading.Lock(), "--batch-check": threading.Lock()}
+        self.requests = 0
+
+    def get_process(self, option):
+        """Start the cat-file process for option on first use"""
+        process = self.processes.get(option)
+        if process is None or process.poll() is not None:
+            count_subprocess()
+            process = subprocess.Popen(
+                ["git", "cat-file", option],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                cwd=self.repo_path
+            )
+            self.processes[option] = process
+        return process
+
+    def pipeline(self, option, names, read_response):
+        """Stream responses for names, writing requests from a separate thread
+
+        Writing every request up front from one thread while reading from
+        another keeps git busy without either pipe filling up and deadlocking.
+        The process lock is held until the generator is exhausted or closed,
+        so callers that stop early must close it rather than drop it.
+        """
+        names = list(names)
+        if not names:
+            return
+
+        with self.locks[option]:
+            process = self.get_process(option)
+            self.requests += len(names)
+
+            def write_requests():
+                try:
+                    for name in names:
+                        process.stdin.write(name.encode("utf-8") + b"\n")
+                    process.stdin.flush()
+                except (BrokenPipeError, OSError):
+                    pass
+
+            writer = threading.Thread(target=write_requests, daemon=True)
+            writer.start()
+
+            remaining = len(names)
+            try:
+                for name in names:
+                    remaining -= 1
+                    yield name, read_response(process.stdout)
+            finally:
+                # Drain responses the consumer did not read so the next
+                # request starts at a clean boundary
+                for _ in range(remaining):
+                    read_response(process.stdout)
+                writer.join()
+
+    @staticmethod
+    def read_header(stdout):
+        """Read one response header, returning (sha, type, size) or None if missing"""
+        line = stdout.readline()
+        if not line:
+            raise RuntimeError("git cat-file exited unexpectedly")
+        count_git_bytes(len(line))
+
+        parts = line.decode("utf-8", errors="replace").split()
+        if len(parts) < 3 or parts[-1] in ("missing", "ambiguous"):
+            return None
+        return parts[0], parts[1], int(parts[2])
+
+    @classmethod
+    def read_object_response(cls, stdout):
+        """Read one --batch response, returning (sha, type, data) or None"""
+        header = cls.read_header(stdout)
+        if header is None:
+            return None
+
+        data = stdout.read(header[2])
+        stdout.read(1)  # trailing newline
+        count_git_bytes(len(data) + 1)
+        return header[0], header[1], data
+
+    def iter_info(self, names):
+        """Yield (name, (sha, type, size) or None) for every object name"""
+        return self.pipeline("--batch-check", names, self.read_header)
+
+    def iter_objects(self, names):
+        """Yield (name, (sha, type, data) or None) for every object name"""
+        return self.pipeline("--batch", names, self.read_object_response)
+
+    def object_info(self, name):
+        """Return (sha, type, size) for one object, or None if it does not exist"""
+        with contextlib.closing(self.iter_info([name])) as responses:
+            for _, info in responses:
+                return info
+
+    def read_object(self, name):
+        """Return (sha, type, data) for one object, or None if it does not exist"""
+        with contextlib.closing(self.iter_objects([name])) as responses:
+            for _, obj in responses:
+                return obj
+
+    def read_blob(self, name):
+        """Return blob contents as bytes, or None if name is not a blob"""
+        obj = self.read_object(name)
+        if obj is None or obj[1] != "blob":
+            return None
+        return obj[2]
+
+    def read_commit(self, rev="HEAD"):
+        """Return parsed commit headers for rev, or None"""
+        obj = self.read_object(f"{rev}^{{commit}}")
+        if obj is None:
+            return None
+        info = parse_commit(obj[2])
+        info["hash"] = obj[0]
+        return info
+
+    def read_commits(self, revs):
+        """Return parsed commit headers for several revs over one pipe"""
+        commits = []
+        for _, obj in self.iter_objects([f"{rev}^{{commit}}" for rev in revs]):
+            if obj is not None:
+                info = parse_commit(obj[2])
+                info["hash"] = obj[0]
+                commits.append(info)
+        return commits
+
+    def commit_time_span(self, rev="HEAD"):
+        """Return (first, last) author timestamps for the history of rev
+
+        The last time is rev's own commit; the first is the oldest root commit,
+        so the whole history never has to be listed.
+        """
+        head = self.read_commit(rev)
+        if head is None:
+            return None, None
+
+        count_subprocess()
+        result = subprocess.run(
+            ["git", "rev-list", "--max-parents=0", rev],
+            capture_output=True,
+            text=True,
+            cwd=self.repo_path
+        )
+        roots = self.read_commits(result.stdout.split())
+        root_times = [c["author_time"] for c in roots if c["author_time"] is not None]
+        first = min(root_times) if root_times else head["author_time"]
+        return first, head["author_time"]
+
+    def list_tree(self, treeish="HEAD", sizes=True, prune_dir=None, keep_path=None):
+        """List every non-tree entry under treeish with path, mode, type, sha and size
+
+        Subtrees are fetched level by level so each level is one pipelined
+        batch; blob sizes come from a single batch-check pass at the end.
+        Directories for which prune_dir(path) is true are never fetched, and
+        entries for which keep_path(path) is false are dropped before sizing.
+        """
+        root = self.object_info(f"{treeish}^{{tree}}")
+        if root is None:
+            return []
+
+        hash_size = len(root[0]) // 2
+        entries = []
+        pending = [("", root[0])]
+
+        while pending:
+            next_level = []
+            # Read the whole level before parsing it, so the pipeline's lock is
+            # released here and not whenever its generator gets collected
+            objects = [obj for _, obj in self.iter_objects([sha for _, sha in pending])]
+            # Identical subtrees share a sha, so pair responses by position
+            for (prefix, _), obj in zip(pending, objects):
+                if obj is None:
+                    continue
+                for mode, name, entry_sha in parse_tree(obj[2], hash_size):
+                    path = prefix + name
+                    if mode == TREE_MODE:
+                        if prune_dir is None or not prune_dir(path):
+                            next_level.append((path + "/", entry_sha))
+                    elif keep_path is None or keep_path(path):
+                        # Submodule entries point at commits and have no size
+                        entry_type = "commit" if mode == SUBMODULE_MODE else "blob"
+                        entries.append({"path": path, "mode": mode, "type": entry_type,
+                                        "sha": entry_sha, "size": None})
+            pending = next_level
+
+        if sizes:
+            blob_sizes = {}
+            unique_shas = list(dict.fromkeys(entry["sha"] for entry in entries))
+            for sha, info in self.iter_info(unique_shas):
+                if info is not None:
+                    blob_sizes[sha] = info[2]
+            for entry in entries:
+                entry["size"] = blob_sizes.get(entry["sha"])
+
+        entries.sort(key=lambda entry: entry["path"])
+        return entries
+
+    def close(self):
+        """Stop the cat-file processes"""
+        for process in self.processes.values():
+            if process.poll() is None:
+                try:
+                    process.stdin.close()
+                except OSError:
+                    pass
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.wait()
+        self.processes = {}
+
+
+_readers = {}
+
+
+def get_object_reader(repo_path="."):
+    """Return the shared reader for a repository, starting it on first use"""
+    key = os.path.abspath(repo_path)
+    reader = _readers.get(key)
+    if reader is None:
+        reader = GitObjectReader(key)
+        _readers[key] = reader
+    return reader
+
+
+def close_object_readers():
+    """Stop every shared reader"""
+    for reader in _readers.values():
+        reader.close()
+    _readers.clear()
+
+
+atexit.register(close_object_readers)
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Path history index
+Maps every path touched in the history to its first/last commit, commit count
+and authors, built in the same pass that streams the commits
+"""
+
+from hyperloglog import HyperLogLog
+
+
+def split_rename_path(name):
+    """Split a numstat path like `src/{a => b}/f.py` into (old, new) paths"""
+    if " => " not in name:
+        return name, name
+
+    if "{" in name and "}" in name:
+        prefix, rest = name.split("{", 1)
+        middle, suffix = rest.split("}", 1)
+        old_part, new_part = middle.split(" => ", 1)
+        old_path = prefix + old_part + suffix
+        new_path = prefix + new_part + suffix
+    else:
+        old_path, new_path = name.split(" => ", 1)
+
+    # An empty side of the braces leaves a doubled or leading slash behind
+    old_path = old_path.replace("//", "/").lstrip("/")
+    new_path = new_path.replace("//", "/").lstrip("/")
+    return old_path, new_path
+
+
+def new_entry(commit_hash, author_precision=None, path=None):
+    """Empty history entry for a file first seen at commit_hash
+
+    Authors are an insertion-ordered dict used as a set, or a HyperLogLog
+    when author_precision is given. path is the file's newest path, the
+    name its older paths are reported under.
+    """
+    return {
+        "path": path,
+        "first_commit": commit_hash,
+        "last_commit": commit_hash,
+        "commit_count": 0,
+        "authors": {} if author_precision is None else HyperLogLog(author_precision),
+        "previous_paths": []
+    }
+
+
+class PathHistoryIndex:
+    """Reverse index from path to the commits that touched it
+
+    With follow_renames, entries belong to logical files rather than paths:
+    while walking newest first, a rename `old => new` makes older commits on
+    `old` count towards the entry of `new`, and `new` before the rename is a
+    different file. Each rename is a couple of dict operations, so moving a
+    whole directory tree costs time linear in the number of files moved.
+
+    With author_precision, each entry counts its authors approximately in a
+    HyperLogLog rather than listing them, which keeps per-file memory small
+    and bounded on histories with many contributors.
+    """
+
+    def __init__(self, follow_renames=True, author_precision=None):
+        self.follow_renames = follow_renames
+        self.author_precision = author_precision
+        # Newest file seen at each path; what lookups by path return
+        self.paths = {}
+        # File each path refers to at the current (oldest so far) walk position
+        self.current = {}
+
+    def add_commit(self, commit):
+        """Record a commit record (newest first order) against its paths
+
+        Copies listed in commit["copied_paths"] (from `git log -C --raw`) start
+        a new logical file instead of continuing the source's history.
+        Returns the newest path of the logical file behind each file entry,
+        so callers can count older paths of a renamed file under its name.
+        """
+        commit_hash = commit["hash"]
+        author = commit["author"]
+        copies = set(tuple(pair) for pair in commit.get("copied_paths", ()))
+
+        moves = []
+        logical_paths = []
+        for file_entry in commit["stats"]["files"]:
+            old_path, new_path = split_rename_path(file_entry["name"])
+            entry = self.add_path(new_path, commit_hash, author)
+            logical_paths.append(entry["path"])
+            if old_path == new_path:
+                continue
+            if not self.follow_renames:
+                self.add_path(old_path, commit_hash, author)
+            elif (old_path, new_path) in copies:
+                entry["copied_from"] = old_path
+                moves.append((old_path, new_path, None))
+            else:
+                moves.append((old_path, new_path, entry))
+
+        # Before this commit the new paths did not hold these files; apply all
+        # pops before re-pointing so swaps within one commit resolve correctly
+        for _, new_path, _ in moves:
+            self.current.pop(new_path, None)
+        for old_path, _, entry in moves:
+            if entry is not None:
+                self.current[old_path] = entry
+                if old_path not in entry["previous_paths"]:
+                    entry["previous_paths"].append(old_path)
+        return logical_paths
+
+    def add_path(self, path, commit_hash, author):
+        """Record one commit touching one path, returning the file's entry"""
+        entry = self.current.get(path)
+        if entry is None:
+            # History is walked newest first, so the first hit is the last commit
+            entry = new_entry(commit_hash, self.author_precision, path)
+            self.current[path] = entry
+            self.paths.setdefault(path, entry)
+
+        # Merge commits can list the same path more than once, and a rename
+        # touches one logical file under two names
+        if entry["first_commit"] == commit_hash and entry["commit_count"]:
+            return entry
+
+        entry["first_commit"] = commit_hash
+        entry["commit_count"] += 1
+        if self.author_precision is None:
+            entry["authors"][author] = True
+        else:
+            entry["authors"].add(author)
+        return entry
+
+    def lookup(self, path):
+        """Return the history entry for a path, or None if it was never touched"""
+        return self.paths.get(path)
+
+    def merge_newer(self, newer):
+        """Merge an index built from commits newer than every commit in this one
+
+        Paths this index knows are resolved through the newer walk's final
+        position, so files renamed in the newer commits keep their history.
+        """
+        paths = dict(newer.paths)
+        for path, entry in self.paths.items():
+            target = newer.current.get(path)
+            if target is not None:
+                merge_entries(target, entry)
+            elif path not in paths:
+                paths[path] = entry
+        self.paths = paths
+        self.current = {}
+
+    def to_dict(self):
+        """Serialize the index to plain JSON types"""
+        return {
+            path: {
+                "first_commit": entry["first_commit"],
+                "last_commit": entry["last_commit"],
+                "commit_count": entry["commit_count"],
+                "authors": author_list_or_sketch(entry["authors"]),
+                "previous_paths": entry["previous_paths"],
+                **({"copied_from": entry["copied_from"]} if "copied_from" in entry else {})
+            }
+            for path, entry in self.paths.items()
+        }
+
+    @classmethod
+    def from_dict(cls, data, follow_renames=True, author_precision=None):
+        """Rebuild an index serialized with to_dict"""
+        index = cls(follow_renames, author_precision)
+        for path, entry in data.items():
+            authors = entry["authors"]
+            index.paths[path] = {
+                "path": path,
+                "first_commit": entry["first_commit"],
+                "last_commit": entry["last_commit"],
+                "commit_count": entry["commit_count"],
+                "authors": HyperLogLog.from_dict(authors) if isinstance(authors, dict) else dict.fromkeys(authors, True),
+                "previous_paths": list(entry.get("previous_paths", []))
+            }
+            if "copied_from" in entry:
+                index.paths[path]["copied_from"] = entry["copied_from"]
+        return index
+
+    def __len__(self):
+        return len(self.paths)
+
+
+def author_list_or_sketch(authors):
+    """JSON form of an entry's authors: a list of names or a serialized sketch"""
+    if isinstance(authors, HyperLogLog):
+        return authors.to_dict()
+    return list(authors)
+
+
+def merge_entries(newer, older):
+    """Fold the history of an older entry into the entry that continues it"""
+    newer["first_commit"] = older["first_commit"]
+    newer["commit_count"] += older["commit_count"]
+    if isinstance(newer["authors"], HyperLogLog):
+        newer["authors"].merge(older["authors"])
+    else:
+        # Keep newest authors first, as a single newest-first walk would
+        for author in older["authors"]:
+            newer["authors"].setdefault(author, True)
+    for path in older["previous_paths"]:
+        if path not in newer["previous_paths"]:
+            newer["previous_paths"].append(path)
+    if "copied_from" in older:
+        newer["copied_from"] = older["copied_from"]
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Blob line counting
+Counts lines straight from blob contents and memoizes the result by blob SHA,
+so unchanged, renamed or duplicated files are never counted twice
+"""
+
+import json
+import os
+
+LINE_COUNTS_FILENAME = "repo_line_counts.json"
+
+# Same heuristic git uses: a NUL byte in the first 8000 bytes means binary
+BINARY_SNIFF_BYTES = 8000
+
+
+def is_binary(data):
+    """Check whether blob contents look binary"""
+    return b"\0" in data[:BINARY_SNIFF_BYTES]
+
+
+def count_lines(data):
+    """Count lines in blob contents, returning 0 for binary data
+
+    Newlines are counted in bulk with bytes.count; a final line without a
+    trailing newline still counts, matching iteration over a text file.
+    """
+    if not data or is_binary(data):
+        return 0
+
+    lines = data.count(b"\n")
+    if not data.endswith(b"\n"):
+        lines += 1
+    return lines
+
+
+class LineCountCache:
+    """Blob SHA to line count memo, optionally persisted to disk"""
+
+    def __init__(self, cache_path=None):
+        self.cache_path = cache_path
+        self.counts = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        """Load memoized counts if a cache file exists"""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+
+        try:
+            with open(self.cache_path, 'r') as f:
+                self.counts = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable line count cache {self.cache_path}: {e}")
+            self.counts = {}
+
+    def save(self):
+        """Write the memo back if anything new was counted"""
+        if not self.cache_path or not self.dirty:
+            return
+
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.counts, f)
+        os.replace(tmp_path, self.cache_path)
+        self.dirty = False
+
+    def missing(self, shas):
+        """Return the unique shas that have not been counted yet"""
+        return [sha for sha in dict.fromkeys(shas) if sha not in self.counts]
+
+    def add(self, sha, data):
+        """Count and memoize one blob"""
+        self.counts[sha] = count_lines(data)
+        self.dirty = True
+
+    def get(self, sha, default=0):
+        return self.counts.get(sha, default)
+
+    def __contains__(self, sha):
+        return sha in self.counts
+
+    def __len__(self):
+        return len(self.counts)
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Point-in-time line counts from cumulative numstat sums
+One first-parent `git log --numstat` pass (oldest first, renames split into
+delete + add) builds running insertion/deletion totals for every path, every
+directory and the repository root, so "LOC of X at commit/date Y" and whole
+growth curves come from the index instead of checking out old commits
+"""
+
+import subprocess
+from array import array
+from bisect import bisect_right
+from datetime import datetime
+
+from git_batch import get_object_reader
+from line_counter import count_lines
+from phase_profiler import count_git_bytes, count_subprocess
+
+COMMIT_MARKER = "\x1e"
+FIELD_SEPARATOR = "\x1f"
+ROOT = ""
+
+
+def ancestors(path):
+    """Directory keys ("a/b/", "a/") of a path, deepest first, then the root"""
+    keys = []
+    end = path.rfind("/")
+    while end != -1:
+        keys.append(path[:end + 1])
+        end = path.rfind("/", 0, end)
+    keys.append(ROOT)
+    return keys
+
+
+class LocHistory:
+    """Cumulative line totals per path and directory along first-parent history
+
+    Commits are numbered oldest first. Every key (a file path, a directory
+    ending in "/", or "" for the whole repository) keeps the commit numbers at
+    which it changed with the running insertions and deletions at that point.
+    The repository total is stored for every commit, so its lookups are O(1);
+    other keys are one binary search over their own change points.
+    """
+
+    def __init__(self):
+        self.hashes = []
+        self.commit_index = {}
+        # Committer times, and their running maximum for date lookups
+        self.timestamps = array('q')
+        self.search_timestamps = array('q')
+        # key -> [commit numbers, cumulative insertions, cumulative deletions]
+        self.series = {}
+
+    @classmethod
+    def build(cls, repo_path=".", revision="HEAD"):
+        """Walk the first-parent history of revision and index it"""
+        history = cls()
+        cmd = [
+            "git", "-c", "core.quotePath=false", "log", "--first-parent", "--reverse",
+            "--diff-merges=first-parent", "--no-renames", "--raw", "--no-abbrev", "--numstat",
+            f"--format={COMMIT_MARKER}%H{FIELD_SEPARATOR}%ct", revision, "--"
+        ]
+        count_subprocess()
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            cwd=repo_path
+        )
+
+        commit = None
+        changes = []
+        blobs = {}
+        try:
+            for line in process.stdout:
+                count_git_bytes(len(line))
+                line = line.rstrip("\n")
+                if line.startswith(COMMIT_MARKER):
+                    if commit is not None:
+                        history.add_commit(commit[0], commit[1], changes)
+                    commit_hash, _, timestamp = line[len(COMMIT_MARKER):].partition(FIELD_SEPARATOR)
+                    commit = (commit_hash, int(timestamp or 0))
+                    changes = []
+                    blobs = {}
+                elif commit is None or '\t' not in line:
+                    continue
+                elif line.startswith(":"):
+                    # ":100644 100644 <old sha> <new sha> M\tpath"
+                    meta, _, path = line.partition('\t')
+                    blobs[path] = meta.split()[3]
+                else:
+                    insertions, deletions, path = line.split('\t', 2)
+                    if insertions == '-' or deletions == '-':
+                        # Binary on at least one side: binary blobs count as
+                        # no lines, so the path now holds its new blob's lines
+                        insertions = history.blob_lines(repo_path, blobs.get(path))
+                        deletions = history.lines(path)
+                    changes.append((path, int(insertions), int(deletions)))
+            if commit is not None:
+                history.add_commit(commit[0], commit[1], changes)
+        finally:
+            if process.poll() is None:
+                process.kill()
+            process.stdout.close()
+            process.wait()
+        return history
+
+    @staticmethod
+    def blob_lines(repo_path, sha):
+        """Lines of a blob as line_counter counts them; 0 for a deleted path"""
+        if not sha or not sha.strip("0"):
+            return 0
+        return count_lines(get_object_reader(repo_path).read_blob(sha))
+
+    def add_commit(self, commit_hash, timestamp, changes):
+        """Append the next (newer) commit with its (path, insertions, deletions)"""
+        number = len(self.hashes)
+        self.hashes.append(commit_hash)
+        self.commit_index[commit_hash] = number
+        self.timestamps.append(timestamp)
+        previous = self.search_timestamps[-1] if self.search_timestamps else timestamp
+        self.search_timestamps.append(max(previous, timestamp))
+
+        # Sum the commit's changes per key first, so each key gets one point
+        deltas = {}
+        for path, insertions, deletions in changes:
+            for key in [path] + ancestors(path):
+                delta = deltas.get(key)
+                if delta is None:
+                    deltas[key] = [insertions, deletions]
+                else:
+                    delta[0] += insertions
+                    delta[1] += deletions
+        deltas.setdefault(ROOT, [0, 0])
+
+        for key, (insertions, deletions) in deltas.items():
+            points = self.series.get(key)
+            if points is None:
+                points = [array('I'), array('q'), array('q')]
+                self.series[key] = points
+                base_insertions = base_deletions = 0
+            else:
+                base_insertions, base_deletions = points[1][-1], points[2][-1]
+            points[0].append(number)
+            points[1].append(base_insertions + insertions)
+            points[2].append(base_deletions + deletions)
+
+    def resolve(self, commit=None, date=None):
+        """Commit number for a commit hash (or unique prefix) or a date; None means the tip
+
+        A date selects the last first-parent commit made at or before it.
+        Returns -1 when the date precedes the history.
+        """
+        if commit is not None:
+            number = self.commit_index.get(commit)
+            if number is None:
+                matches = [self.commit_index[h] for h in self.hashes if h.startswith(commit)]
+                if len(matches) != 1:
+                    raise KeyError(f"commit {commit} is not on the indexed first-parent history")
+                number = matches[0]
+            return number
+        if date is not None:
+            if isinstance(date, datetime):
+                date = date.timestamp()
+            return bisect_right(self.search_timestamps, date) - 1
+        return len(self.hashes) - 1
+
+    def totals(self, key=ROOT, commit=None, date=None):
+        """(insertions, deletions) accumulated by key up to and including the commit"""
+        number = self.resolve(commit, date)
+        points = self.series.get(key)
+        if points is None or number < 0:
+            return 0, 0
+        if key == ROOT:
+            # The root changes at every commit, so its point is the commit number
+            return points[1][number], points[2][number]
+        position = bisect_right(points[0], number) - 1
+        if position < 0:
+            return 0, 0
+        return points[1][position], points[2][position]
+
+    def lines(self, key=ROOT, commit=None, date=None):
+        """Lines in a file or directory ("dir/") at a commit or date"""
+        insertions, deletions = self.totals(key, commit, date)
+        return insertions - deletions
+
+    def growth_curve(self, key=ROOT):
+        """[{commit, date, lines, insertions, deletions}] at every change of key"""
+        points = self.series.get(key)
+        if points is None:
+            return []
+        return [
+            {
+                "commit": self.hashes[number],
+                "date": datetime.fromtimestamp(self.timestamps[number]).isoformat(),
+                "lines": insertions - deletions,
+                "insertions": insertions,
+                "deletions": deletions
+            }
+            for number, insertions, deletions in zip(*points)
+        ]
+
+    def directories(self, max_depth=None):
+        """Indexed directory keys, optionally limited to max_depth levels"""
+        return sorted(
+            key for key in self.series
+            if key.endswith("/") and (max_depth is None or key.count("/") <= max_depth)
+        )
+
+    def growth_curves(self, keys=None):
+        """Growth curves for several keys; default: the root and every directory"""
+        if keys is None:
+            keys = [ROOT] + self.directories()
+        return {key: self.growth_curve(key) for key in keys}
+
+    def __len__(self):
+        return len(self.hashes)
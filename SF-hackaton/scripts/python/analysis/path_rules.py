@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Path inclusion/exclusion rules
+Gitignore-style patterns compiled once into regular expressions, grouped into
+named profiles ("all", "no-vendor", "core-only") that are all evaluated in the
+same pass over tree entries and commit file lists
+"""
+
+import json
+import re
+
+# Profiles matching what fix_analysis.py and correct_analysis.py counted
+DEFAULT_PROFILES = {
+    "all": {},
+    "no-vendor": {
+        "exclude": ["node_modules/", "vendor/", "bower_components/", "logs/", "*.log", ".DS_Store"]
+    },
+    "core-only": {
+        "include": [
+            "/agents/**/*.sh",
+            "/config/**/*.json",
+            "/config/**/*.sh",
+            "/docs/**/*.md",
+            "/*.sh",
+            "/*demo*.js",
+            "/*visual*.js",
+            "/*.md",
+            "/.mcp.json",
+            "/mcp_config.json",
+            "/package.json"
+        ],
+        "exclude": ["node_modules/", "logs/", "/test_*.sh"]
+    }
+}
+
+
+def translate_glob(glob):
+    """Translate the glob part of a gitignore pattern into a regex"""
+    parts = []
+    i = 0
+    while i < len(glob):
+        if glob.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif glob.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif glob[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif glob[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif glob[i] == "[" and "]" in glob[i + 2:]:
+            end = glob.index("]", i + 2)
+            body = glob[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            parts.append("[" + body.replace("\\", "\\\\") + "]")
+            i = end + 1
+        elif glob[i] == "\\" and i + 1 < len(glob):
+            parts.append(re.escape(glob[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(glob[i]))
+            i += 1
+    return "".join(parts)
+
+
+def compile_rule(pattern):
+    """Compile one gitignore line into (regex, negated, directory_only), or None"""
+    pattern = pattern.rstrip("\n")
+    if not pattern.strip() or pattern.startswith("#"):
+        return None
+
+    negated = pattern.startswith("!")
+    if negated:
+        pattern = pattern[1:]
+    elif pattern.startswith("\\"):
+        pattern = pattern[1:]
+
+    pattern = pattern.rstrip(" ")
+    directory_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+
+    # A slash anywhere but the end anchors the pattern at the root;
+    # otherwise it matches a name at any depth
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+    regex = translate_glob(pattern)
+    if not anchored:
+        regex = "(?:.*/)?" + regex
+    return re.compile(regex + r"\Z"), negated, directory_only
+
+
+class PathRules:
+    """An ordered gitignore-style rule list; the last matching rule wins"""
+
+    def __init__(self, patterns=()):
+        self.patterns = list(patterns)
+        self.rules = [rule for rule in map(compile_rule, self.patterns) if rule is not None]
+        # Directory decisions are reused by every path below the directory
+        self.directory_memo = {}
+
+    @classmethod
+    def from_file(cls, path):
+        """Read patterns from a .gitignore-style file"""
+        with open(path, 'r') as f:
+            return cls(f.read().splitlines())
+
+    def __bool__(self):
+        return bool(self.rules)
+
+    def match(self, path, is_dir=False):
+        """Return True/False for the last rule matching path itself, None if none does"""
+        for regex, negated, directory_only in reversed(self.rules):
+            if directory_only and not is_dir:
+                continue
+            if regex.match(path):
+                return not negated
+        return None
+
+    def covers_directory(self, dirpath):
+        """Whether dirpath (no trailing slash) or one of its parents is matched"""
+        decision = self.directory_memo.get(dirpath)
+        if decision is None:
+            parent = dirpath.rpartition("/")[0]
+            # As in gitignore, nothing below a matched directory can be unmatched
+            decision = (bool(parent) and self.covers_directory(parent)) or bool(self.match(dirpath, True))
+            self.directory_memo[dirpath] = decision
+        return decision
+
+    def covers(self, path):
+        """Whether the file path or one of its parent directories is matched"""
+        parent = path.rpartition("/")[0]
+        if parent and self.covers_directory(parent):
+            return True
+        return bool(self.match(path))
+
+
+class PathProfile:
+    """A named view of the tree: optional include rules, then exclude rules"""
+
+    def __init__(self, name, include=(), exclude=()):
+        self.name = name
+        self.include = PathRules(include)
+        self.exclude = PathRules(exclude)
+
+    def accepts(self, path):
+        """Whether a file path belongs to this profile"""
+        if self.exclude and self.exclude.covers(path):
+            return False
+        return not self.include or self.include.covers(path)
+
+    def prunes(self, dirpath):
+        """Whether nothing under dirpath can belong to this profile"""
+        return bool(self.exclude) and self.exclude.covers_directory(dirpath)
+
+    def to_dict(self):
+        return {"include": self.include.patterns, "exclude": self.exclude.patterns}
+
+
+class ProfileSet:
+    """Several profiles classified together, memoized per path
+
+    A directory is pruned only when every profile excludes it, so excluded
+    trees are never listed, sized or line-counted.
+    """
+
+    def __init__(self, profiles):
+        self.profiles = list(profiles)
+        self.names = [profile.name for profile in self.profiles]
+        self.memo = {}
+
+    @classmethod
+    def from_config(cls, config=None, names=None):
+        """Build from {name: {"include": [...], "exclude": [...]}}, default profiles if None"""
+        config = DEFAULT_PROFILES if config is None else config
+        names = names or list(config)
+        unknown = [name for name in names if name not in config]
+        if unknown:
+            raise ValueError(f"unknown path profile(s): {', '.join(unknown)}")
+        return cls(PathProfile(name, config[name].get("include", ()), config[name].get("exclude", ()))
+                   for name in names)
+
+    @classmethod
+    def from_file(cls, path, names=None):
+        """Load profiles from a JSON file in the from_config shape"""
+        with open(path, 'r') as f:
+            return cls.from_config(json.load(f), names)
+
+    def classify(self, path):
+        """Return the names of the profiles that accept path"""
+        names = self.memo.get(path)
+        if names is None:
+            names = tuple(profile.name for profile in self.profiles if profile.accepts(path))
+            self.memo[path] = names
+        return names
+
+    def prunes(self, dirpath):
+        """Whether every profile excludes the directory"""
+        dirpath = dirpath.rstrip("/")
+        return all(profile.prunes(dirpath) for profile in self.profiles)
+
+    def to_dict(self):
+        return {profile.name: profile.to_dict() for profile in self.profiles}
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Per-phase profiling for the analyzer
+Records wall time, CPU time, git subprocess count, bytes read from git and
+tracemalloc peak for each analysis phase, with optional cProfile capture
+
+Enable with GitRepoAnalyzer(profile=True) or ANALYZER_PROFILE=1; set
+ANALYZER_CPROFILE_DIR (or cprofile_dir) to also dump <phase>.prof files.
+"""
+
+import contextlib
+import cProfile
+import os
+import threading
+import time
+import tracemalloc
+
+PROFILE_ENV = "ANALYZER_PROFILE"
+CPROFILE_DIR_ENV = "ANALYZER_CPROFILE_DIR"
+
+# Process-wide git I/O counters, bumped by every place that talks to git;
+# analyze_async updates them from worker threads, hence the lock
+COUNTERS = {"git_subprocesses": 0, "git_bytes_read": 0}
+COUNTERS_LOCK = threading.Lock()
+
+
+def count_subprocess():
+    """Record one git subprocess started"""
+    with COUNTERS_LOCK:
+        COUNTERS["git_subprocesses"] += 1
+
+
+def count_git_bytes(size):
+    """Record bytes (or decoded characters) read from git"""
+    with COUNTERS_LOCK:
+        COUNTERS["git_bytes_read"] += size
+
+
+def read_counters():
+    """Consistent copy of the git I/O counters"""
+    with COUNTERS_LOCK:
+        return dict(COUNTERS)
+
+
+def profiling_requested():
+    """Check the environment switch"""
+    return os.environ.get(PROFILE_ENV, "").lower() in ("1", "true", "yes", "on")
+
+
+class PhaseProfiler:
+    """Collects per-phase measurements; a disabled profiler costs nothing"""
+
+    def __init__(self, enabled=False, cprofile_dir=None):
+        self.enabled = enabled
+        self.cprofile_dir = cprofile_dir
+        self.phases = {}
+
+    @classmethod
+    def from_settings(cls, profile=None, cprofile_dir=None):
+        """Resolve constructor arguments against the environment switches"""
+        cprofile_dir = cprofile_dir or os.environ.get(CPROFILE_DIR_ENV) or None
+        enabled = profiling_requested() if profile is None else profile
+        return cls(enabled or bool(cprofile_dir), cprofile_dir)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Measure the enclosed block as phase name"""
+        if not self.enabled:
+            yield
+            return
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+
+        profiler = None
+        if self.cprofile_dir:
+            profiler = cProfile.Profile()
+
+        counters_before = read_counters()
+        times_before = os.times()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        if profiler:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler:
+                profiler.disable()
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            times_after = os.times()
+            _, peak = tracemalloc.get_traced_memory()
+            counters_after = read_counters()
+            if started_tracing:
+                tracemalloc.stop()
+
+            self.phases[name] = {
+                "wall_seconds": round(wall, 4),
+                "cpu_seconds": round(cpu, 4),
+                # CPU of git children that exited during the phase
+                "child_cpu_seconds": round(
+                    (times_after.children_user - times_before.children_user) +
+                    (times_after.children_system - times_before.children_system), 4),
+                "git_subprocesses": counters_after["git_subprocesses"] - counters_before["git_subprocesses"],
+                "git_bytes_read": counters_after["git_bytes_read"] - counters_before["git_bytes_read"],
+                "tracemalloc_peak_bytes": peak
+            }
+
+            if profiler:
+                os.makedirs(self.cprofile_dir, exist_ok=True)
+                stats_path = os.path.join(self.cprofile_dir, f"{name}.prof")
+                profiler.dump_stats(stats_path)
+                self.phases[name]["cprofile"] = stats_path
+
+    def report(self):
+        """Return the profile section for the export"""
+        totals = {}
+        for stats in self.phases.values():
+            for key, value in stats.items():
+                if isinstance(value, (int, float)) and key != "tracemalloc_peak_bytes":
+                    totals[key] = round(totals.get(key, 0) + value, 4)
+        totals["tracemalloc_peak_bytes"] = max(
+            (stats["tracemalloc_peak_bytes"] for stats in self.phases.values()), default=0)
+        return {"phases": self.phases, "totals": totals}
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Mergeable quantile sketches
+A KLL-style sketch keeps a few hundred weighted samples however many values
+it sees, answers percentile queries within a small rank error, and merges
+with sketches built elsewhere (other repositories, other processes), so
+fleet-wide p50/p90/p99 never need the underlying commits
+"""
+
+import math
+
+DEFAULT_K = 200
+# Each lower compactor holds this fraction of the capacity of the one above
+CAPACITY_DECAY = 2 / 3
+PERCENTILES = (50, 90, 99)
+# Per-commit values tracked by CommitDistributions
+METRICS = ("commit_size", "files_per_commit")
+
+
+class KLLSketch:
+    """KLL quantile sketch over numbers
+
+    Level h holds items of weight 2**h. When the sketch is full, the lowest
+    over-capacity level is sorted and every other item moves up a level.
+    Which half survives alternates per level instead of being random, so a
+    sketch built from the same input is always the same. At the default
+    k=200 about 600 samples are kept and rank error stays well under 1%.
+    """
+
+    def __init__(self, k=DEFAULT_K):
+        self.k = k
+        self.levels = [[]]
+        self.offsets = [0]
+        self.count = 0
+        self.min = None
+        self.max = None
+        self.size = 0
+        self.max_size = 0
+        self.update_max_size()
+
+    def capacity(self, height):
+        depth = len(self.levels) - height - 1
+        return int(math.ceil(CAPACITY_DECAY ** depth * self.k)) + 1
+
+    def update_max_size(self):
+        self.max_size = sum(self.capacity(height) for height in range(len(self.levels)))
+
+    def add(self, value):
+        """Add one value"""
+        self.levels[0].append(value)
+        self.size += 1
+        self.count += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if self.size >= self.max_size:
+            self.compress()
+
+    def compress(self):
+        """Compact levels until the sketch fits its capacity again"""
+        while self.size >= self.max_size:
+            for height, level in enumerate(self.levels):
+                if len(level) >= self.capacity(height):
+                    if height + 1 == len(self.levels):
+                        self.levels.append([])
+                        self.offsets.append(0)
+                        self.update_max_size()
+                    level.sort()
+                    # An odd item out stays behind at this level
+                    keep = level[-1:] if len(level) % 2 else []
+                    paired = level[:len(level) - len(keep)]
+                    self.levels[height + 1].extend(paired[self.offsets[height]::2])
+                    self.offsets[height] ^= 1
+                    self.levels[height] = keep
+                    self.size = sum(len(items) for items in self.levels)
+                    break
+
+    def merge(self, other):
+        """Fold another sketch into this one; returns self"""
+        if other.count == 0:
+            return self
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+            self.offsets.append(0)
+        for height, items in enumerate(other.levels):
+            self.levels[height].extend(items)
+        self.count += other.count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self.size = sum(len(items) for items in self.levels)
+        self.update_max_size()
+        self.compress()
+        return self
+
+    def weighted_items(self):
+        """(value, weight) pairs sorted by value"""
+        items = [(value, 1 << height) for height, level in enumerate(self.levels) for value in level]
+        items.sort()
+        return items
+
+    def quantiles(self, fractions):
+        """Values at several fractions (0..1) from one sort of the samples"""
+        if self.count == 0:
+            return [None for _ in fractions]
+        items = self.weighted_items()
+        total = sum(weight for _, weight in items)
+        results = []
+        for fraction in fractions:
+            if fraction <= 0:
+                results.append(self.min)
+                continue
+            if fraction >= 1:
+                results.append(self.max)
+                continue
+            target = fraction * total
+            running = 0
+            for value, weight in items:
+                running += weight
+                if running >= target:
+                    results.append(value)
+                    break
+            else:
+                results.append(self.max)
+        return results
+
+    def quantile(self, fraction):
+        return self.quantiles([fraction])[0]
+
+    def summary(self, percentiles=PERCENTILES):
+        """count, min, max and the requested percentiles as p50-style keys"""
+        values = self.quantiles([p / 100 for p in percentiles])
+        summary = {"count": self.count, "min": self.min, "max": self.max}
+        summary.update({f"p{p}": value for p, value in zip(percentiles, values)})
+        return summary
+
+    def to_dict(self):
+        return {"k": self.k, "count": self.count, "min": self.min, "max": self.max,
+                "offsets": list(self.offsets), "levels": [list(level) for level in self.levels]}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["k"])
+        sketch.levels = [list(level) for level in data["levels"]] or [[]]
+        sketch.offsets = list(data.get("offsets") or [0] * len(sketch.levels))
+        sketch.count = data["count"]
+        sketch.min = data["min"]
+        sketch.max = data["max"]
+        sketch.size = sum(len(level) for level in sketch.levels)
+        sketch.update_max_size()
+        return sketch
+
+
+class CommitDistributions:
+    """Commit size (insertions + deletions) and files-per-commit sketches,
+    overall and per author, mergeable across repositories by author name"""
+
+    def __init__(self, k=DEFAULT_K):
+        self.k = k
+        self.overall = {metric: KLLSketch(k) for metric in METRICS}
+        self.authors = {}
+
+    def author_sketches(self, author):
+        sketches = self.authors.get(author)
+        if sketches is None:
+            sketches = self.authors[author] = {metric: KLLSketch(self.k) for metric in METRICS}
+        return sketches
+
+    def add_commit(self, author, insertions, deletions, files_changed):
+        values = {"commit_size": insertions + deletions, "files_per_commit": files_changed}
+        author_sketches = self.author_sketches(author)
+        for metric in METRICS:
+            self.overall[metric].add(values[metric])
+            author_sketches[metric].add(values[metric])
+
+    def merge(self, other):
+        """Fold another CommitDistributions into this one; returns self"""
+        for metric in METRICS:
+            self.overall[metric].merge(other.overall[metric])
+        for author, sketches in other.authors.items():
+            own = self.author_sketches(author)
+            for metric in METRICS:
+                own[metric].merge(sketches[metric])
+        return self
+
+    def summary(self, percentiles=PERCENTILES):
+        """Percentile summaries overall and per author"""
+        return {
+            **{metric: self.overall[metric].summary(percentiles) for metric in METRICS},
+            "by_author": {
+                author: {metric: sketches[metric].summary(percentiles) for metric in METRICS}
+                for author, sketches in sorted(self.authors.items())
+            }
+        }
+
+    def to_dict(self):
+        return {
+            "k": self.k,
+            "overall": {metric: self.overall[metric].to_dict() for metric in METRICS},
+            "authors": {
+                author: {metric: sketches[metric].to_dict() for metric in METRICS}
+                for author, sketches in sorted(self.authors.items())
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        distributions = cls(data["k"])
+        distributions.overall = {metric: KLLSketch.from_dict(data["overall"][metric]) for metric in METRICS}
+        distributions.authors = {
+            author: {metric: KLLSketch.from_dict(sketches[metric]) for metric in METRICS}
+            for author, sketches in data["authors"].items()
+        }
+        return distributions
@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+Unified repository scan
+Walks the working tree and the commit history once and writes the quick,
+corrected and core-only result files (analysis_results.json,
+analysis_results_corrected.json, analysis_core_only.json) from the same
+in-memory aggregates
+"""
+
+import argparse
+import json
+import math
+import os
+import subprocess
+from collections import defaultdict
+from datetime import datetime
+
+from async_git import run_queries
+from fs_walker import ParallelWalker, disk_usage
+from git_batch import get_object_reader
+from path_rules import ProfileSet
+from phase_profiler import count_git_bytes, count_subprocess
+
+DEFAULT_REPO_PATH = "/Users/alexanderfedin/Projects/hackathons/SF-hackaton"
+
+OUTPUTS = {
+    "quick": "analysis_results.json",
+    "corrected": "analysis_results_corrected.json",
+    "core": "analysis_core_only.json"
+}
+
+OUTPUT_FILES = set(OUTPUTS.values())
+
+# Extensions whose lines are counted (wc -l semantics: newline characters)
+CODE_EXTENSIONS = {".py", ".js", ".sh", ".json", ".md"}
+CONFIG_EXTENSIONS = {".json", ".yml", ".yaml"}
+# Only these profiles need line counts; "all" just counts files and bytes
+LINE_PROFILES = ("no-vendor", "core-only")
+ROOT_CONFIGS = {".mcp.json", "mcp_config.json", "package.json"}
+
+
+def format_size(size):
+    """Human-readable size in the style of du -h (1024-based, rounded up)"""
+    if not size:
+        return "0B"
+    value = float(size)
+    for unit in ["B", "K", "M", "G", "T"]:
+        if value < 1024 or unit == "T":
+            break
+        value /= 1024
+    if unit == "B":
+        return f"{size}B"
+    if value < 10:
+        # du shows one decimal below 10, rounding up
+        return f"{math.ceil(value * 10) / 10:.1f}{unit}"
+    return f"{math.ceil(value)}{unit}"
+
+
+def core_category(path):
+    """File breakdown bucket of a core-only file"""
+    top, _, rest = path.partition("/")
+    if top == "agents" and rest:
+        return "ai_agents"
+    if (top == "config" and rest) or path in ROOT_CONFIGS:
+        return "config"
+    if (top == "docs" and rest) or path.endswith(".md"):
+        return "documentation"
+    if path.endswith(".sh"):
+        return "shell_scripts"
+    return "javascript_demos"
+
+
+class RepoScan:
+    """One pass over the working tree and one over history, shared by every output"""
+
+    def __init__(self, repo_path, profiles=None, max_workers=None):
+        self.repo_path = repo_path
+        self.profiles = profiles or ProfileSet.from_config()
+        # Threads for the working-tree walk (default: ParallelWalker's)
+        self.max_workers = max_workers
+        self.total_bytes = 0
+        # Top-level entry -> bytes, e.g. for the node_modules size
+        self.top_level_bytes = defaultdict(int)
+        self.profile_totals = {
+            name: {"files": 0, "bytes": 0, "lines": 0, "by_extension": defaultdict(lambda: {"files": 0, "lines": 0, "bytes": 0})}
+            for name in self.profiles.names
+        }
+        self.core_totals = defaultdict(lambda: {"files": 0, "lines": 0})
+        self.total_commits = 0
+        self.first_commit = None
+        self.last_commit = None
+        self.tracked_files = 0
+
+    def run(self):
+        """Run the tree walk, the history walk and the tracked file count side by side"""
+        reader = get_object_reader(self.repo_path)
+        raw = run_queries({
+            "walk": self.walk,
+            "history": self.scan_history,
+            "tracked_files": lambda: len(reader.list_tree("HEAD", sizes=False))
+        }, cwd=self.repo_path)
+        self.tracked_files = raw["tracked_files"] or 0
+        return self
+
+    def walk(self):
+        """Walk the working tree once, sizing everything and classifying non-.git files
+
+        Directories are listed and files line-counted on a thread pool; trees
+        every profile excludes are pruned before they are listed. Sizes are
+        disk usage like du -s, directories included; the result files this
+        scan writes are never counted as project files.
+        """
+        try:
+            self.total_bytes += disk_usage(os.stat(self.repo_path))
+        except OSError:
+            return
+
+        walker = ParallelWalker(self.repo_path, self.max_workers,
+                                prune_dir=self.prunes, read_lines=self.needs_lines)
+        for entry in walker.walk():
+            self.total_bytes += entry.usage
+            self.top_level_bytes[entry.path.partition("/")[0]] += entry.usage
+            if entry.is_file and not self.skipped(entry.path):
+                self.add_file(entry.path, entry.size, entry.lines or 0)
+
+    @staticmethod
+    def skipped(path):
+        """.git only contributes to the size, and our own outputs are not project files"""
+        return path == ".git" or path.startswith(".git/") or path in OUTPUT_FILES
+
+    def prunes(self, path):
+        """Directories no profile accepts are never listed (.git is still sized)"""
+        return not self.skipped(path) and self.profiles.prunes(path)
+
+    def needs_lines(self, path):
+        """Whether a file's lines are counted: a code file in a line-counting profile"""
+        if self.skipped(path) or os.path.splitext(path)[1] not in CODE_EXTENSIONS:
+            return False
+        return any(name in LINE_PROFILES for name in self.profiles.classify(path))
+
+    def add_file(self, path, size, lines):
+        """Add one working-tree file to every profile that accepts it"""
+        names = self.profiles.classify(path)
+        if not names:
+            return
+
+        extension = os.path.splitext(path)[1]
+        for name in names:
+            totals = self.profile_totals[name]
+            totals["files"] += 1
+            totals["bytes"] += size
+            by_extension = totals["by_extension"][extension]
+            by_extension["files"] += 1
+            by_extension["lines"] += lines
+            by_extension["bytes"] += size
+            totals["lines"] += lines
+
+        if "core-only" in names:
+            category = self.core_totals[core_category(path)]
+            category["files"] += 1
+            category["lines"] += lines
+
+    def scan_history(self):
+        """Commit count and time span from a single git log pass
+
+        The span runs from the oldest root commit to HEAD, by author time.
+        """
+        count_subprocess()
+        try:
+            result = subprocess.run(
+                ["git", "log", "--format=%at %P"],
+                capture_output=True,
+                text=True,
+                cwd=self.repo_path
+            )
+        except OSError as e:
+            print(f"Error reading history: {e}")
+            return
+
+        count_git_bytes(len(result.stdout))
+        root_times = []
+        for line in result.stdout.splitlines():
+            timestamp, _, parents = line.partition(" ")
+            if not timestamp.isdigit():
+                continue
+            self.total_commits += 1
+            if self.last_commit is None:
+                self.last_commit = int(timestamp)
+            if not parents.strip():
+                root_times.append(int(timestamp))
+        if root_times:
+            self.first_commit = min(root_times)
+
+    def extension_files(self, profile, extensions):
+        """Number of files with any of the extensions in a profile"""
+        by_extension = self.profile_totals[profile]["by_extension"]
+        return sum(by_extension[extension]["files"] for extension in extensions if extension in by_extension)
+
+    def time_span(self):
+        """(hours, days) between the first and last commit, 8 hours / 1 day if unknown"""
+        if self.first_commit and self.last_commit:
+            time_span_hours = (self.last_commit - self.first_commit) / 3600
+            return time_span_hours, time_span_hours / 24
+        return 8, 1
+
+
+def ai_comparison(human_days, time_span_days):
+    """AI actual time, costs and comparison sections shared by every output"""
+    # AI actual time, minimum 0.5 days
+    ai_days = max(time_span_days, 0.5)
+    efficiency_multiplier = human_days / ai_days if ai_days > 0 else 1
+
+    # Cost calculations
+    dev_rate = 100  # $100/hour
+    cost_human = human_days * 8 * dev_rate
+    cost_ai = ai_days * 8 * dev_rate + (ai_days * 8 * 5)  # Add AI API costs
+    savings = cost_human - cost_ai
+
+    ai_actual = {
+        "actual_days": round(ai_days, 2),
+        "actual_hours": round(ai_days * 8, 1),
+        "cost_actual": round(cost_ai, 0),
+        "efficiency_multiplier": round(efficiency_multiplier, 1)
+    }
+    comparison = {
+        "time_saved_days": round(human_days - ai_days, 1),
+        "cost_savings": round(savings, 0),
+        "productivity_ratio": round(efficiency_multiplier, 1),
+        "roi_percentage": round((savings / cost_ai) * 100, 0) if cost_ai > 0 else 0
+    }
+    return cost_human, ai_actual, comparison
+
+
+def quick_results(scan):
+    """analysis_results.json: tracked files, lines outside vendored trees"""
+    time_span_hours, time_span_days = scan.time_span()
+    total_lines = scan.profile_totals["no-vendor"]["lines"]
+
+    # Human effort estimation (industry standard: 75-150 lines/day), with
+    # overhead for planning, testing, debugging and docs
+    overhead_factor = 1.8
+    human_days_conservative = (total_lines / 75) * overhead_factor
+    human_days_average = (total_lines / 125) * overhead_factor
+    human_days_optimistic = (total_lines / 175) * overhead_factor
+    cost_human, ai_actual, comparison = ai_comparison(human_days_average, time_span_days)
+
+    return {
+        "analysis_timestamp": datetime.now().isoformat(),
+        "repository": {
+            "path": scan.repo_path,
+            "total_commits": scan.total_commits,
+            "total_files": scan.tracked_files,
+            "total_lines": total_lines,
+            "repository_size": format_size(scan.total_bytes),
+            "time_span_hours": round(time_span_hours, 2),
+            "time_span_days": round(time_span_days, 2)
+        },
+        "human_estimation": {
+            "conservative_days": round(human_days_conservative, 1),
+            "average_days": round(human_days_average, 1),
+            "optimistic_days": round(human_days_optimistic, 1),
+            "cost_estimate": round(cost_human, 0)
+        },
+        "ai_actual": ai_actual,
+        "comparison": comparison,
+        "breakdown_by_type": {
+            "python_files": scan.extension_files("no-vendor", [".py"]),
+            "javascript_files": scan.extension_files("no-vendor", [".js"]),
+            "shell_scripts": scan.extension_files("all", [".sh"]),
+            "config_files": scan.extension_files("no-vendor", CONFIG_EXTENSIONS),
+            "documentation": scan.extension_files("all", [".md"])
+        }
+    }
+
+
+def corrected_results(scan):
+    """analysis_results_corrected.json: project files without vendored trees"""
+    time_span_hours, time_span_days = scan.time_span()
+    project = scan.profile_totals["no-vendor"]
+    total_lines = project["lines"]
+    node_modules_bytes = scan.top_level_bytes.get("node_modules", 0)
+
+    human_days = (total_lines / 125) * 1.8
+    cost_human, ai_actual, comparison = ai_comparison(human_days, time_span_days)
+
+    return {
+        "analysis_timestamp": datetime.now().isoformat(),
+        "repository": {
+            "path": scan.repo_path,
+            "total_commits": scan.total_commits,
+            "actual_project_files": project["files"],
+            "total_lines": total_lines,
+            "repository_size": format_size(scan.total_bytes),
+            "node_modules_size": format_size(node_modules_bytes) if node_modules_bytes else "",
+            "time_span_hours": round(time_span_hours, 2),
+            "time_span_days": round(time_span_days, 2)
+        },
+        "human_estimation": {
+            "average_days": round(human_days, 1),
+            "cost_estimate": round(cost_human, 0)
+        },
+        "ai_actual": ai_actual,
+        "comparison": comparison,
+        "file_breakdown": {
+            "python_scripts": scan.extension_files("no-vendor", [".py"]),
+            "javascript_files": scan.extension_files("no-vendor", [".js"]),
+            "shell_scripts": scan.extension_files("no-vendor", [".sh"]),
+            "config_json": scan.extension_files("no-vendor", [".json"]),
+            "documentation_md": scan.extension_files("no-vendor", [".md"]),
+            "total_actual_files": project["files"]
+        }
+    }
+
+
+def core_only_results(scan):
+    """analysis_core_only.json: agents, config, docs and root project files only"""
+    time_span_hours, time_span_days = scan.time_span()
+    categories = scan.core_totals
+    total_files = sum(category["files"] for category in categories.values())
+    total_lines = sum(category["lines"] for category in categories.values())
+
+    human_days = (total_lines / 125) * 1.8 if total_lines > 0 else 1
+    cost_human, ai_actual, comparison = ai_comparison(human_days, time_span_days)
+
+    return {
+        "analysis_timestamp": datetime.now().isoformat(),
+        "repository": {
+            "path": scan.repo_path,
+            "total_commits": scan.total_commits,
+            "actual_project_files": total_files,
+            "total_lines": total_lines,
+            "time_span_hours": round(time_span_hours, 2),
+            "time_span_days": round(time_span_days, 2)
+        },
+        "human_estimation": {
+            "average_days": round(human_days, 1),
+            "cost_estimate": round(cost_human, 0)
+        },
+        "ai_actual": ai_actual,
+        "comparison": comparison,
+        "file_breakdown": {
+            "ai_agents": categories["ai_agents"]["files"],
+            "ai_agents_lines": categories["ai_agents"]["lines"],
+            "config_files": categories["config"]["files"],
+            "config_lines": categories["config"]["lines"],
+            "documentation": categories["documentation"]["files"],
+            "documentation_lines": categories["documentation"]["lines"],
+            "shell_scripts": categories["shell_scripts"]["files"],
+            "shell_lines": categories["shell_scripts"]["lines"],
+            "javascript_demos": categories["javascript_demos"]["files"],
+            "javascript_lines": categories["javascript_demos"]["lines"],
+            "total_files": total_files,
+            "total_lines": total_lines
+        }
+    }
+
+
+def print_quick_summary(data):
+    print(f"Total Commits: {data['repository']['total_commits']}")
+    print(f"Total Files: {data['repository']['total_files']}")
+    print(f"Total Lines: {data['repository']['total_lines']:,}")
+    print(f"Repository Size: {data['repository']['repository_size']}")
+    print(f"Time Span: {data['repository']['time_span_days']:.2f} days")
+    print(f"\nHuman Estimate: {data['human_estimation']['average_days']:.1f} days")
+    print(f"AI Actual: {data['ai_actual']['actual_days']:.1f} days")
+    print(f"Efficiency: {data['ai_actual']['efficiency_multiplier']:.1f}x faster")
+    print(f"Cost Savings: ${data['comparison']['cost_savings']:,.0f}")
+    print(f"ROI: {data['comparison']['roi_percentage']:.0f}%")
+
+
+def print_corrected_summary(data):
+    repository = data['repository']
+    print(f"✅ ACTUAL Project Files: {repository['actual_project_files']} (excluding node_modules)")
+    print(f"📝 Total Lines of Code: {repository['total_lines']:,}")
+    print(f"📦 Total Commits: {repository['total_commits']}")
+    print(f"💾 Repository Size: {repository['repository_size']} (node_modules: {repository['node_modules_size']})")
+    print(f"⏱️ Time Span: {repository['time_span_days']:.2f} days")
+    print()
+    print(f"👨‍💻 Human Estimate: {data['human_estimation']['average_days']:.1f} days")
+    print(f"🤖 AI Actual: {data['ai_actual']['actual_days']:.1f} days")
+    print(f"🚀 Efficiency: {data['ai_actual']['efficiency_multiplier']:.1f}x faster")
+    print(f"💰 Cost Savings: ${data['comparison']['cost_savings']:,.0f}")
+    print(f"📈 ROI: {data['comparison']['roi_percentage']:.0f}%")
+    print()
+    print("File Breakdown:")
+    print(f"  Python: {data['file_breakdown']['python_scripts']}")
+    print(f"  JavaScript: {data['file_breakdown']['javascript_files']}")
+    print(f"  Shell Scripts: {data['file_breakdown']['shell_scripts']}")
+    print(f"  JSON Configs: {data['file_breakdown']['config_json']}")
+    print(f"  Documentation: {data['file_breakdown']['documentation_md']}")
+
+
+def print_core_summary(data):
+    breakdown = data['file_breakdown']
+    print(f"✅ CORE PROJECT FILES ONLY")
+    print(f"──────────────────────────")
+    print(f"📁 AI Agents (agents/): {breakdown['ai_agents']} files, {breakdown['ai_agents_lines']} lines")
+    print(f"⚙️  Config Files: {breakdown['config_files']} files, {breakdown['config_lines']} lines")
+    print(f"📚 Documentation: {breakdown['documentation']} files, {breakdown['documentation_lines']} lines")
+    print(f"🔧 Shell Scripts: {breakdown['shell_scripts']} files, {breakdown['shell_lines']} lines")
+    print(f"🌐 JavaScript: {breakdown['javascript_demos']} files, {breakdown['javascript_lines']} lines")
+    print(f"──────────────────────────")
+    print(f"📊 TOTAL: {breakdown['total_files']} files, {breakdown['total_lines']:,} lines")
+    print()
+    print(f"⏱️  Time Span: {data['repository']['time_span_days']:.2f} days")
+    print(f"📦 Commits: {data['repository']['total_commits']}")
+    print()
+    print(f"👨‍💻 Human Estimate: {data['human_estimation']['average_days']:.1f} days (${data['human_estimation']['cost_estimate']:,.0f})")
+    print(f"🤖 AI Actual: {data['ai_actual']['actual_days']:.1f} days (${data['ai_actual']['cost_actual']:,.0f})")
+    print(f"🚀 Efficiency: {data['ai_actual']['efficiency_multiplier']:.1f}x faster")
+    print(f"💰 Cost Savings: ${data['comparison']['cost_savings']:,.0f}")
+    print(f"📈 ROI: {data['comparison']['roi_percentage']:.0f}%")
+
+
+BUILDERS = {
+    "quick": (quick_results, print_quick_summary),
+    "corrected": (corrected_results, print_corrected_summary),
+    "core": (core_only_results, print_core_summary)
+}
+
+
+def run_outputs(repo_path, outputs=None, scan=None):
+    """Scan once (unless a scan is given) and write every requested result file"""
+    outputs = outputs or list(OUTPUTS)
+    if scan is None:
+        scan = RepoScan(repo_path).run()
+
+    results = {}
+    for name in outputs:
+        build, print_summary = BUILDERS[name]
+        data = build(scan)
+        with open(os.path.join(repo_path, OUTPUTS[name]), 'w') as f:
+            json.dump(data, f, indent=2)
+        print_summary(data)
+        print(f"\nData exported to {OUTPUTS[name]}\n")
+        results[name] = data
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scan a repository once and write every analysis result file")
+    parser.add_argument("repo_path", nargs="?", default=DEFAULT_REPO_PATH)
+    parser.add_argument("--outputs", default=",".join(OUTPUTS), help="Comma-separated subset of: " + ", ".join(OUTPUTS))
+    parser.add_argument("--profiles-file", help="JSON path profiles overriding the all / no-vendor / core-only defaults")
+    parser.add_argument("--workers", type=int, default=None, help="Threads for the working-tree walk")
+    args = parser.parse_args()
+
+    print("Unified Repository Scan")
+    print("=" * 40)
+    profiles = ProfileSet.from_file(args.profiles_file) if args.profiles_file else None
+    scan = RepoScan(args.repo_path, profiles, args.workers).run()
+    run_outputs(args.repo_path, [name for name in args.outputs.split(",") if name], scan)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Streaming export helpers
+Writes commits as NDJSON while they are parsed, and writes large JSON
+documents element by element instead of materializing them first
+"""
+
+import json
+
+
+class NdjsonWriter:
+    """Append one JSON record per line, flushing as records arrive"""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self.file = open(path, 'w')
+
+    def write(self, record):
+        self.file.write(json.dumps(record, default=str) + "\n")
+        self.count += 1
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def indent_json(value, default, depth):
+    """json.dumps with indent=2, shifted right by depth levels"""
+    return json.dumps(value, indent=2, default=default).replace("\n", "\n" + "  " * depth)
+
+
+def write_streamed_array(f, items, default):
+    """Write an iterable as a JSON array nested one level inside an object"""
+    empty = True
+    for item in items:
+        f.write(("[" if empty else ",") + "\n    " + indent_json(item, default, 2))
+        empty = False
+    f.write("[]" if empty else "\n  ]")
+
+
+def dump_streamed(data, f, default=str, stream_keys=()):
+    """Same output as json.dump(data, f, indent=2) for a top-level dict
+
+    Values under stream_keys are iterated and written one element at a time,
+    so e.g. a CommitStore never has to be expanded into a list in memory.
+    """
+    if not data:
+        f.write("{}")
+        return
+
+    first = True
+    for key, value in data.items():
+        f.write(("{" if first else ",") + "\n  " + json.dumps(key) + ": ")
+        first = False
+        if key in stream_keys:
+            write_streamed_array(f, value, default)
+        else:
+            f.write(indent_json(value, default, 1))
+    f.write("\n}")
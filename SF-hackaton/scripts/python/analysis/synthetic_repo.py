@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Synthetic git repository generator
+Builds deterministic repositories with a configurable number of commits,
+files, authors, churn and binary files, using one git fast-import process
+"""
+
+import argparse
+import os
+import random
+import subprocess
+
+# 2024-01-01T00:00:00Z; commits advance from here in seeded random steps
+START_TIMESTAMP = 1704067200
+
+EXTENSIONS = [".py", ".js", ".sh", ".md", ".json", ".ts", ".css"]
+DIRECTORIES = ["src", "lib", "docs", "config", "tests", "scripts", "vendor"]
+
+
+class SyntheticRepoGenerator:
+    """Generate a reproducible repository history from a seed"""
+
+    def __init__(self, commits=500, files=200, authors=10, churn=20,
+                 files_per_commit=3, binary_ratio=0.05, seed=42):
+        self.commits = commits
+        self.files = files
+        self.authors = authors
+        # Lines inserted or deleted per touched file, on average
+        self.churn = churn
+        self.files_per_commit = files_per_commit
+        self.binary_ratio = binary_ratio
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.contents = {}
+        self.paths = []
+
+    def params(self):
+        """Return the generator settings, e.g. for benchmark results"""
+        return {
+            "commits": self.commits,
+            "files": self.files,
+            "authors": self.authors,
+            "churn": self.churn,
+            "files_per_commit": self.files_per_commit,
+            "binary_ratio": self.binary_ratio,
+            "seed": self.seed
+        }
+
+    def new_path(self):
+        """Pick a fresh path, nested up to three directories deep"""
+        depth = self.rng.randint(1, 3)
+        parts = [self.rng.choice(DIRECTORIES)] + [f"m{self.rng.randint(0, 20)}" for _ in range(depth - 1)]
+        if self.rng.random() < self.binary_ratio:
+            name = f"asset{len(self.paths)}.bin"
+        else:
+            name = f"file{len(self.paths)}{self.rng.choice(EXTENSIONS)}"
+        return "/".join(parts + [name])
+
+    def random_lines(self, count):
+        return [f"line {self.rng.getrandbits(32):08x}" for _ in range(count)]
+
+    def mutate(self, path):
+        """Return new contents for path after one round of churn"""
+        if path.endswith(".bin"):
+            return bytes(self.rng.getrandbits(8) for _ in range(self.rng.randint(256, 4096)))
+
+        lines = self.contents.get(path)
+        if lines is None:
+            lines = []
+        else:
+            lines = lines.decode().split("\n")[:-1]
+
+        # Delete a slice, then insert fresh lines at a random position
+        deletions = min(len(lines), self.rng.randint(0, self.churn))
+        start = self.rng.randint(0, max(0, len(lines) - deletions))
+        del lines[start:start + deletions]
+        position = self.rng.randint(0, len(lines))
+        lines[position:position] = self.random_lines(self.rng.randint(1, self.churn * 2))
+        return ("\n".join(lines) + "\n").encode()
+
+    def commit_stream(self):
+        """Yield the git fast-import stream as byte chunks"""
+        timestamp = START_TIMESTAMP
+        for number in range(1, self.commits + 1):
+            author = self.rng.randrange(self.authors)
+            # Mostly short gaps (work sessions), sometimes a day or more
+            timestamp += self.rng.choice([300, 900, 1800, 3600, 3600 * 5, 86400])
+
+            # Grow towards the target file count, then only modify
+            touched = []
+            for _ in range(self.rng.randint(1, self.files_per_commit * 2 - 1)):
+                if len(self.paths) < self.files and (not self.paths or self.rng.random() < 0.5):
+                    path = self.new_path()
+                    self.paths.append(path)
+                else:
+                    path = self.rng.choice(self.paths)
+                if path not in touched:
+                    touched.append(path)
+
+            identity = f"Author {author} <author{author}@example.com> {timestamp} +0000"
+            message = f"Synthetic commit {number}".encode()
+            chunks = [
+                b"commit refs/heads/main\n",
+                f"mark :{number}\n".encode(),
+                f"author {identity}\n".encode(),
+                f"committer {identity}\n".encode(),
+                f"data {len(message)}\n".encode() + message + b"\n"
+            ]
+            if number > 1:
+                chunks.append(f"from :{number - 1}\n".encode())
+
+            for path in touched:
+                content = self.mutate(path)
+                self.contents[path] = content
+                chunks.append(f"M 100644 inline {path}\n".encode())
+                chunks.append(f"data {len(content)}\n".encode() + content + b"\n")
+
+            yield b"".join(chunks) + b"\n"
+
+    def generate(self, repo_path):
+        """Create the repository at repo_path (which must not exist yet)"""
+        os.makedirs(repo_path)
+        subprocess.run(["git", "init", "-q", "-b", "main"], cwd=repo_path, check=True)
+
+        process = subprocess.Popen(
+            ["git", "fast-import", "--quiet"],
+            stdin=subprocess.PIPE,
+            cwd=repo_path
+        )
+        for chunk in self.commit_stream():
+            process.stdin.write(chunk)
+        process.stdin.close()
+        if process.wait() != 0:
+            raise RuntimeError(f"git fast-import failed for {repo_path}")
+
+        # Populate the working tree so working-tree based scripts see files too
+        subprocess.run(["git", "checkout", "-q", "-f", "main"], cwd=repo_path, check=True)
+        return repo_path
+
+
+def write_history(repo_path, commits):
+    """Create a repository at repo_path from a scripted list of commits
+
+    Each commit is a dict with "author", "timestamp" and optional "message",
+    "files" ({path: text, or None to delete}), "renames" ([(old, new)]) and
+    "parents" (indices of earlier commits; default: the previous one, the
+    first listed parent being the first parent). The last commit is main.
+    Made for small edge-case histories: merges, tied timestamps, renames.
+    """
+    os.makedirs(repo_path)
+    subprocess.run(["git", "init", "-q", "-b", "main"], cwd=repo_path, check=True)
+
+    chunks = []
+    for number, commit in enumerate(commits, 1):
+        author = commit["author"]
+        identity = f"{author} <{author.lower().replace(' ', '.')}@example.com> {commit['timestamp']} +0000"
+        message = commit.get("message", f"Commit {number}").encode()
+        chunks += [
+            b"commit refs/heads/main\n",
+            f"mark :{number}\n".encode(),
+            f"author {identity}\n".encode("utf-8"),
+            f"committer {identity}\n".encode("utf-8"),
+            f"data {len(message)}\n".encode() + message + b"\n"
+        ]
+        parents = commit.get("parents", [number - 2] if number > 1 else [])
+        for position, parent in enumerate(parents):
+            chunks.append(f"{'from' if position == 0 else 'merge'} :{parent + 1}\n".encode())
+        for old_path, new_path in commit.get("renames", []):
+            chunks.append(f'R "{old_path}" "{new_path}"\n'.encode("utf-8"))
+        for path, text in commit.get("files", {}).items():
+            if text is None:
+                chunks.append(f'D "{path}"\n'.encode("utf-8"))
+                continue
+            content = text.encode("utf-8")
+            chunks.append(f'M 100644 inline "{path}"\n'.encode("utf-8"))
+            chunks.append(f"data {len(content)}\n".encode() + content + b"\n")
+        chunks.append(b"\n")
+    # Point main at the last commit even when it is not a descendant of the one before
+    chunks.append(f"reset refs/heads/main\nfrom :{len(commits)}\n\n".encode())
+
+    subprocess.run(["git", "fast-import", "--quiet"], input=b"".join(chunks), cwd=repo_path, check=True)
+    subprocess.run(["git", "checkout", "-q", "-f", "main"], cwd=repo_path, check=True)
+    return repo_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic git repository")
+    parser.add_argument("repo_path")
+    parser.add_argument("--commits", type=int, default=500)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--authors", type=int, default=10)
+    parser.add_argument("--churn", type=int, default=20)
+    parser.add_argument("--files-per-commit", type=int, default=3)
+    parser.add_argument("--binary-ratio", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    generator = SyntheticRepoGenerator(
+        args.commits, args.files, args.authors, args.churn,
+        args.files_per_commit, args.binary_ratio, args.seed
+    )
+    generator.generate(args.repo_path)
+    print(f"Generated {args.commits} commits over {len(generator.paths)} files in {args.repo_path}")
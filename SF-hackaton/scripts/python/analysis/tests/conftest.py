@@ -0,0 +1,28 @@
+"""
+Shared fixtures: the analysis scripts import each other as top-level
+modules, and tests run them against throwaway repositories
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyze_repo import GitRepoAnalyzer  # noqa: E402
+
+# 2024-01-01T00:00:00Z
+T0 = 1704067200
+
+
+@pytest.fixture
+def run_analysis():
+    """Analyze a repository without touching its git dir cache; async=True uses analyze_async"""
+    def run(repo_path, use_async=False, **options):
+        options.setdefault("use_cache", False)
+        analyzer = GitRepoAnalyzer(str(repo_path), **options)
+        data = asyncio.run(analyzer.analyze_async()) if use_async else analyzer.analyze()
+        return analyzer, data
+    return run
@@ -0,0 +1,38 @@
+"""SQLite export: query results match the analysis, and a failed load leaves nothing"""
+
+import sqlite3
+
+import pytest
+
+from analysis_db import AnalysisDatabase
+from synthetic_repo import SyntheticRepoGenerator
+
+
+@pytest.fixture
+def analysis(tmp_path, run_analysis):
+    repo = SyntheticRepoGenerator(commits=80, files=30, seed=11).generate(str(tmp_path / "repo"))
+    return run_analysis(repo)[1]
+
+
+def test_queries_match_the_analysis(tmp_path, analysis):
+    statistics = analysis["statistics"]
+    with AnalysisDatabase.create(str(tmp_path / "analysis.db"), analysis) as database:
+        authors = database.by_author()
+        assert sum(row["commits"] for row in authors) == statistics["total_commits"]
+        assert sum(row["insertions"] for row in authors) == statistics["total_insertions"]
+        root = database.subtree("")
+        assert (root["files"], root["lines"]) == (statistics["total_files"], statistics["total_lines"])
+        assert database.summary()["statistics"] == statistics
+
+
+def test_failed_load_rolls_back(tmp_path, analysis, monkeypatch):
+    def fail(*args):
+        raise RuntimeError("disk full")
+    monkeypatch.setattr(AnalysisDatabase, "insert_rollups", fail)
+
+    path = str(tmp_path / "analysis.db")
+    with pytest.raises(RuntimeError):
+        AnalysisDatabase.create(path, analysis)
+    connection = sqlite3.connect(path)
+    assert connection.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0] == 0
+    connection.close()
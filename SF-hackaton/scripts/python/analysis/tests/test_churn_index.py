@@ -0,0 +1,32 @@
+"""Churn hotspots count a renamed file's history under its current name"""
+
+import pytest
+
+from churn_index import ChurnIndex
+from conftest import T0
+from synthetic_repo import write_history
+from test_ingestion import INGESTION_PATHS
+
+
+def test_logical_paths_key_the_churn():
+    index = ChurnIndex()
+    index.add_commit(T0, [("src/a.py", 3, 1)], ["lib/c.py"])
+    index.add_commit(T0 + 60, [("src/{a.py => c.py}", 0, 0), ("src/b.py", 2, 0)])
+    assert index.churn("lib/c.py") == 4
+    assert index.churn("lib/") == 4
+    assert index.churn("src/a.py") == 0
+    assert index.churn("src/b.py") == 2
+
+
+@pytest.mark.parametrize("path", INGESTION_PATHS)
+def test_hotspots_keep_churn_from_before_a_rename(tmp_path, run_analysis, path):
+    repo = write_history(str(tmp_path / "rename"), [
+        {"author": "Ann", "timestamp": T0, "files": {"src/a.py": "a\n" * 20}},
+        {"author": "Ann", "timestamp": T0 + 60, "files": {"src/a.py": "a\n" * 25}},
+        {"author": "Bob", "timestamp": T0 + 120, "renames": [("src/a.py", "lib/c.py")]},
+        {"author": "Bob", "timestamp": T0 + 180, "files": {"lib/c.py": "a\n" * 26}},
+    ])
+    churn = run_analysis(repo, churn=True, **INGESTION_PATHS[path])[1]["churn"]
+    # 20 + 5 lines before the rename, 1 after it
+    assert churn["hotspots"]["files"] == [{"path": "lib/c.py", "churn": 26}]
+    assert churn["hotspots"]["directories"] == [{"path": "lib/", "churn": 26}]
@@ -0,0 +1,39 @@
+"""Co-change counts follow renamed files and ignore commits without file changes"""
+
+import pytest
+
+from cochange import CoChangeMatrix
+from conftest import T0
+from synthetic_repo import write_history
+from test_ingestion import INGESTION_PATHS
+
+
+def test_commits_without_files_are_not_counted():
+    matrix = CoChangeMatrix()
+    matrix.add_commit(["a.py", "b.py"])
+    matrix.add_commit([])
+    assert matrix.commits == 1
+    assert matrix.top_pairs(min_commits=1)["a.py"][0]["confidence"] == 1.0
+
+
+@pytest.fixture
+def rename_repo(tmp_path):
+    """a.py and b.py change together before and after a.py becomes c.py; one commit is empty"""
+    return write_history(str(tmp_path / "rename"), [
+        {"author": "Ann", "timestamp": T0, "files": {"a.py": "a\n" * 20, "b.py": "b\n"}},
+        {"author": "Ann", "timestamp": T0 + 60, "files": {"a.py": "a\n" * 21, "b.py": "b\nb\n"}},
+        {"author": "Bob", "timestamp": T0 + 120, "renames": [("a.py", "c.py")]},
+        {"author": "Bob", "timestamp": T0 + 180},
+        {"author": "Ann", "timestamp": T0 + 240, "files": {"c.py": "a\n" * 22, "b.py": "b\nb\nb\n"}},
+    ])
+
+
+@pytest.mark.parametrize("path", INGESTION_PATHS)
+def test_couplings_survive_renames(rename_repo, run_analysis, path):
+    _, data = run_analysis(rename_repo, cochange=True, **INGESTION_PATHS[path])
+    cochange = data["cochange"]
+    assert cochange["strongest_pairs"] == [{"files": ["b.py", "c.py"], "commits": 3}]
+    assert "a.py" not in cochange["top_pairs"]
+    # Create, edit, rename and edit; the empty commit is left out
+    assert cochange["commits"] == 4
+    assert cochange["top_pairs"]["b.py"] == [{"file": "c.py", "commits": 3, "confidence": 1.0}]
@@ -0,0 +1,63 @@
+"""The commit-graph is only prepared for path-limited git logs such as file histories"""
+
+import json
+import os
+import re
+import subprocess
+
+from commit_graph import CACHE_OBJECT_DIR
+from synthetic_repo import SyntheticRepoGenerator
+
+
+def cached_analysis(tmp_path, run_analysis, commits, **options):
+    repo = str(tmp_path / "repo")
+    if not os.path.exists(repo):
+        SyntheticRepoGenerator(commits=commits, files=10, seed=5).generate(repo)
+    cache_path = str(tmp_path / "cache" / "analysis_cache.json")
+    os.makedirs(os.path.dirname(cache_path))
+    analyzer, data = run_analysis(repo, use_cache=True, cache_path=cache_path, commit_graph="write", **options)
+    return analyzer, data, os.path.join(os.path.dirname(cache_path), CACHE_OBJECT_DIR)
+
+
+def test_graph_is_written_on_first_path_log(tmp_path, run_analysis):
+    analyzer, data, graph_dir = cached_analysis(tmp_path, run_analysis, 20)
+
+    # The path index answers every file, so a plain analysis never needs the graph
+    assert not os.path.exists(graph_dir)
+
+    path = next(iter(data["files"]))
+    history = analyzer.file_history(path)
+    assert os.path.exists(os.path.join(graph_dir, "info", "commit-graph"))
+    assert len(history) == data["files"][path]["commit_count"]
+    assert history[0]["hash"] == data["files"][path]["last_commit"]
+    assert len(analyzer.file_history(path, limit=1)) == 1
+
+
+def bloom_statistics(trace_path):
+    with open(trace_path, 'r') as f:
+        return [json.loads(match) for match in re.findall(r'bloom\s*\|\s*statistics:(\{.*\})', f.read())]
+
+
+def test_file_histories_use_bloom_filters(tmp_path, run_analysis, monkeypatch):
+    trace_path = str(tmp_path / "trace")
+    monkeypatch.setenv("GIT_TRACE2_PERF", trace_path)
+    repo = SyntheticRepoGenerator(commits=60, files=10, seed=5).generate(str(tmp_path / "repo"))
+    path = subprocess.run(["git", "ls-files"], cwd=repo, capture_output=True, text=True).stdout.split()[0]
+    _, data, graph_dir = cached_analysis(tmp_path, run_analysis, 60, file_histories=[path])
+
+    history = data["file_histories"][path]
+    assert history[0]["hash"] == data["files"][path]["last_commit"]
+    assert len(history) == data["files"][path]["commit_count"]
+    assert os.path.exists(os.path.join(graph_dir, "info", "commit-graph"))
+    assert sum(stats["definitely_not"] for stats in bloom_statistics(trace_path)) > 0
+
+
+def test_file_info_fallback_matches_the_path_index(tmp_path, run_analysis):
+    analyzer, data, _ = cached_analysis(tmp_path, run_analysis, 30)
+    path = next(iter(data["files"]))
+    expected = data["files"][path]
+
+    # Without a path index get_file_info falls back to a per-path git log
+    analyzer.path_index = None
+    info = analyzer.get_file_info(path, {"size": 0, "sha": None})
+    assert (info["commit_count"], info["last_commit"]) == (expected["commit_count"], expected["last_commit"])
@@ -0,0 +1,48 @@
+"""Pipelined cat-file reads release their process lock without relying on garbage collection"""
+
+import pytest
+
+from conftest import T0
+from git_batch import GitObjectReader
+from synthetic_repo import write_history
+
+
+@pytest.fixture
+def reader(tmp_path):
+    repo = write_history(str(tmp_path / "nested"), [
+        {"author": "Ann", "timestamp": T0, "files": {"a/b/c.py": "c\n", "a/d.py": "d\n", "e.py": "e\n"}},
+    ])
+    reader = GitObjectReader(repo)
+    yield reader
+    reader.close()
+
+
+def keep_generators(reader, monkeypatch):
+    """Hold on to every pipeline generator, checking earlier ones are finished first"""
+    generators = []
+    pipeline = reader.pipeline
+
+    def tracked(option, names, read_response):
+        assert all(generator.gi_frame is None for generator in generators), "a pipeline was left suspended"
+        generator = pipeline(option, names, read_response)
+        generators.append(generator)
+        return generator
+
+    monkeypatch.setattr(reader, "pipeline", tracked)
+    return generators
+
+
+def test_list_tree_finishes_every_pipeline(reader, monkeypatch):
+    keep_generators(reader, monkeypatch)
+    assert [entry["path"] for entry in reader.list_tree()] == ["a/b/c.py", "a/d.py", "e.py"]
+    assert reader.object_info("HEAD")[1] == "commit"
+    assert reader.read_blob("HEAD:e.py") == b"e\n"
+    assert not any(lock.locked() for lock in reader.locks.values())
+
+
+def test_closing_early_leaves_the_pipe_at_a_clean_boundary(reader):
+    responses = reader.iter_objects(["HEAD:e.py", "HEAD:a/d.py"])
+    assert next(responses)[1][2] == b"e\n"
+    responses.close()
+    assert not reader.locks["--batch"].locked()
+    assert reader.read_blob("HEAD:a/b/c.py") == b"c\n"
@@ -0,0 +1,68 @@
+"""Rename-following path history, from unit records and from real walks"""
+
+import subprocess
+
+import pytest
+
+from conftest import T0
+from history_index import PathHistoryIndex, split_rename_path
+from synthetic_repo import write_history
+from test_ingestion import INGESTION_PATHS
+
+
+def record(commit_hash, author, *names):
+    return {"hash": commit_hash, "author": author,
+            "stats": {"files": [{"name": name, "insertions": 1, "deletions": 0} for name in names]}}
+
+
+def subject(repo, commit_hash):
+    return subprocess.run(["git", "log", "-1", "--format=%s", commit_hash],
+                          cwd=repo, capture_output=True, text=True).stdout.strip()
+
+
+def test_split_rename_path():
+    assert split_rename_path("src/a.py") == ("src/a.py", "src/a.py")
+    assert split_rename_path("src/{a => b}/f.py") == ("src/a/f.py", "src/b/f.py")
+    assert split_rename_path("src/{ => sub}/f.py") == ("src/f.py", "src/sub/f.py")
+    assert split_rename_path("old.py => new.py") == ("old.py", "new.py")
+
+
+def test_renames_continue_the_logical_file():
+    index = PathHistoryIndex()
+    # Newest first: edit at the new path, the rename, then edits at the old path
+    index.add_commit(record("c3", "Cat", "src/sub/a2.py"))
+    index.add_commit(record("c2", "Bob", "src/{ => sub}/a2.py"))
+    index.add_commit(record("c1", "Ann", "src/a2.py"))
+    entry = index.lookup("src/sub/a2.py")
+    assert (entry["first_commit"], entry["last_commit"], entry["commit_count"]) == ("c1", "c3", 3)
+    assert list(entry["authors"]) == ["Cat", "Bob", "Ann"]
+    assert entry["previous_paths"] == ["src/a2.py"]
+
+    restored = PathHistoryIndex.from_dict(index.to_dict())
+    assert restored.to_dict() == index.to_dict()
+
+
+@pytest.fixture
+def tied_rename_repo(tmp_path):
+    """A rename and its child "mainline" share a timestamp, and the side branch
+    reaches the rename before the walk reaches mainline, so commit date order
+    lists the parent first"""
+    tied = T0 + 100
+    return write_history(str(tmp_path / "tied"), [
+        {"author": "Ann", "timestamp": T0, "files": {"src/a.py": "a\n"}, "message": "create"},
+        {"author": "Ann", "timestamp": T0 + 50, "files": {"src/a.py": "a\nb\n"}, "message": "edit"},
+        {"author": "Bob", "timestamp": tied, "renames": [("src/a.py", "src/sub/a2.py")], "message": "rename"},
+        {"author": "Cat", "timestamp": tied, "files": {"src/sub/a2.py": "a\nb\nc\n"}, "message": "mainline"},
+        {"author": "Cat", "timestamp": tied, "files": {"README.md": "r\n"}, "message": "follow-up"},
+        {"author": "Dan", "timestamp": tied, "files": {"doc.md": "d\n"}, "parents": [2], "message": "side"},
+        {"author": "Ann", "timestamp": T0 + 300, "files": {"doc.md": "d\n"}, "parents": [5, 4], "message": "merge"},
+    ])
+
+
+@pytest.mark.parametrize("path", INGESTION_PATHS)
+def test_walk_lists_children_before_parents(tied_rename_repo, run_analysis, path):
+    info = run_analysis(tied_rename_repo, **INGESTION_PATHS[path])[1]["files"]["src/sub/a2.py"]
+    assert info["commit_count"] == 4
+    assert subject(tied_rename_repo, info["last_commit"]) == "mainline"
+    assert subject(tied_rename_repo, info["first_commit"]) == "create"
+    assert info["previous_paths"] == ["src/a.py"]
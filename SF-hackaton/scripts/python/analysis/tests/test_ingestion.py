@@ -0,0 +1,104 @@
+"""Every commit ingestion path must produce the same statistics and file history"""
+
+import subprocess
+
+import pytest
+
+from conftest import T0
+from synthetic_repo import SyntheticRepoGenerator, write_history
+
+INGESTION_PATHS = {
+    "streaming": {},
+    "per_commit": {"streaming": False},
+    "pipeline": {"pipeline": True},
+    "per_commit_pipeline": {"streaming": False, "pipeline": True},
+    "async_streaming": {"use_async": True},
+    "async_per_commit": {"use_async": True, "streaming": False},
+    "async_pipeline": {"use_async": True, "streaming": False, "pipeline": True},
+}
+
+
+@pytest.fixture
+def merge_repo(tmp_path):
+    """main and a side branch each change a file, then main merges the side branch"""
+    return write_history(str(tmp_path / "merge"), [
+        {"author": "Ann", "timestamp": T0, "files": {"src/a.py": "a\n"}},
+        {"author": "Bob", "timestamp": T0 + 60, "files": {"src/b.py": "b\nb\n"}},
+        {"author": "Ann", "timestamp": T0 + 120, "files": {"src/a.py": "a\nc\nd\n"}, "parents": [0]},
+        # fast-import merges take the first parent's tree; list what the merge brings in
+        {"author": "Ann", "timestamp": T0 + 180, "files": {"src/b.py": "b\nb\n"}, "parents": [2, 1]},
+    ])
+
+
+def summary(data):
+    statistics = data["statistics"]
+    return {
+        "commits": statistics["total_commits"],
+        "insertions": statistics["total_insertions"],
+        "deletions": statistics["total_deletions"],
+        "files": {
+            name: (info["commit_count"], info["last_commit"], sorted(info["authors"]))
+            for name, info in data["files"].items()
+        }
+    }
+
+
+@pytest.mark.parametrize("path", INGESTION_PATHS)
+def test_merge_counts_first_parent_diff(merge_repo, run_analysis, path):
+    _, data = run_analysis(merge_repo, **INGESTION_PATHS[path])
+    # 1 + 2 + 2 on the commits, 2 more for src/b.py arriving through the merge
+    assert data["statistics"]["total_insertions"] == 7
+    assert data["files"]["src/b.py"]["commit_count"] == 2
+
+
+def test_ingestion_paths_agree(tmp_path, run_analysis):
+    repo = SyntheticRepoGenerator(commits=60, files=25, seed=7).generate(str(tmp_path / "synthetic"))
+    expected = summary(run_analysis(repo)[1])
+    for path, options in INGESTION_PATHS.items():
+        if "pipeline" not in options:
+            assert summary(run_analysis(repo, **options)[1]) == expected, path
+
+
+# The cache holds full commit records, which pipeline mode never keeps
+CACHED_PATHS = [path for path, options in INGESTION_PATHS.items() if "pipeline" not in options]
+
+
+@pytest.mark.parametrize("path", CACHED_PATHS)
+def test_incremental_cache_matches_fresh_walk(merge_repo, run_analysis, tmp_path, capsys, path):
+    options = INGESTION_PATHS[path]
+    cache_path = str(tmp_path / "cache.json")
+    tip = subprocess.run(["git", "rev-parse", "HEAD"], cwd=merge_repo, capture_output=True, text=True).stdout.strip()
+    # Cache the history before the merge, then walk only the merge on top of it
+    subprocess.run(["git", "reset", "-q", "--hard", "HEAD~1"], cwd=merge_repo, check=True)
+    run_analysis(merge_repo, use_cache=True, cache_path=cache_path, **options)
+    subprocess.run(["git", "reset", "-q", "--hard", tip], cwd=merge_repo, check=True)
+    capsys.readouterr()
+    cached = run_analysis(merge_repo, use_cache=True, cache_path=cache_path, **options)[1]
+    assert "Reused 2 cached commits, 2 new" in capsys.readouterr().out
+    assert summary(cached) == summary(run_analysis(merge_repo)[1])
+
+
+@pytest.mark.parametrize("path", INGESTION_PATHS)
+def test_line_history_is_built_on_every_path(merge_repo, run_analysis, path):
+    expected = run_analysis(merge_repo, loc_history=True)[1]["loc_history"]
+    assert run_analysis(merge_repo, loc_history=True, **INGESTION_PATHS[path])[1]["loc_history"] == expected
+
+
+@pytest.mark.parametrize("path", INGESTION_PATHS)
+def test_non_ascii_paths_match_the_tree(tmp_path, run_analysis, path):
+    repo = write_history(str(tmp_path / "utf8"), [
+        {"author": "Ann", "timestamp": T0, "files": {"src/ü.py": "a\n"}},
+        {"author": "Bob", "timestamp": T0 + 60, "files": {"src/ü.py": "a\nb\n"}},
+    ])
+    info = run_analysis(repo, **INGESTION_PATHS[path])[1]["files"]["src/ü.py"]
+    assert info["commit_count"] == 2
+    assert sorted(info["authors"]) == ["Ann", "Bob"]
+
+
+def test_async_pipeline_keeps_a_lean_store(tmp_path, run_analysis):
+    repo = SyntheticRepoGenerator(commits=40, files=20, seed=3).generate(str(tmp_path / "synthetic"))
+    expected = run_analysis(repo, pipeline=True, directories=True)[1]
+    analyzer, data = run_analysis(repo, use_async=True, streaming=False, pipeline=True, directories=True)
+    assert not analyzer.data["commits"].keep_details
+    assert data["statistics"] == expected["statistics"]
+    assert data["directories"] == expected["directories"]
@@ -0,0 +1,41 @@
+"""Paths excluded by every active profile never reach commits or statistics"""
+
+import pytest
+
+from conftest import T0
+from path_rules import ProfileSet
+from synthetic_repo import write_history
+from test_ingestion import INGESTION_PATHS
+
+
+@pytest.fixture
+def vendor_repo(tmp_path):
+    return write_history(str(tmp_path / "vendor"), [
+        {"author": "Ann", "timestamp": T0, "files": {"src/app.py": "a\n", "vendor/lib.js": "x\ny\nz\n"}},
+        {"author": "Bob", "timestamp": T0 + 60, "files": {"vendor/lib.js": "x\n"}},
+        {"author": "Ann", "timestamp": T0 + 120, "files": {"src/app.py": "a\nb\n"}},
+    ])
+
+
+def test_profile_rules(tmp_path):
+    profiles = ProfileSet.from_config(names=["all", "no-vendor"])
+    assert profiles.classify("vendor/lib.js") == ("all",)
+    assert profiles.classify("src/vendor/lib.js") == ("all",)
+    assert profiles.classify("src/app.py") == ("all", "no-vendor")
+    assert profiles.prunes("vendor/") is False
+    assert ProfileSet.from_config(names=["no-vendor"]).prunes("vendor/")
+
+
+@pytest.mark.parametrize("path", INGESTION_PATHS)
+def test_excluded_paths_are_not_counted(vendor_repo, run_analysis, path):
+    profiles = ProfileSet.from_config(names=["no-vendor"])
+    analyzer, data = run_analysis(vendor_repo, profiles=profiles, **INGESTION_PATHS[path])
+    statistics = data["statistics"]
+    assert list(data["files"]) == ["src/app.py"]
+    # The vendor-only commit still counts as a commit, with nothing in it
+    assert statistics["total_commits"] == 3
+    assert (statistics["total_insertions"], statistics["total_deletions"]) == (2, 0)
+    assert data["profiles"]["no-vendor"]["insertions"] == 2
+    if analyzer.data["commits"].keep_details:
+        assert all(not entry["name"].startswith("vendor/")
+                   for commit in analyzer.data["commits"] for entry in commit["stats"]["files"])
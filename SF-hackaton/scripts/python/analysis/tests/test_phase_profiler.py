@@ -0,0 +1,34 @@
+"""Git I/O counters stay exact when worker threads update them together"""
+
+import sys
+import threading
+
+from phase_profiler import count_git_bytes, count_subprocess, read_counters
+
+THREADS = 8
+UPDATES = 20000
+
+
+def test_counters_do_not_lose_concurrent_updates():
+    # Switch threads as often as possible to expose unguarded read-modify-writes
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    before = read_counters()
+
+    def work():
+        for _ in range(UPDATES):
+            count_subprocess()
+            count_git_bytes(3)
+
+    threads = [threading.Thread(target=work) for _ in range(THREADS)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    after = read_counters()
+    assert after["git_subprocesses"] - before["git_subprocesses"] == THREADS * UPDATES
+    assert after["git_bytes_read"] - before["git_bytes_read"] == 3 * THREADS * UPDATES
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Vectorized time-distribution analytics
+Hour/day histograms and work sessions computed over a whole timestamp array
+at once, for several session thresholds and per author in the same pass.
+Uses NumPy when it is installed and an equivalent pure-Python path otherwise.
+"""
+
+from bisect import bisect_right
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+import re
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:
+    ZoneInfo = None
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+OFFSET_PATTERN = re.compile(r"^([+-])(\d{1,2}):?(\d{2})?$")
+
+
+def resolve_timezone(tz):
+    """Turn a timezone setting into a tzinfo, or None for local time
+
+    Accepts None/"local", "UTC", fixed offsets such as "+02:00" or "-0530",
+    IANA names such as "Europe/Berlin" and tzinfo objects.
+    """
+    if not isinstance(tz, str):
+        return tz
+    if tz == "local":
+        return None
+    if tz.upper() in ("UTC", "Z"):
+        return timezone.utc
+
+    match = OFFSET_PATTERN.match(tz)
+    if match:
+        sign, hours, minutes = match.groups()
+        offset = timedelta(hours=int(hours), minutes=int(minutes or 0))
+        return timezone(-offset if sign == "-" else offset, tz)
+
+    if ZoneInfo is None:
+        raise ValueError(f"named timezones need Python 3.9+: {tz}")
+    return ZoneInfo(tz)
+
+
+def timezone_label(tz):
+    """Readable name for a resolved timezone"""
+    if tz is None:
+        return "local"
+    return getattr(tz, "key", None) or str(tz)
+
+
+def offset_at(timestamp, tz):
+    """UTC offset in seconds at timestamp"""
+    if tz is None:
+        moment = datetime.fromtimestamp(timestamp).astimezone()
+    else:
+        moment = datetime.fromtimestamp(timestamp, tz)
+    return int(moment.utcoffset().total_seconds())
+
+
+def day_offsets(utc_days, tz):
+    """UTC offset per UTC day, or None for days containing a DST transition"""
+    offsets = []
+    for day in utc_days:
+        start = int(day) * 86400
+        first = offset_at(start, tz)
+        offsets.append(first if offset_at(start + 86399, tz) == first else None)
+    return offsets
+
+
+def session_summary(count, total_seconds):
+    """Session statistics in the analyze_time_distribution shape"""
+    total_hours = total_seconds / 3600
+    return {
+        "work_sessions": count,
+        "average_session_hours": round(total_hours / count, 2) if count else 0,
+        "total_active_hours": round(total_hours, 2)
+    }
+
+
+class TimeDistribution:
+    """Histograms and session statistics over one set of commit timestamps
+
+    Timestamps must be sorted ascending; author_ids (optional) run parallel.
+    Offsets are looked up once per distinct UTC day, not once per commit.
+    """
+
+    def __init__(self, timestamps, author_ids=None, tz=None):
+        self.tz = resolve_timezone(tz)
+        if np is not None:
+            self.timestamps = np.asarray(timestamps, dtype=np.int64)
+            self.author_ids = None if author_ids is None else np.asarray(author_ids, dtype=np.int64)
+        else:
+            self.timestamps = list(timestamps)
+            self.author_ids = None if author_ids is None else list(author_ids)
+        self.local = None
+
+    def local_seconds(self):
+        """Timestamps shifted into the configured timezone"""
+        if self.local is not None:
+            return self.local
+
+        if np is not None:
+            days, inverse = np.unique(self.timestamps // 86400, return_inverse=True)
+            offsets = day_offsets(days.tolist(), self.tz)
+            per_day = np.array([0 if offset is None else offset for offset in offsets], dtype=np.int64)
+            self.local = self.timestamps + per_day[inverse]
+            # Days with a DST transition get per-commit offsets
+            for day_index, offset in enumerate(offsets):
+                if offset is None:
+                    for position in np.flatnonzero(inverse == day_index):
+                        self.local[position] = self.timestamps[position] + offset_at(int(self.timestamps[position]), self.tz)
+        else:
+            days = sorted(set(timestamp // 86400 for timestamp in self.timestamps))
+            offsets = dict(zip(days, day_offsets(days, self.tz)))
+            self.local = []
+            for timestamp in self.timestamps:
+                offset = offsets[timestamp // 86400]
+                if offset is None:
+                    offset = offset_at(timestamp, self.tz)
+                self.local.append(timestamp + offset)
+        return self.local
+
+    def histograms(self):
+        """Return (commits_by_hour, commits_by_day) in local time"""
+        local = self.local_seconds()
+        if np is not None:
+            hour_counts = np.bincount((local // 3600) % 24, minlength=24)
+            commits_by_hour = {hour: int(count) for hour, count in enumerate(hour_counts) if count}
+            days, day_counts = np.unique(local // 86400, return_counts=True)
+            day_items = zip(days.tolist(), day_counts.tolist())
+        else:
+            hour_counts = Counter((seconds // 3600) % 24 for seconds in local)
+            commits_by_hour = {hour: hour_counts[hour] for hour in sorted(hour_counts)}
+            day_items = sorted(Counter(seconds // 86400 for seconds in local).items())
+
+        commits_by_day = {
+            date.fromordinal(EPOCH_ORDINAL + day).strftime("%Y-%m-%d"): count
+            for day, count in day_items
+        }
+        return commits_by_hour, commits_by_day
+
+    def sessions(self, thresholds):
+        """Session statistics for every threshold (seconds), over all commits
+
+        Commits at most threshold apart share a session. Gaps are sorted once,
+        then each threshold is one binary search into their cumulative sums.
+        """
+        return self.threshold_sessions(self.timestamps, thresholds)
+
+    def author_sessions(self, thresholds, author_names=None):
+        """Session statistics per author and threshold
+
+        Returns {author: {threshold: stats}}, with author ids mapped through
+        author_names (e.g. a StringTable) when given.
+        """
+        if self.author_ids is None:
+            raise ValueError("author_ids are needed for per-author sessions")
+        if len(self.author_ids) == 0:
+            return {}
+
+        if np is not None:
+            # Stable sort by author keeps each author's timestamps ascending
+            order = np.argsort(self.author_ids, kind="stable")
+            authors = self.author_ids[order]
+            timestamps = self.timestamps[order]
+            boundaries = np.flatnonzero(np.diff(authors)) + 1
+            starts = [0] + boundaries.tolist()
+            ends = boundaries.tolist() + [len(authors)]
+            groups = [(int(authors[start]), timestamps[start:end]) for start, end in zip(starts, ends)]
+        else:
+            by_author = {}
+            for author_id, timestamp in zip(self.author_ids, self.timestamps):
+                by_author.setdefault(author_id, []).append(timestamp)
+            groups = sorted(by_author.items())
+
+        result = {}
+        for author_id, timestamps in groups:
+            name = author_names[author_id] if author_names is not None else author_id
+            result[name] = self.threshold_sessions(timestamps, thresholds)
+        return result
+
+    def threshold_sessions(self, timestamps, thresholds):
+        """Evaluate every threshold against one ascending timestamp run"""
+        if len(timestamps) == 0:
+            return {threshold: session_summary(0, 0) for threshold in thresholds}
+
+        if np is not None:
+            gaps = np.sort(np.diff(timestamps))
+            gap_sums = np.concatenate(([0], np.cumsum(gaps)))
+            span = int(timestamps[-1] - timestamps[0])
+            result = {}
+            for threshold in thresholds:
+                # Gaps beyond the threshold split sessions and are not active time
+                first_break = int(np.searchsorted(gaps, threshold, side="right"))
+                breaks = len(gaps) - first_break
+                idle = int(gap_sums[-1] - gap_sums[first_break])
+                result[threshold] = session_summary(breaks + 1, span - idle)
+            return result
+
+        gaps = sorted(later - earlier for earlier, later in zip(timestamps, timestamps[1:]))
+        gap_sums = [0]
+        for gap in gaps:
+            gap_sums.append(gap_sums[-1] + gap)
+        span = timestamps[-1] - timestamps[0]
+        result = {}
+        for threshold in thresholds:
+            first_break = bisect_right(gaps, threshold)
+            breaks = len(gaps) - first_break
+            idle = gap_sums[-1] - gap_sums[first_break]
+            result[threshold] = session_summary(breaks + 1, span - idle)
+        return result
+
+
+def threshold_label(seconds):
+    """Export key for a session threshold, e.g. 7200 -> "2h" """
+    return f"{seconds / 3600:g}h"